@@ -410,8 +410,8 @@ def execute_technique(t_id: str, technique_input: dict):
     if isinstance(output, tuple) and len(output) == 2:
         result, response = output
 
-        # Initialize output manager
-        output_manager = OutputManager()
+        # Get shared output manager
+        output_manager = OutputManager.get_instance()
 
         # Log technique execution
         app_logger.info(StructuredAppLog("Technique Execution",
@@ -634,8 +634,8 @@ def get_technique_execution_response(event_id):
     Args:
         event_id (string, optional): Event ID to retrive the output for.
     """
-    # Initialize output manager
-    output_manager = OutputManager()
+    # Get shared output manager
+    output_manager = OutputManager.get_instance()
     # Get technique execution output by event id
     event_output = output_manager.get_output_by_event_id(event_id=event_id)
 
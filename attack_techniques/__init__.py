@@ -124,5 +124,6 @@ from .gcp.gcp_enumerate_compute_engine_instances import GCPEnumerateComputeEngin
 from .gcp.gcp_persistence_via_ssh_key_addition import GCPPersistenceViaSSHKeyAddition
 from .gcp.gcp_expose_public_cloud_storage import GCPExposePublicCloudStorage
 from .gcp.gcp_enumerate_projects import GCPEnumerateProjects
+from .gcp.gcp_enumerate_organization_resources import GCPEnumerateOrganizationResources
 from .gcp.gcp_persistence_sa_short_lived_token import GCPPersistenceGenerateSAShortLivedToken
 from .gcp.gcp_persistence_generate_sa_private_key import GCPPersistenceGenerateSAServiceAccountPrivateKey
\ No newline at end of file
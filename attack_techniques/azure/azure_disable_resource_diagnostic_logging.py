@@ -37,14 +37,12 @@ class AzureDisableResourceDiagnosticLogging(BaseTechnique):
                     "message": {"input_required": "Diadnostic Setting Name"}
                 }
 
-            # Get credential
-            credential = AzureAccess.get_azure_auth_credential()
             # Retrieve subscription id
             current_sub_info = AzureAccess().get_current_subscription_info()
             subscription_id = current_sub_info.get("id")
             
             # Create client
-            monitor_client = MonitorManagementClient(credential, subscription_id)
+            monitor_client = AzureAccess().get_management_client(MonitorManagementClient, subscription_id)
 
             result = []
             
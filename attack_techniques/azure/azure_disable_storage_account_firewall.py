@@ -24,14 +24,12 @@ class AzureDisableStorageAccountFirewall(BaseTechnique):
             rg_name: str = kwargs["rg_name"]
             account_name: str = kwargs["account_name"]
             
-            # Get credential
-            credential = AzureAccess.get_azure_auth_credential()
             # Retrieve subscription id
             current_sub_info = AzureAccess().get_current_subscription_info()
             subscription_id = current_sub_info.get("id")
             
             # create client
-            storage_client = StorageManagementClient(credential, subscription_id)
+            storage_client = AzureAccess().get_management_client(StorageManagementClient, subscription_id)
             
             update_params = StorageAccountUpdateParameters(
                 public_network_access='Enabled'
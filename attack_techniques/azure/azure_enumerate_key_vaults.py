@@ -4,6 +4,7 @@ from typing import Dict, Any, Tuple
 from azure.mgmt.keyvault import KeyVaultManagementClient
 from azure.mgmt.resource import ResourceManagementClient
 from core.azure.azure_access import AzureAccess
+from core.azure.azure_task_runner import AzureTaskRunner
 
 @TechniqueRegistry.register
 class AzureEnumerateKeyVaults(BaseTechnique):
@@ -57,15 +58,15 @@ class AzureEnumerateKeyVaults(BaseTechnique):
             resource_group_name: str = kwargs.get("resource_group_name", None)
             scan_all_subscriptions: bool = kwargs.get("scan_all_subscriptions", False)
             include_details: bool = kwargs.get("include_details", True)
+            max_workers: int = kwargs.get("max_workers", None) or AzureTaskRunner.DEFAULT_MAX_WORKERS
             
-            # Get credential and subscription info
-            credential = AzureAccess.get_azure_auth_credential()
+            # Get subscription info
             current_sub_info = AzureAccess().get_current_subscription_info()
             subscription_id = current_sub_info.get("id")
             
             # Create clients
-            keyvault_client = KeyVaultManagementClient(credential, subscription_id)
-            resource_client = ResourceManagementClient(credential, subscription_id)
+            keyvault_client = AzureAccess().get_management_client(KeyVaultManagementClient, subscription_id)
+            resource_client = AzureAccess().get_management_client(ResourceManagementClient, subscription_id)
             
             subscriptions_to_scan = []
             
@@ -92,8 +93,8 @@ class AzureEnumerateKeyVaults(BaseTechnique):
                 
                 try:
                     # Create new client for this subscription
-                    kv_client = KeyVaultManagementClient(credential, sub_id)
-                    res_client = ResourceManagementClient(credential, sub_id)
+                    kv_client = AzureAccess().get_management_client(KeyVaultManagementClient, sub_id)
+                    res_client = AzureAccess().get_management_client(ResourceManagementClient, sub_id)
                     
                     # Get subscription name
                     subscription_info = next((sub for sub in AzureAccess().get_account_available_subscriptions() 
@@ -106,78 +107,80 @@ class AzureEnumerateKeyVaults(BaseTechnique):
                     else:
                         resource_groups = [rg.name for rg in res_client.resource_groups.list()]
                     
-                    # Scan each resource group
-                    for rg in resource_groups:
+                    def scan_resource_group(rg, kv_client=kv_client):
+                        """Lists the vaults of a resource group"""
                         rg_vaults = []
-                        try:
-                            # List vaults in this resource group
-                            vaults = kv_client.vaults.list_by_resource_group(rg)
+                        # List vaults in this resource group
+                        vaults = kv_client.vaults.list_by_resource_group(rg)
+                        
+                        # Process each vault
+                        for vault in vaults:
+                            vault_info = {
+                                "name": vault.name,
+                                "resource_group": rg,
+                                "location": vault.location,
+                                "uri": f"https://{vault.name}.vault.azure.net/",
+                                "tenant_id": vault.properties.tenant_id,
+                                "sku": vault.properties.sku.name,
+                                "enabled_for_deployment": vault.properties.enabled_for_deployment,
+                                "enabled_for_disk_encryption": vault.properties.enabled_for_disk_encryption,
+                                "enabled_for_template_deployment": vault.properties.enabled_for_template_deployment,
+                                "soft_delete_enabled": vault.properties.enable_soft_delete,
+                                "purge_protection_enabled": vault.properties.enable_purge_protection
+                            }
                             
-                            # Process each vault
-                            for vault in vaults:
-                                vault_info = {
-                                    "name": vault.name,
-                                    "resource_group": rg,
-                                    "location": vault.location,
-                                    "uri": f"https://{vault.name}.vault.azure.net/",
-                                    "tenant_id": vault.properties.tenant_id,
-                                    "sku": vault.properties.sku.name,
-                                    "enabled_for_deployment": vault.properties.enabled_for_deployment,
-                                    "enabled_for_disk_encryption": vault.properties.enabled_for_disk_encryption,
-                                    "enabled_for_template_deployment": vault.properties.enabled_for_template_deployment,
-                                    "soft_delete_enabled": vault.properties.enable_soft_delete,
-                                    "purge_protection_enabled": vault.properties.enable_purge_protection
-                                }
-                                
-                                # Add detailed information if requested
-                                if include_details:
-                                    # Get network configuration
-                                    network_acls = vault.properties.network_acls
-                                    if network_acls:
-                                        vault_info["network_acls"] = {
-                                            "default_action": network_acls.default_action,
-                                            "bypass": network_acls.bypass,
-                                            "ip_rules": network_acls.ip_rules,
-                                            "virtual_network_rules": network_acls.virtual_network_rules
-                                        }
-                                    else:
-                                        vault_info["network_acls"] = {"default_action": "Allow"}
-                                    
-                                    # Get access policies
-                                    access_policies = []
-                                    if vault.properties.access_policies:
-                                        for policy in vault.properties.access_policies:
-                                            access_policies.append({
-                                                "tenant_id": policy.tenant_id,
-                                                "object_id": policy.object_id,
-                                                "permissions": {
-                                                    "keys": policy.permissions.keys if policy.permissions.keys else [],
-                                                    "secrets": policy.permissions.secrets if policy.permissions.secrets else [],
-                                                    "certificates": policy.permissions.certificates if policy.permissions.certificates else []
-                                                }
-                                            })
-                                    
-                                    vault_info["access_policies"] = access_policies
-                                    
-                                    # Get private endpoint connections if available
-                                    if hasattr(vault.properties, 'private_endpoint_connections') and vault.properties.private_endpoint_connections:
-                                        vault_info["private_endpoints"] = [
-                                            {
-                                                "id": pe.id,
-                                                "name": pe.name,
-                                                "status": pe.properties.private_link_service_connection_state.status
-                                            } for pe in vault.properties.private_endpoint_connections
-                                        ]
+                            # Add detailed information if requested
+                            if include_details:
+                                # Get network configuration
+                                network_acls = vault.properties.network_acls
+                                if network_acls:
+                                    vault_info["network_acls"] = {
+                                        "default_action": network_acls.default_action,
+                                        "bypass": network_acls.bypass,
+                                        "ip_rules": network_acls.ip_rules,
+                                        "virtual_network_rules": network_acls.virtual_network_rules
+                                    }
+                                else:
+                                    vault_info["network_acls"] = {"default_action": "Allow"}
                                 
-                                rg_vaults.append(vault_info)
-                                total_vaults_found += 1
+                                # Get access policies
+                                access_policies = []
+                                if vault.properties.access_policies:
+                                    for policy in vault.properties.access_policies:
+                                        access_policies.append({
+                                            "tenant_id": policy.tenant_id,
+                                            "object_id": policy.object_id,
+                                            "permissions": {
+                                                "keys": policy.permissions.keys if policy.permissions.keys else [],
+                                                "secrets": policy.permissions.secrets if policy.permissions.secrets else [],
+                                                "certificates": policy.permissions.certificates if policy.permissions.certificates else []
+                                            }
+                                        })
                                 
-                            if rg_vaults:
-                                subscription_vaults[rg] = rg_vaults
+                                vault_info["access_policies"] = access_policies
                                 
-                        except Exception as rg_error:
-                            # Continue with next resource group if one fails
+                                # Get private endpoint connections if available
+                                if hasattr(vault.properties, 'private_endpoint_connections') and vault.properties.private_endpoint_connections:
+                                    vault_info["private_endpoints"] = [
+                                        {
+                                            "id": pe.id,
+                                            "name": pe.name,
+                                            "status": pe.properties.private_link_service_connection_state.status
+                                        } for pe in vault.properties.private_endpoint_connections
+                                    ]
+                            
+                            rg_vaults.append(vault_info)
+
+                        return rg_vaults
+
+                    # Scan resource groups concurrently
+                    rg_results = AzureTaskRunner.get_instance().map(scan_resource_group, resource_groups, sub_id, max_workers)
+                    for rg, rg_vaults in zip(resource_groups, rg_results):
+                        # Skip resource groups that failed or have no vaults
+                        if isinstance(rg_vaults, Exception) or not rg_vaults:
                             continue
+                        subscription_vaults[rg] = rg_vaults
+                        total_vaults_found += len(rg_vaults)
                     
                     if subscription_vaults:
                         all_key_vaults[subscription_name] = subscription_vaults
@@ -225,5 +228,12 @@ class AzureEnumerateKeyVaults(BaseTechnique):
                 "default": True,
                 "name": "Include Full Vault Details",
                 "input_field_type": "bool"
+            },
+            "max_workers": {
+                "type": "int",
+                "required": False,
+                "default": AzureTaskRunner.DEFAULT_MAX_WORKERS,
+                "name": "Max Worker Threads",
+                "input_field_type": "number"
             }
         }
\ No newline at end of file
@@ -55,14 +55,13 @@ class AzureEnumerateLogicApps(BaseTechnique):
             else:
                 state_filter = logic_app_state
             
-            # Get credential and subscription
-            credential = AzureAccess.get_azure_auth_credential()
+            # Get subscription
             current_sub_info = AzureAccess().get_current_subscription_info()
             subscription_id = current_sub_info.get("id")
             
             # Create clients
-            logic_client = LogicManagementClient(credential, subscription_id)
-            resource_client = ResourceManagementClient(credential, subscription_id)
+            logic_client = AzureAccess().get_management_client(LogicManagementClient, subscription_id)
+            resource_client = AzureAccess().get_management_client(ResourceManagementClient, subscription_id)
             
             logic_apps = []
             total_apps = 0
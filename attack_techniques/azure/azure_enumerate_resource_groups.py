@@ -21,13 +21,12 @@ class AzureEnumerateResourceGroups(BaseTechnique):
         self.validate_parameters(kwargs)
         try:
             # Get credentials
-            credential = AzureAccess.get_azure_auth_credential()
             # Retrieve subscription id
             current_sub_info = AzureAccess().get_current_subscription_info()
             subscription_id = current_sub_info.get("id")
             
             # Create client
-            resource_client = ResourceManagementClient(credential, subscription_id)
+            resource_client = AzureAccess().get_management_client(ResourceManagementClient, subscription_id)
             
             # List resource groups
             groups_list = resource_client.resource_groups.list()
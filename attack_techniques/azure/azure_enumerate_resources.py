@@ -29,14 +29,12 @@ class AzureEnumerateResources(BaseTechnique):
                     "message": "Invalid Technique Input"
                 }
 
-            # Get credential
-            credential = AzureAccess.get_azure_auth_credential()
             # Retrieve subscription id
             current_sub_info = AzureAccess().get_current_subscription_info()
             subscription_id = current_sub_info.get("id")
             
             # Create client
-            resource_client = ResourceManagementClient(credential, subscription_id)
+            resource_client = AzureAccess().get_management_client(ResourceManagementClient, subscription_id)
             
             # List resources
             resources_list = resource_client.resources.list_by_resource_group(rg_name)
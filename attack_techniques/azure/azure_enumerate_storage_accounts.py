@@ -21,13 +21,12 @@ class AzureEnumerateStorageAccounts(BaseTechnique):
         self.validate_parameters(kwargs)
     
         try:
-            credential = AzureAccess.get_azure_auth_credential()
             # retrieve subscription id
             current_sub_info = AzureAccess().get_current_subscription_info()
             subscription_id = current_sub_info.get("id")
             
             # create client
-            client = StorageManagementClient(credential, subscription_id)
+            client = AzureAccess().get_management_client(StorageManagementClient, subscription_id)
             
             # list vms
             response = client.storage_accounts.list()
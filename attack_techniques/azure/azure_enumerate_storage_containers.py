@@ -74,14 +74,12 @@ class AzureEnumerateStorageContainers(BaseTechnique):
                     "message": {"input_required": "Resource Group Name"}
                 }
 
-            # Get credential
-            credential = AzureAccess.get_azure_auth_credential()
             # Retrieve subscription id
             current_sub_info = AzureAccess().get_current_subscription_info()
             subscription_id = current_sub_info.get("id")
             
             # Create storage management client
-            storage_client = StorageManagementClient(credential, subscription_id)
+            storage_client = AzureAccess().get_management_client(StorageManagementClient, subscription_id)
             
             # Get storage account keys
             keys = storage_client.storage_accounts.list_keys(rg_name, storage_account_name)
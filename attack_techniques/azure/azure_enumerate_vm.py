@@ -21,13 +21,12 @@ class AzureEnumerateVm(BaseTechnique):
         self.validate_parameters(kwargs)
     
         try:
-            credential = AzureAccess.get_azure_auth_credential()
             # retrieve subscription id
             current_sub_info = AzureAccess().get_current_subscription_info()
             subscription_id = current_sub_info.get("id")
             
             # create client
-            compute_client = ComputeManagementClient(credential, subscription_id)
+            compute_client = AzureAccess().get_management_client(ComputeManagementClient, subscription_id)
             
             # list vms
             vm_list = compute_client.virtual_machines.list_all()
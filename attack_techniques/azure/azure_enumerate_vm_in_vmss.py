@@ -36,14 +36,12 @@ class AzureEnumerateVMInVMSS(BaseTechnique):
                     "message": "Invalid Technique Input"
                 }
 
-            # Get credential
-            credential = AzureAccess.get_azure_auth_credential()
             # Retrieve subscription id
             current_sub_info = AzureAccess().get_current_subscription_info()
             subscription_id = current_sub_info.get("id")
             
             # Create client
-            compute_client = ComputeManagementClient(credential, subscription_id)
+            compute_client = AzureAccess().get_management_client(ComputeManagementClient, subscription_id)
             
             # List resources
             vmss_vm_list = compute_client.virtual_machine_scale_set_vms.list(
@@ -44,14 +44,12 @@ class AzureExecuteScriptOnVM(BaseTechnique):
                     "message": "Invalid Technique Input"
                 }
 
-            # Get credential
-            credential = AzureAccess.get_azure_auth_credential()
             # Retrieve subscription id
             current_sub_info = AzureAccess().get_current_subscription_info()
             subscription_id = current_sub_info.get("id")
             
             # Create client
-            compute_client = ComputeManagementClient(credential, subscription_id)
+            compute_client = AzureAccess().get_management_client(ComputeManagementClient, subscription_id)
 
             # Get VMSS and os type
             vmss = compute_client.virtual_machine_scale_sets.get(resource_group_name, vmss_name)
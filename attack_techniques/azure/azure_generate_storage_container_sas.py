@@ -40,14 +40,12 @@ class AzureGenerateStorageContainerSAS(BaseTechnique):
             account_name: str = kwargs["account_name"]
             container_name: str = kwargs["container_name"]
 
-            # Get credential
-            credential = AzureAccess.get_azure_auth_credential()
             # Retrieve subscription id
             current_sub_info = AzureAccess().get_current_subscription_info()
             subscription_id = current_sub_info.get("id")
             
             # create client
-            storage_client = StorageManagementClient(credential, subscription_id)
+            storage_client = AzureAccess().get_management_client(StorageManagementClient, subscription_id)
             
             # Obtain keys
             storage_account_keys = storage_client.storage_accounts.list_keys(rg_name, account_name)
@@ -103,13 +103,12 @@ class AzureMassResourceDeletion(BaseTechnique):
                     "message": {"error": "Confirm risk message to execute technique"}
                 }
             
-            # Get credential and subscription
-            credential = AzureAccess.get_azure_auth_credential()
+            # Get subscription
             current_sub_info = AzureAccess().get_current_subscription_info()
             subscription_id = current_sub_info.get("id")
             
             # Create clients
-            resource_client = ResourceManagementClient(credential, subscription_id)
+            resource_client = AzureAccess().get_management_client(ResourceManagementClient, subscription_id)
             
             # Collect resources to delete
             resources_to_delete = []
@@ -43,7 +43,7 @@ class AzureModifyKeyVaultAccess(BaseTechnique):
             subscription_id = current_sub_info.get("id")
             
             # create client
-            client = KeyVaultManagementClient(credential, subscription_id)
+            client = AzureAccess().get_management_client(KeyVaultManagementClient, subscription_id)
             
             token = credential.get_token("https://graph.microsoft.com/.default").token
             headers = {'Authorization': f'Bearer {token}'}
@@ -96,7 +96,7 @@ class AzureModifyKeyVaultAccess(BaseTechnique):
                     elif "ForbiddenByRbac" in str(e):
                         try:
                             # Assign role if access is forbidden by RBAC
-                            auth_client = AuthorizationManagementClient(credential, subscription_id)
+                            auth_client = AzureAccess().get_management_client(AuthorizationManagementClient, subscription_id)
                             role_assignment_params = RoleAssignmentCreateParameters(
                                 role_definition_id=f"/subscriptions/{subscription_id}/providers/Microsoft.Authorization/roleDefinitions/{role_definition_id}",
                                 principal_id=user_object_id
@@ -68,13 +68,12 @@ class AzureModifyLogicAppTrigger(BaseTechnique):
             if not (new_trigger_uri.startswith("http://") or new_trigger_uri.startswith("https://")):
                 new_trigger_uri = "https://" + new_trigger_uri
 
-            # Get credential and subscription info
-            credential = AzureAccess.get_azure_auth_credential()
+            # Get subscription info
             current_sub_info = AzureAccess().get_current_subscription_info()
             subscription_id = current_sub_info.get("id")
             
             # Create LogicManagementClient
-            logic_client = LogicManagementClient(credential, subscription_id)
+            logic_client = AzureAccess().get_management_client(LogicManagementClient, subscription_id)
             
             # Get the current Logic App workflow
             workflow = logic_client.workflows.get(resource_group_name, logic_app_name)
@@ -97,12 +97,11 @@ class AzureRemoveRoleAssignment(BaseTechnique):
                 }
 
             # Get credentials
-            credential = AzureAccess.get_azure_auth_credential()
             # Retrieve subscription id
             current_sub_info = AzureAccess().get_current_subscription_info()
             subscription_id = current_sub_info.get("id")
             # Create client
-            auth_mgmt_client = AuthorizationManagementClient(credential, subscription_id)
+            auth_mgmt_client = AzureAccess().get_management_client(AuthorizationManagementClient, subscription_id)
 
             # Get all role definitions
             role_definitions = auth_mgmt_client.role_definitions.list(scope)
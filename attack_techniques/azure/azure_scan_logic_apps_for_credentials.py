@@ -5,6 +5,7 @@ from typing import Dict, Any, Tuple, List
 from azure.mgmt.logic import LogicManagementClient
 from azure.mgmt.resource import ResourceManagementClient
 from core.azure.azure_access import AzureAccess
+from core.azure.azure_task_runner import AzureTaskRunner
 import re
 
 class ConfidenceLevel(Enum):
@@ -145,19 +146,19 @@ class AzureScanLogicAppsForCredentials(BaseTechnique):
             resource_group_name: str = kwargs.get("resource_group_name", None)
             search_pattern: str = kwargs.get("search_pattern", None)
             confidence_level: str = kwargs.get("confidence_level", ConfidenceLevel.HIGH.value)
+            max_workers: int = kwargs.get("max_workers", None) or AzureTaskRunner.DEFAULT_MAX_WORKERS
 
             # Validate confidence level
             if confidence_level not in [e.value for e in ConfidenceLevel]:
                 confidence_level = ConfidenceLevel.HIGH.value
 
-            # Get credential and subscription
-            credential = AzureAccess.get_azure_auth_credential()
+            # Get subscription
             current_sub_info = AzureAccess().get_current_subscription_info()
             subscription_id = current_sub_info.get("id")
             
             # Create clients
-            logic_client = LogicManagementClient(credential, subscription_id)
-            resource_client = ResourceManagementClient(credential, subscription_id)
+            logic_client = AzureAccess().get_management_client(LogicManagementClient, subscription_id)
+            resource_client = AzureAccess().get_management_client(ResourceManagementClient, subscription_id)
 
             findings = []
             stats = {
@@ -176,12 +177,14 @@ class AzureScanLogicAppsForCredentials(BaseTechnique):
             else:
                 rg_list = [rg.name for rg in resource_client.resource_groups.list()]
 
-            for rg_name in rg_list:
+            def scan_resource_group(rg_name):
+                """Scans the Logic Apps of a resource group. Returns its findings and counters"""
+                rg_result = {"findings": [], "apps_scanned": 0, "error_count": 0}
                 try:
                     logic_apps = logic_client.workflows.list_by_resource_group(rg_name)
                     for app in logic_apps:
                         try:
-                            stats["apps_scanned"] += 1
+                            rg_result["apps_scanned"] += 1
                             workflow = logic_client.workflows.get(rg_name, app.name)
                             
                             app_findings = []
@@ -205,11 +208,7 @@ class AzureScanLogicAppsForCredentials(BaseTechnique):
                                 app_findings.extend(param_findings)
 
                             if app_findings:
-                                stats["apps_with_findings"] += 1
-                                for finding in app_findings:
-                                    stats["findings_by_confidence"][finding["confidence"]] += 1
-                                
-                                findings.append({
+                                rg_result["findings"].append({
                                     "logic_app_name": app.name,
                                     "resource_group": rg_name,
                                     "location": app.location,
@@ -218,14 +217,25 @@ class AzureScanLogicAppsForCredentials(BaseTechnique):
                                 })
 
                         except Exception as e:
-                            stats["error_count"] += 1
+                            rg_result["error_count"] += 1
                             print(f"Error scanning Logic App {app.name}: {str(e)}")
                             continue
 
                 except Exception as e:
-                    stats["error_count"] += 1
+                    rg_result["error_count"] += 1
                     print(f"Error accessing resource group {rg_name}: {str(e)}")
-                    continue
+                return rg_result
+
+            # Scan resource groups concurrently
+            rg_results = AzureTaskRunner.get_instance().map(scan_resource_group, rg_list, subscription_id, max_workers)
+            for rg_result in rg_results:
+                stats["apps_scanned"] += rg_result["apps_scanned"]
+                stats["error_count"] += rg_result["error_count"]
+                for app_result in rg_result["findings"]:
+                    stats["apps_with_findings"] += 1
+                    for finding in app_result["findings"]:
+                        stats["findings_by_confidence"][finding["confidence"]] += 1
+                    findings.append(app_result)
 
             return ExecutionStatus.SUCCESS, {
                 "message": f"Scan completed with confidence level: {confidence_level}. Found potential credentials in {stats['apps_with_findings']} Logic Apps",
@@ -263,5 +273,12 @@ class AzureScanLogicAppsForCredentials(BaseTechnique):
                 "default": "high",
                 "name": "Confidence Level (low/medium/high)",
                 "input_field_type": "text"
+            },
+            "max_workers": {
+                "type": "int",
+                "required": False,
+                "default": AzureTaskRunner.DEFAULT_MAX_WORKERS,
+                "name": "Max Worker Threads",
+                "input_field_type": "number"
             }
         }
\ No newline at end of file
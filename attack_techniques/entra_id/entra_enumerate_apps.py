@@ -1,7 +1,8 @@
 from ..base_technique import BaseTechnique, ExecutionStatus, MitreTechnique
 from ..technique_registry import TechniqueRegistry
-from typing import Dict, Any, Tuple
-from core.entra.graph_request import GraphRequest
+from typing import Dict, Any, Tuple, Optional
+from core.entra.graph_request import GraphRequest, GraphRequestError
+from core.output_manager.output_manager import OutputManager
 
 @TechniqueRegistry.register
 class EntraEnumerateApps(BaseTechnique):
@@ -22,44 +23,32 @@ class EntraEnumerateApps(BaseTechnique):
         try:
             permission_id: str = kwargs.get('permission_id', None)
             access_token: str = kwargs.get('access_token', None)
+            stream_output: bool = kwargs.get('stream_output', False)
+
+            if stream_output in [None, ""]:
+                stream_output = False
 
             endpoint_url = "https://graph.microsoft.com/v1.0/applications/"
 
-            # recon applications
-            if access_token:
-                app_recon = GraphRequest().get(url = endpoint_url, access_token=access_token)
-            else:
-                app_recon = GraphRequest().get(url = endpoint_url)
-                
-            if 'error' in app_recon:
-                return ExecutionStatus.FAILURE, {
-                    "error": str(app_recon.get('error', "")),
-                    "message": "Failed to recon applications in tenant"
+            # recon applications, filtering each page as it arrives
+            app_recon = GraphRequest().iter_items(url = endpoint_url, access_token=access_token or None)
+            apps = (app_info for app_info in (self._parse_app(app, permission_id) for app in app_recon) if app_info is not None)
+
+            if stream_output:
+                # Write apps to the technique output file instead of collecting them in memory
+                with OutputManager.get_instance().open_output_stream(self.__class__.__name__) as output_stream:
+                    output_stream.write_many(apps)
+
+                return ExecutionStatus.SUCCESS, {
+                    "message": f"Successfully enumerated {output_stream.count} apps to {output_stream.file_path}",
+                    "value": {
+                        "apps_enumerated": output_stream.count,
+                        "output_file": str(output_stream.file_path),
+                        "event_id": output_stream.event_id
+                    }
                 }
-            
-            apps_enumerated = []
 
-            for app in app_recon:
-                if permission_id:
-                    # enumerate through apps to find app with the associated permission
-                    required_resource_access = app.get('requiredResourceAccess', [])
-                    for resource in required_resource_access:
-                        resource_accesses = resource.get('resourceAccess', [])
-                        for access in resource_accesses:
-                            if access.get('id') == permission_id:
-                                apps_enumerated.append({
-                                    'display_name' : app.get('displayName', 'N/A'),
-                                    'id' : app.get('id', 'N/A'),
-                                    'app_id' : app.get('appId', 'N/A')
-                                })
-                                break
-                else:
-                    for app in app_recon:
-                        apps_enumerated.append({
-                            'display_name' : app.get('displayName', 'N/A'),
-                            'id' : app.get('id', 'N/A'),
-                            'app_id' : app.get('appId', 'N/A'),
-                        })
+            apps_enumerated = list(apps)
             
             if apps_enumerated:
                 return ExecutionStatus.SUCCESS, {
@@ -71,14 +60,36 @@ class EntraEnumerateApps(BaseTechnique):
                     "message": "No applications found in the tenant",
                     "value": []
                 }
+        except GraphRequestError as e:
+            return ExecutionStatus.FAILURE, {
+                "error": str(e.error),
+                "message": "Failed to recon applications in tenant"
+            }
         except Exception as e:
             return ExecutionStatus.FAILURE, {
                 "error": str(e),
                 "message": "Failed to recon applications in tenant"
             }
 
+    def _parse_app(self, app: Dict[str, Any], permission_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Extract enumerated fields from an application. Returns None if the app does not request permission_id"""
+        if permission_id:
+            # enumerate through the app's resources to find the associated permission
+            required_resource_access = app.get('requiredResourceAccess', [])
+            if not any(access.get('id') == permission_id
+                       for resource in required_resource_access
+                       for access in resource.get('resourceAccess', [])):
+                return None
+
+        return {
+            'display_name' : app.get('displayName', 'N/A'),
+            'id' : app.get('id', 'N/A'),
+            'app_id' : app.get('appId', 'N/A'),
+        }
+
     def get_parameters(self) -> Dict[str, Dict[str, Any]]:
         return {
             "permission_id": {"type": "str", "required": False, "default":None, "name": "Permission ID", "input_field_type" : "text"},
-            "access_token": {"type": "str", "required": False, "default":None, "name": "Access Token", "input_field_type" : "text"}
+            "access_token": {"type": "str", "required": False, "default":None, "name": "Access Token", "input_field_type" : "text"},
+            "stream_output": {"type": "bool", "required": False, "default": False, "name": "Stream Apps to Output File (for large tenants)", "input_field_type" : "bool"}
         }
\ No newline at end of file
@@ -1,7 +1,8 @@
 from ..base_technique import BaseTechnique, ExecutionStatus, MitreTechnique
 from ..technique_registry import TechniqueRegistry
 from typing import Dict, Any, Tuple
-from core.entra.graph_request import GraphRequest
+from core.entra.graph_request import GraphRequest, GraphRequestError
+from core.output_manager.output_manager import OutputManager
 
 @TechniqueRegistry.register
 class EntraEnumerateGroups(BaseTechnique):
@@ -20,30 +21,32 @@ class EntraEnumerateGroups(BaseTechnique):
         self.validate_parameters(kwargs)
         
         try:
+            stream_output: bool = kwargs.get('stream_output', False)
+
+            if stream_output in [None, ""]:
+                stream_output = False
+
             endpoint_url = "https://graph.microsoft.com/v1.0/groups"
             
-            raw_response = GraphRequest().get(url = endpoint_url)
+            # Get groups, parsing each page as it arrives
+            groups = (self._parse_group(group_info) for group_info in GraphRequest().iter_items(url = endpoint_url))
 
-            if 'error' in raw_response:
-                return ExecutionStatus.FAILURE, {
-                    "error": {"error_code" :raw_response.get('error').get('code'),
-                              "error_detail" : raw_response.get('error').get('message')
-                              },
-                    "message": "Failed to enumerate groups in tenant"
-                }
+            if stream_output:
+                # Write groups to the technique output file instead of collecting them in memory
+                with OutputManager.get_instance().open_output_stream(self.__class__.__name__) as output_stream:
+                    output_stream.write_many(groups)
 
-            output = []
-            if raw_response:
-                output = [({
-                    'display_name' : application_info.get('displayName', 'N/A'),
-                    'id' : application_info.get('id', 'N/A'),
-                    'description' : application_info.get('description', 'N/A'),
-                    'assignable_role' : application_info.get('isAssignableToRole', 'N/A'),
-                    'membership_rule' : application_info.get('membershipRule', 'N/A'),
-                    'security_enabled' : application_info.get('securityEnabled', 'N/A'),
-                    'visibility' : application_info.get('visibility', 'N/A')
-                }) for application_info in raw_response]
+                return ExecutionStatus.SUCCESS, {
+                    "message": f"Successfully enumerated {output_stream.count} groups to {output_stream.file_path}",
+                    "value": {
+                        "groups_enumerated": output_stream.count,
+                        "output_file": str(output_stream.file_path),
+                        "event_id": output_stream.event_id
+                    }
+                }
 
+            output = list(groups)
+            if output:
                 return ExecutionStatus.SUCCESS, {
                     "message": f"Successfully enumerated {len(output)} groups",
                     "value": output
@@ -54,11 +57,39 @@ class EntraEnumerateGroups(BaseTechnique):
                     "value": output
                 }
 
+        except GraphRequestError as e:
+            error = e.error if isinstance(e.error, dict) else {}
+            return ExecutionStatus.FAILURE, {
+                "error": {"error_code" : error.get('code'),
+                          "error_detail" : error.get('message', str(e))
+                          },
+                "message": "Failed to enumerate groups in tenant"
+            }
         except Exception as e:
             return ExecutionStatus.FAILURE, {
                 "error": str(e),
                 "message": "Failed to enumerate groups in tenant"
             }
 
+    def _parse_group(self, group_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract enumerated fields from a group"""
+        return {
+            'display_name' : group_info.get('displayName', 'N/A'),
+            'id' : group_info.get('id', 'N/A'),
+            'description' : group_info.get('description', 'N/A'),
+            'assignable_role' : group_info.get('isAssignableToRole', 'N/A'),
+            'membership_rule' : group_info.get('membershipRule', 'N/A'),
+            'security_enabled' : group_info.get('securityEnabled', 'N/A'),
+            'visibility' : group_info.get('visibility', 'N/A')
+        }
+
     def get_parameters(self) -> Dict[str, Dict[str, Any]]:
-        return {}
\ No newline at end of file
+        return {
+            "stream_output": {
+                "type": "bool", 
+                "required": False, 
+                "default": False, 
+                "name": "Stream Groups to Output File (for large tenants)", 
+                "input_field_type" : "bool"
+            }
+        }
\ No newline at end of file
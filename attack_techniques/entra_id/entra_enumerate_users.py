@@ -1,7 +1,8 @@
 from ..base_technique import BaseTechnique, ExecutionStatus, MitreTechnique
 from ..technique_registry import TechniqueRegistry
 from typing import Dict, Any, Tuple
-from core.entra.graph_request import GraphRequest
+from core.entra.graph_request import GraphRequest, GraphRequestError
+from core.output_manager.output_manager import OutputManager
 
 @TechniqueRegistry.register
 class EntraEnumerateUsers(BaseTechnique):
@@ -20,30 +21,32 @@ class EntraEnumerateUsers(BaseTechnique):
         self.validate_parameters(kwargs)
         
         try:
+            stream_output: bool = kwargs.get('stream_output', False)
+
+            if stream_output in [None, ""]:
+                stream_output = False
+
             endpoint_url = "https://graph.microsoft.com/v1.0/users/"
             
-            raw_response = GraphRequest().get(url = endpoint_url)
+            # Get users, parsing each page as it arrives
+            users = (self._parse_user(user_info) for user_info in GraphRequest().iter_items(url = endpoint_url))
 
-            if 'error' in raw_response:
-                return ExecutionStatus.FAILURE, {
-                    "error": {"error_code" :raw_response.get('error').get('code'),
-                              "error_detail" : raw_response.get('error').get('message')
-                              },
-                    "message": "Failed to enumerate users in tenant"
-                }
+            if stream_output:
+                # Write users to the technique output file instead of collecting them in memory
+                with OutputManager.get_instance().open_output_stream(self.__class__.__name__) as output_stream:
+                    output_stream.write_many(users)
 
-            output = []
-            if raw_response:
-                output = [({
-                    'display_name' : user_info.get('displayName', 'N/A'),
-                    'upn' : user_info.get('userPrincipalName', 'N/A'),
-                    'mail' : user_info.get('mail', 'N/A'),
-                    'job_title' : user_info.get('jobTitle', 'N/A'),
-                    'mobile_phone' : user_info.get('mobilePhone', 'N/A'),
-                    'office_ocation' : user_info.get('officeLocation', 'N/A'),
-                    'id' : user_info.get('id', 'N/A'),
-                }) for user_info in raw_response]
+                return ExecutionStatus.SUCCESS, {
+                    "message": f"Successfully enumerated {output_stream.count} users to {output_stream.file_path}",
+                    "value": {
+                        "users_enumerated": output_stream.count,
+                        "output_file": str(output_stream.file_path),
+                        "event_id": output_stream.event_id
+                    }
+                }
 
+            output = list(users)
+            if output:
                 return ExecutionStatus.SUCCESS, {
                     "message": f"Successfully enumerated {len(output)} users",
                     "value": output
@@ -54,11 +57,39 @@ class EntraEnumerateUsers(BaseTechnique):
                     "value": output
                 }
 
+        except GraphRequestError as e:
+            error = e.error if isinstance(e.error, dict) else {}
+            return ExecutionStatus.FAILURE, {
+                "error": {"error_code" : error.get('code'),
+                          "error_detail" : error.get('message', str(e))
+                          },
+                "message": "Failed to enumerate users in tenant"
+            }
         except Exception as e:
             return ExecutionStatus.FAILURE, {
                 "error": str(e),
                 "message": "Failed to enumerate users in tenant"
             }
 
+    def _parse_user(self, user_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract enumerated fields from a user"""
+        return {
+            'display_name' : user_info.get('displayName', 'N/A'),
+            'upn' : user_info.get('userPrincipalName', 'N/A'),
+            'mail' : user_info.get('mail', 'N/A'),
+            'job_title' : user_info.get('jobTitle', 'N/A'),
+            'mobile_phone' : user_info.get('mobilePhone', 'N/A'),
+            'office_ocation' : user_info.get('officeLocation', 'N/A'),
+            'id' : user_info.get('id', 'N/A'),
+        }
+
     def get_parameters(self) -> Dict[str, Dict[str, Any]]:
-        return {}
\ No newline at end of file
+        return {
+            "stream_output": {
+                "type": "bool", 
+                "required": False, 
+                "default": False, 
+                "name": "Stream Users to Output File (for large tenants)", 
+                "input_field_type" : "bool"
+            }
+        }
\ No newline at end of file
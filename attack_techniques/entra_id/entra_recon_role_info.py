@@ -71,28 +71,36 @@ class EntraReconRoleInfo(BaseTechnique):
             
             recon_results["role_basic_info"] = role_info
             
-            # Step 2: Get role members
-            members_result = self._get_role_members(role_info.get('id'))
+            # Step 2: Fetch role members, assignments, admin unit assignments, PIM eligibility and role definition in one batch
+            role_template_id = role_info.get('roleTemplateId')
+            request_urls = self._get_request_urls(role_info.get('id'), role_template_id, include_pim_data)
+            responses = dict(zip(request_urls.keys(), GraphRequest().batch(list(request_urls.values()))))
+
+            # Step 3: Resolve assigned principals and administrative units with batched requests
+            directory_objects = self._get_directory_objects(responses)
+
+            # Step 4: Get role members
+            members_result = self._get_role_members(responses['role_members'])
             recon_results["role_members"] = members_result["members"]
             
-            # Step 3: Get detailed role assignments
-            assignments_result = self._get_role_assignments(role_info.get('roleTemplateId', role_info.get('id')))
+            # Step 5: Get detailed role assignments
+            assignments_result = self._get_role_assignments(responses['role_assignments'], directory_objects)
             recon_results["role_assignments"] = assignments_result["assignments"]
             
-            # Step 4: Check administrative unit assignments
-            admin_units_result = self._get_administrative_unit_assignments(role_info.get('roleTemplateId'))
+            # Step 6: Check administrative unit assignments
+            admin_units_result = self._get_administrative_unit_assignments(responses['admin_unit_assignments'], directory_objects)
             recon_results["administrative_units"] = admin_units_result["admin_units"]
             
-            # Step 5: Get PIM eligible assignments (if requested)
+            # Step 7: Get PIM eligible assignments (if requested)
             if include_pim_data:
-                pim_result = self._get_pim_eligible_assignments(role_info.get('roleTemplateId'))
+                pim_result = self._get_pim_eligible_assignments(responses['pim_eligible_assignments'], directory_objects)
                 recon_results["pim_eligible_assignments"] = pim_result["eligible_assignments"]
             
-            # Step 6: Analyze role permissions and scope
-            permissions_result = self._analyze_role_permissions(role_info.get('roleTemplateId'))
+            # Step 8: Analyze role permissions and scope
+            permissions_result = self._analyze_role_permissions(responses['role_definition'])
             recon_results["role_permissions"] = permissions_result["permissions"]
             
-            # Step 7: Generate privilege analysis summary
+            # Step 9: Generate privilege analysis summary
             privilege_analysis = self._generate_privilege_analysis(recon_results)
             recon_results["privilege_analysis"] = privilege_analysis
             
@@ -193,12 +201,47 @@ class EntraReconRoleInfo(BaseTechnique):
         
         return None
 
-    def _get_role_members(self, role_id: str) -> Dict[str, Any]:
-        """Get all members of the specified role"""
+    def _get_request_urls(self, role_id: str, role_template_id: str, include_pim_data: bool) -> Dict[str, str]:
+        """Graph API endpoints queried for the role, keyed by the section they are used for"""
+        request_urls = {
+            "role_members": f"https://graph.microsoft.com/v1.0/directoryRoles/{role_id}/members",
+            "role_assignments": f"https://graph.microsoft.com/v1.0/roleManagement/directory/roleAssignments?$filter=roleDefinitionId eq '{role_template_id}'",
+            "admin_unit_assignments": f"https://graph.microsoft.com/v1.0/roleManagement/directory/roleAssignments?$filter=roleDefinitionId eq '{role_template_id}' and directoryScopeId ne '/'",
+            "role_definition": f"https://graph.microsoft.com/v1.0/roleManagement/directory/roleDefinitions/{role_template_id}"
+        }
+        if include_pim_data:
+            request_urls["pim_eligible_assignments"] = f"https://graph.microsoft.com/v1.0/roleManagement/directory/roleEligibilitySchedules?$filter=roleDefinitionId eq '{role_template_id}'"
+        return request_urls
+
+    def _get_directory_objects(self, responses: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch the principals and administrative units referenced by the role's assignments with batched requests"""
+        object_urls = {}
+        for key in ["role_assignments", "pim_eligible_assignments"]:
+            response = responses.get(key)
+            if isinstance(response, list):
+                for assignment in response:
+                    principal_id = assignment.get("principalId")
+                    if principal_id:
+                        object_urls[principal_id] = f"https://graph.microsoft.com/v1.0/directoryObjects/{principal_id}"
+
+        response = responses.get("admin_unit_assignments")
+        if isinstance(response, list):
+            for assignment in response:
+                scope_id = assignment.get("directoryScopeId", "")
+                if scope_id and scope_id != "/":
+                    au_id = scope_id.replace("/administrativeUnits/", "")
+                    object_urls[au_id] = f"https://graph.microsoft.com/v1.0/administrativeUnits/{au_id}"
+
+        if not object_urls:
+            return {}
+        try:
+            return dict(zip(object_urls.keys(), GraphRequest().batch(list(object_urls.values()))))
+        except Exception as e:
+            return {object_id: e for object_id in object_urls}
+
+    def _get_role_members(self, response: Any) -> Dict[str, Any]:
+        """Get all members of the specified role from the Graph response"""
         try:
-            endpoint_url = f"https://graph.microsoft.com/v1.0/directoryRoles/{role_id}/members"
-            response = GraphRequest().get(url=endpoint_url)
-            
             if 'error' in response:
                 return {
                     "members": [],
@@ -229,12 +272,9 @@ class EntraReconRoleInfo(BaseTechnique):
                 "error": f"Exception getting role members: {str(e)}"
             }
 
-    def _get_role_assignments(self, role_template_id: str) -> Dict[str, Any]:
-        """Get detailed role assignments including scope and conditions"""
+    def _get_role_assignments(self, response: Any, directory_objects: Dict[str, Any]) -> Dict[str, Any]:
+        """Get detailed role assignments including scope and conditions from the Graph response"""
         try:
-            endpoint_url = f"https://graph.microsoft.com/v1.0/roleManagement/directory/roleAssignments?$filter=roleDefinitionId eq '{role_template_id}'"
-            response = GraphRequest().get(url=endpoint_url)
-            
             if 'error' in response:
                 return {
                     "assignments": [],
@@ -246,7 +286,7 @@ class EntraReconRoleInfo(BaseTechnique):
                 for assignment in response:
                     # Get principal details
                     principal_id = assignment.get("principalId")
-                    principal_details = self._get_principal_details(principal_id)
+                    principal_details = self._get_principal_details(principal_id, directory_objects.get(principal_id))
                     
                     assignments.append({
                         "id": assignment.get("id", "N/A"),
@@ -269,12 +309,9 @@ class EntraReconRoleInfo(BaseTechnique):
                 "error": f"Exception getting role assignments: {str(e)}"
             }
 
-    def _get_administrative_unit_assignments(self, role_template_id: str) -> Dict[str, Any]:
-        """Get administrative unit scoped role assignments"""
+    def _get_administrative_unit_assignments(self, response: Any, directory_objects: Dict[str, Any]) -> Dict[str, Any]:
+        """Get administrative unit scoped role assignments from the Graph response"""
         try:
-            endpoint_url = f"https://graph.microsoft.com/v1.0/roleManagement/directory/roleAssignments?$filter=roleDefinitionId eq '{role_template_id}' and directoryScopeId ne '/'"
-            response = GraphRequest().get(url=endpoint_url)
-            
             if 'error' in response:
                 return {
                     "admin_units": [],
@@ -288,7 +325,7 @@ class EntraReconRoleInfo(BaseTechnique):
                     if scope_id and scope_id != "/":
                         # Extract AU ID and get details
                         au_id = scope_id.replace("/administrativeUnits/", "")
-                        au_details = self._get_administrative_unit_details(au_id)
+                        au_details = self._get_administrative_unit_details(directory_objects.get(au_id))
                         
                         admin_unit_assignments.append({
                             "assignmentId": assignment.get("id", "N/A"),
@@ -308,12 +345,9 @@ class EntraReconRoleInfo(BaseTechnique):
                 "error": f"Exception getting admin unit assignments: {str(e)}"
             }
 
-    def _get_pim_eligible_assignments(self, role_template_id: str) -> Dict[str, Any]:
-        """Get PIM eligible assignments for the role"""
+    def _get_pim_eligible_assignments(self, response: Any, directory_objects: Dict[str, Any]) -> Dict[str, Any]:
+        """Get PIM eligible assignments for the role from the Graph response"""
         try:
-            endpoint_url = f"https://graph.microsoft.com/v1.0/roleManagement/directory/roleEligibilitySchedules?$filter=roleDefinitionId eq '{role_template_id}'"
-            response = GraphRequest().get(url=endpoint_url)
-            
             if 'error' in response:
                 return {
                     "eligible_assignments": [],
@@ -323,7 +357,7 @@ class EntraReconRoleInfo(BaseTechnique):
             eligible_assignments = []
             if response:
                 for assignment in response:
-                    principal_details = self._get_principal_details(assignment.get("principalId"))
+                    principal_details = self._get_principal_details(assignment.get("principalId"), directory_objects.get(assignment.get("principalId")))
                     
                     eligible_assignments.append({
                         "id": assignment.get("id", "N/A"),
@@ -346,12 +380,9 @@ class EntraReconRoleInfo(BaseTechnique):
                 "error": f"Exception getting PIM eligible assignments: {str(e)}"
             }
 
-    def _analyze_role_permissions(self, role_template_id: str) -> Dict[str, Any]:
-        """Analyze role permissions and capabilities"""
+    def _analyze_role_permissions(self, response: Any) -> Dict[str, Any]:
+        """Analyze role permissions and capabilities from the Graph response"""
         try:
-            endpoint_url = f"https://graph.microsoft.com/v1.0/roleManagement/directory/roleDefinitions/{role_template_id}"
-            response = GraphRequest().get(url=endpoint_url)
-            
             if 'error' in response:
                 return {
                     "permissions": [],
@@ -376,14 +407,14 @@ class EntraReconRoleInfo(BaseTechnique):
                 "error": f"Exception analyzing role permissions: {str(e)}"
             }
 
-    def _get_principal_details(self, principal_id: str) -> Dict[str, Any]:
-        """Get details about a principal (user, group, or service principal)"""
+    def _get_principal_details(self, principal_id: str, response: Any) -> Dict[str, Any]:
+        """Get details about a principal (user, group, or service principal) from its directory object"""
         try:
-            # Try user first
-            endpoint_url = f"https://graph.microsoft.com/v1.0/users/{principal_id}"
-            response = GraphRequest().get(url=endpoint_url)
-            
-            if 'error' not in response:
+            if isinstance(response, Exception):
+                raise response
+
+            principal_type = response.get("@odata.type", "") if response and 'error' not in response else ""
+            if principal_type == "#microsoft.graph.user":
                 return {
                     "type": "user",
                     "displayName": response.get("displayName", "N/A"),
@@ -392,11 +423,7 @@ class EntraReconRoleInfo(BaseTechnique):
                     "userType": response.get("userType", "N/A")
                 }
             
-            # Try group
-            endpoint_url = f"https://graph.microsoft.com/v1.0/groups/{principal_id}"
-            response = GraphRequest().get(url=endpoint_url)
-            
-            if 'error' not in response:
+            if principal_type == "#microsoft.graph.group":
                 return {
                     "type": "group",
                     "displayName": response.get("displayName", "N/A"),
@@ -404,11 +431,7 @@ class EntraReconRoleInfo(BaseTechnique):
                     "securityEnabled": response.get("securityEnabled", "N/A")
                 }
             
-            # Try service principal
-            endpoint_url = f"https://graph.microsoft.com/v1.0/servicePrincipals/{principal_id}"
-            response = GraphRequest().get(url=endpoint_url)
-            
-            if 'error' not in response:
+            if principal_type == "#microsoft.graph.servicePrincipal":
                 return {
                     "type": "servicePrincipal",
                     "displayName": response.get("displayName", "N/A"),
@@ -429,13 +452,13 @@ class EntraReconRoleInfo(BaseTechnique):
                 "error": str(e)
             }
 
-    def _get_administrative_unit_details(self, au_id: str) -> Dict[str, Any]:
-        """Get administrative unit details"""
+    def _get_administrative_unit_details(self, response: Any) -> Dict[str, Any]:
+        """Get administrative unit details from the Graph response"""
         try:
-            endpoint_url = f"https://graph.microsoft.com/v1.0/administrativeUnits/{au_id}"
-            response = GraphRequest().get(url=endpoint_url)
-            
-            if 'error' not in response:
+            if isinstance(response, Exception):
+                raise response
+
+            if response and 'error' not in response:
                 return {
                     "displayName": response.get("displayName", "N/A"),
                     "description": response.get("description", "N/A"),
@@ -63,9 +63,13 @@ class EntraReconUserInfo(BaseTechnique):
 
             results = {}
             failed_operations = []
+
+            # Fetch all user information in batched requests
+            request_urls = self._get_request_urls(user_identifier)
+            responses = dict(zip(request_urls.keys(), GraphRequest().batch(list(request_urls.values()))))
             
             # 1. Get basic user information
-            basic_info_success, basic_info = self._get_basic_user_info(user_identifier)
+            basic_info_success, basic_info = self._get_basic_user_info(responses["basic_info"])
             if basic_info_success:
                 results["basic_info"] = basic_info
             else:
@@ -73,7 +77,7 @@ class EntraReconUserInfo(BaseTechnique):
                 results["basic_info"] = {"error": basic_info.get("error", "Failed to retrieve basic user information")}
 
             # 2. Get user's group memberships
-            groups_success, groups_info = self._get_user_groups(user_identifier)
+            groups_success, groups_info = self._get_user_groups(responses["group_memberships"])
             if groups_success:
                 results["group_memberships"] = groups_info
             else:
@@ -81,7 +85,7 @@ class EntraReconUserInfo(BaseTechnique):
                 results["group_memberships"] = {"error": groups_info.get("error", "Failed to retrieve group memberships")}
 
             # 3. Get user's directory role assignments
-            roles_success, roles_info = self._get_user_directory_roles(user_identifier)
+            roles_success, roles_info = self._get_user_directory_roles(responses["role_assignments"], responses["directory_roles"])
             if roles_success:
                 results["directory_roles"] = roles_info
             else:
@@ -89,7 +93,7 @@ class EntraReconUserInfo(BaseTechnique):
                 results["directory_roles"] = {"error": roles_info.get("error", "Failed to retrieve directory roles")}
 
             # 4. Get user's application assignments
-            apps_success, apps_info = self._get_user_app_assignments(user_identifier)
+            apps_success, apps_info = self._get_user_app_assignments(responses["app_assignments"])
             if apps_success:
                 results["app_assignments"] = apps_info
             else:
@@ -97,7 +101,7 @@ class EntraReconUserInfo(BaseTechnique):
                 results["app_assignments"] = {"error": apps_info.get("error", "Failed to retrieve application assignments")}
 
             # 5. Get user's manager information
-            manager_success, manager_info = self._get_user_manager(user_identifier)
+            manager_success, manager_info = self._get_user_manager(responses["manager_info"])
             if manager_success:
                 results["manager_info"] = manager_info
             else:
@@ -105,7 +109,7 @@ class EntraReconUserInfo(BaseTechnique):
                 results["manager_info"] = {"error": manager_info.get("error", "Failed to retrieve manager information")}
 
             # 6. Get user's direct reports
-            reports_success, reports_info = self._get_user_direct_reports(user_identifier)
+            reports_success, reports_info = self._get_user_direct_reports(responses["direct_reports"])
             if reports_success:
                 results["direct_reports"] = reports_info
             else:
@@ -113,7 +117,7 @@ class EntraReconUserInfo(BaseTechnique):
                 results["direct_reports"] = {"error": reports_info.get("error", "Failed to retrieve direct reports")}
 
             # 7. Get user's owned objects
-            owned_success, owned_info = self._get_user_owned_objects(user_identifier)
+            owned_success, owned_info = self._get_user_owned_objects(responses["owned_objects"])
             if owned_success:
                 results["owned_objects"] = owned_info
             else:
@@ -121,7 +125,7 @@ class EntraReconUserInfo(BaseTechnique):
                 results["owned_objects"] = {"error": owned_info.get("error", "Failed to retrieve owned objects")}
 
             # 8. Get user's registered devices
-            devices_success, devices_info = self._get_user_registered_devices(user_identifier)
+            devices_success, devices_info = self._get_user_registered_devices(responses["registered_devices"])
             if devices_success:
                 results["registered_devices"] = devices_info
             else:
@@ -158,24 +162,34 @@ class EntraReconUserInfo(BaseTechnique):
                 "message": "Failed to perform user reconnaissance"
             }
 
-    def _get_basic_user_info(self, user_identifier: str) -> Tuple[bool, Dict[str, Any]]:
-        """Get primary user information"""
-        try:
-            # Use $select to get all relevant user properties
-            select_params = [
-                "id", "userPrincipalName", "displayName", "givenName", "surname", 
-                "mail", "mailNickname", "jobTitle", "department", "companyName",
-                "officeLocation", "city", "state", "country", "streetAddress",
-                "postalCode", "businessPhones", "mobilePhone", "faxNumber",
-                "employeeId", "employeeType", "preferredLanguage", "usageLocation",
-                "userType", "accountEnabled", "createdDateTime", "lastPasswordChangeDateTime",
-                "passwordPolicies", "assignedLicenses", "assignedPlans", "aboutMe"
-            ]
-            
-            endpoint_url = f"https://graph.microsoft.com/v1.0/users/{user_identifier}?$select={','.join(select_params)}"
-            
-            raw_response = GraphRequest().get(url=endpoint_url)
+    def _get_request_urls(self, user_identifier: str) -> Dict[str, str]:
+        """Graph endpoints queried for the user, keyed by the information they return"""
+        # Use $select to get all relevant user properties
+        select_params = [
+            "id", "userPrincipalName", "displayName", "givenName", "surname", 
+            "mail", "mailNickname", "jobTitle", "department", "companyName",
+            "officeLocation", "city", "state", "country", "streetAddress",
+            "postalCode", "businessPhones", "mobilePhone", "faxNumber",
+            "employeeId", "employeeType", "preferredLanguage", "usageLocation",
+            "userType", "accountEnabled", "createdDateTime", "lastPasswordChangeDateTime",
+            "passwordPolicies", "assignedLicenses", "assignedPlans", "aboutMe"
+        ]
 
+        return {
+            "basic_info": f"https://graph.microsoft.com/v1.0/users/{user_identifier}?$select={','.join(select_params)}",
+            "group_memberships": f"https://graph.microsoft.com/v1.0/users/{user_identifier}/memberOf?$select=id,displayName,description,groupTypes,securityEnabled,mailEnabled,isAssignableToRole",
+            "role_assignments": f"https://graph.microsoft.com/v1.0/users/{user_identifier}/appRoleAssignments?$select=id,principalDisplayName,principalId,principalType,resourceDisplayName,resourceId,appRoleId",
+            "directory_roles": f"https://graph.microsoft.com/v1.0/users/{user_identifier}/memberOf/microsoft.graph.directoryRole?$select=id,displayName,description,roleTemplateId",
+            "app_assignments": f"https://graph.microsoft.com/v1.0/users/{user_identifier}/appRoleAssignments?$select=id,appRoleId,principalDisplayName,resourceDisplayName,resourceId,createdDateTime",
+            "manager_info": f"https://graph.microsoft.com/v1.0/users/{user_identifier}/manager?$select=id,displayName,userPrincipalName,jobTitle,department",
+            "direct_reports": f"https://graph.microsoft.com/v1.0/users/{user_identifier}/directReports?$select=id,displayName,userPrincipalName,jobTitle,department",
+            "owned_objects": f"https://graph.microsoft.com/v1.0/users/{user_identifier}/ownedObjects?$select=id,displayName",
+            "registered_devices": f"https://graph.microsoft.com/v1.0/users/{user_identifier}/registeredDevices?$select=id,displayName,deviceId,operatingSystem,operatingSystemVersion,trustType,isCompliant,isManaged"
+        }
+
+    def _get_basic_user_info(self, raw_response: Any) -> Tuple[bool, Dict[str, Any]]:
+        """Get primary user information from the Graph response"""
+        try:
             if 'error' in raw_response:
                 return False, {"error": f"Error {raw_response.get('error').get('code')}: {raw_response.get('error').get('message')}"}
 
@@ -219,13 +233,9 @@ class EntraReconUserInfo(BaseTechnique):
         except Exception as e:
             return False, {"error": str(e)}
 
-    def _get_user_groups(self, user_identifier: str) -> Tuple[bool, Dict[str, Any]]:
-        """Get user's group memberships"""
+    def _get_user_groups(self, raw_response: Any) -> Tuple[bool, Dict[str, Any]]:
+        """Get user's group memberships from the Graph response"""
         try:
-            endpoint_url = f"https://graph.microsoft.com/v1.0/users/{user_identifier}/memberOf?$select=id,displayName,description,groupTypes,securityEnabled,mailEnabled,isAssignableToRole"
-            
-            raw_response = GraphRequest().get(url=endpoint_url)
-
             if 'error' in raw_response:
                 return False, {"error": f"Error {raw_response.get('error').get('code')}: {raw_response.get('error').get('message')}"}
 
@@ -249,21 +259,12 @@ class EntraReconUserInfo(BaseTechnique):
         except Exception as e:
             return False, {"error": str(e)}
 
-    def _get_user_directory_roles(self, user_identifier: str) -> Tuple[bool, Dict[str, Any]]:
-        """Get user's directory role assignments"""
+    def _get_user_directory_roles(self, raw_response: Any, dir_roles_response: Any) -> Tuple[bool, Dict[str, Any]]:
+        """Get user's directory role assignments from the Graph response"""
         try:
-            endpoint_url = f"https://graph.microsoft.com/v1.0/users/{user_identifier}/appRoleAssignments?$select=id,principalDisplayName,principalId,principalType,resourceDisplayName,resourceId,appRoleId"
-            
-            raw_response = GraphRequest().get(url=endpoint_url)
-
             if 'error' in raw_response:
                 return False, {"error": f"Error {raw_response.get('error').get('code')}: {raw_response.get('error').get('message')}"}
 
-            # Get directory role memberships
-            dir_roles_url = f"https://graph.microsoft.com/v1.0/users/{user_identifier}/memberOf/microsoft.graph.directoryRole?$select=id,displayName,description,roleTemplateId"
-            
-            dir_roles_response = GraphRequest().get(url=dir_roles_url)
-            
             directory_roles = []
             if not ('error' in dir_roles_response):
                 for role in dir_roles_response:
@@ -300,13 +301,9 @@ class EntraReconUserInfo(BaseTechnique):
         except Exception as e:
             return False, {"error": str(e)}
 
-    def _get_user_app_assignments(self, user_identifier: str) -> Tuple[bool, Dict[str, Any]]:
-        """Get user's application assignments"""
+    def _get_user_app_assignments(self, raw_response: Any) -> Tuple[bool, Dict[str, Any]]:
+        """Get user's application assignments from the Graph response"""
         try:
-            endpoint_url = f"https://graph.microsoft.com/v1.0/users/{user_identifier}/appRoleAssignments?$select=id,appRoleId,principalDisplayName,resourceDisplayName,resourceId,createdDateTime"
-            
-            raw_response = GraphRequest().get(url=endpoint_url)
-
             if 'error' in raw_response:
                 return False, {"error": f"Error {raw_response.get('error').get('code')}: {raw_response.get('error').get('message')}"}
 
@@ -329,13 +326,9 @@ class EntraReconUserInfo(BaseTechnique):
         except Exception as e:
             return False, {"error": str(e)}
 
-    def _get_user_manager(self, user_identifier: str) -> Tuple[bool, Dict[str, Any]]:
-        """Get user's manager information"""
+    def _get_user_manager(self, raw_response: Any) -> Tuple[bool, Dict[str, Any]]:
+        """Get user's manager information from the Graph response"""
         try:
-            endpoint_url = f"https://graph.microsoft.com/v1.0/users/{user_identifier}/manager?$select=id,displayName,userPrincipalName,jobTitle,department"
-            
-            raw_response = GraphRequest().get(url=endpoint_url)
-
             if 'error' in raw_response:
                 return False, {"error": f"Error {raw_response.get('error').get('code')}: {raw_response.get('error').get('message')}"}
 
@@ -352,13 +345,9 @@ class EntraReconUserInfo(BaseTechnique):
         except Exception as e:
             return False, {"error": str(e)}
 
-    def _get_user_direct_reports(self, user_identifier: str) -> Tuple[bool, Dict[str, Any]]:
-        """Get user's direct reports"""
+    def _get_user_direct_reports(self, raw_response: Any) -> Tuple[bool, Dict[str, Any]]:
+        """Get user's direct reports from the Graph response"""
         try:
-            endpoint_url = f"https://graph.microsoft.com/v1.0/users/{user_identifier}/directReports?$select=id,displayName,userPrincipalName,jobTitle,department"
-            
-            raw_response = GraphRequest().get(url=endpoint_url)
-
             if 'error' in raw_response:
                 return False, {"error": f"Error {raw_response.get('error').get('code')}: {raw_response.get('error').get('message')}"}
 
@@ -380,13 +369,9 @@ class EntraReconUserInfo(BaseTechnique):
         except Exception as e:
             return False, {"error": str(e)}
 
-    def _get_user_owned_objects(self, user_identifier: str) -> Tuple[bool, Dict[str, Any]]:
-        """Get objects owned by the user"""
+    def _get_user_owned_objects(self, raw_response: Any) -> Tuple[bool, Dict[str, Any]]:
+        """Get objects owned by the user from the Graph response"""
         try:
-            endpoint_url = f"https://graph.microsoft.com/v1.0/users/{user_identifier}/ownedObjects?$select=id,displayName"
-            
-            raw_response = GraphRequest().get(url=endpoint_url)
-
             if 'error' in raw_response:
                 return False, {"error": f"Error {raw_response.get('error').get('code')}: {raw_response.get('error').get('message')}"}
 
@@ -406,13 +391,9 @@ class EntraReconUserInfo(BaseTechnique):
         except Exception as e:
             return False, {"error": str(e)}
 
-    def _get_user_registered_devices(self, user_identifier: str) -> Tuple[bool, Dict[str, Any]]:
-        """Get devices registered by the user"""
+    def _get_user_registered_devices(self, raw_response: Any) -> Tuple[bool, Dict[str, Any]]:
+        """Get devices registered by the user from the Graph response"""
         try:
-            endpoint_url = f"https://graph.microsoft.com/v1.0/users/{user_identifier}/registeredDevices?$select=id,displayName,deviceId,operatingSystem,operatingSystemVersion,trustType,isCompliant,isManaged"
-            
-            raw_response = GraphRequest().get(url=endpoint_url)
-
             if 'error' in raw_response:
                 return False, {"error": f"Error {raw_response.get('error').get('code')}: {raw_response.get('error').get('message')}"}
 
@@ -6,6 +6,7 @@ import json
 import base64
 
 from core.gcp.gcp_access import GCPAccess
+from core.gcp.gcp_quota_limiter import GCPQuotaLimiter
 from google.cloud import storage
 from google.api_core.exceptions import PermissionDenied, Forbidden
 from google.oauth2.service_account import Credentials as ServiceAccountCredentials
@@ -162,7 +163,7 @@ class GCPEnumerateCloudStorageBuckets(BaseTechnique):
                     
                     # Check for public IAM policies
                     try:
-                        policy = bucket.get_iam_policy()
+                        policy = GCPQuotaLimiter.get_instance().call((storage_client.project, "storage"), bucket.get_iam_policy)
                         public_roles = []
                         for binding in policy.bindings:
                             if "allUsers" in binding["members"] or "allAuthenticatedUsers" in binding["members"]:
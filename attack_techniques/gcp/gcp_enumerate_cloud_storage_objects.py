@@ -1,13 +1,12 @@
 from ..base_technique import BaseTechnique, ExecutionStatus, MitreTechnique, TechniqueNote, TechniqueReference
 from ..technique_registry import TechniqueRegistry
 
-from typing import Dict, Any, Tuple, List
-from datetime import datetime
+from typing import Dict, Any, Iterator, Tuple, List
 import json
 import base64
-import bisect
 
 from core.gcp.gcp_access import GCPAccess
+from core.output_manager.output_manager import OutputManager
 from google.cloud import storage
 from google.oauth2.service_account import Credentials as ServiceAccountCredentials
 from google.auth.transport.requests import Request
@@ -70,67 +69,68 @@ class GCPEnumerateCloudStorageObjects(BaseTechnique):
             notes=technique_notes
         )
 
-    def _list_objects(self, bucket: storage.Bucket, folder_path: str = None, recursive: bool = False, versions: bool = None) -> List[Dict[str, Any]]:
-        """Helper function to list objects in bucket with optional folder filtering"""
-        objects = []
-        
+    @staticmethod
+    def _list_blobs(bucket: storage.Bucket, folder_path: str = None, recursive: bool = False, versions: bool = None) -> Iterator[storage.Blob]:
+        """Lists blobs under a folder. Non-recursive listings are filtered server-side with the '/' delimiter"""
         # If folder path provided, ensure it ends with /
-        if folder_path:
-            if not folder_path.endswith('/'):
-                folder_path += '/'
-        
-        blobs = bucket.list_blobs(prefix=folder_path, versions=versions)
-        
+        if folder_path and not folder_path.endswith('/'):
+            folder_path += '/'
+
+        blobs = bucket.list_blobs(prefix=folder_path, versions=versions, delimiter=None if recursive else '/')
+
         for blob in blobs:
-            # Skip folders themselves in non-recursive mode
-            if not recursive and '/' in blob.name[len(folder_path or ''):]:
-                continue
-                
-            # Skip the folder prefix itself
-            if folder_path and blob.name == folder_path:
+            # Skip folder placeholder objects, including the folder prefix itself
+            if blob.name.endswith('/'):
                 continue
-            
-            if any(object.get("name") == blob.name for object in objects) :
-                for object in objects :
-                    if object.get("name") == blob.name:
-                        date_to_compare = []
-                        for version in object.get("versions"):
-                            updated_date = datetime.fromisoformat(version.get("updated"))
-                            date_to_compare.append(updated_date)
-                        index = len(object["versions"]) - bisect.bisect_right(date_to_compare, blob.updated)
-                        version =  {
-                            "updated": blob.updated.isoformat() if blob.updated else None,
-                            "revision": blob.generation,
-                            'md5_hash': blob.md5_hash
-                        }
-                        object["versions"].insert(index, version)
-            elif blob.name.endswith("/"):
-                continue
-            else :
-                objects.append({
+            yield blob
+
+    @staticmethod
+    def _object_version(blob: storage.Blob) -> Tuple[Tuple[float, int], Dict[str, Any]]:
+        """Returns the sort key (update time, generation) and output of a blob version"""
+        sort_key = (blob.updated.timestamp() if blob.updated else 0.0, blob.generation or 0)
+        return sort_key, {
+            "updated": blob.updated.isoformat() if blob.updated else None,
+            "revision": blob.generation,
+            'md5_hash': blob.md5_hash
+        }
+
+    @staticmethod
+    def _finalize_object(obj: Dict[str, Any], versions: List[Tuple[Tuple[float, int], Dict[str, Any]]]) -> Dict[str, Any]:
+        """Orders the versions of an object newest first and numbers them, the newest version having the highest number"""
+        versions.sort(key=lambda version: version[0], reverse=True)
+        obj["versions"] = [version for _, version in versions]
+        for index, version in enumerate(obj["versions"]):
+            version["version_number"] = len(versions) - index
+        return obj
+
+    def _iter_objects(self, bucket: storage.Bucket, folder_path: str = None, recursive: bool = False, versions: bool = None) -> Iterator[Dict[str, Any]]:
+        """
+        Lists objects in bucket with optional folder filtering, yielding each object once all its versions are listed.
+
+        Cloud Storage lists objects in lexicographic order of name with all generations of an object
+        adjacent, so versions are grouped in a single pass without keeping the listing in memory.
+        """
+        current = None  # Object being listed and its versions
+
+        for blob in self._list_blobs(bucket, folder_path, recursive, versions):
+            if current is None or current[0]['name'] != blob.name:
+                if current is not None:
+                    yield self._finalize_object(*current)
+                current = ({
                     'name': blob.name,
                     'size': blob.size,
                     'content_type': blob.content_type,
                     'created': blob.time_created.isoformat() if blob.time_created else None,
-                    'storage_class': blob.storage_class,
-                    "versions": [
-                        {
-                            "updated": blob.updated.isoformat() if blob.updated else None,
-                            "revision": blob.generation,
-                            'md5_hash': blob.md5_hash
-                        }
-                    ]
-                })
-
-
-        for object in objects:
-            versions = object["versions"]
-            version_number = len(versions)
-            for index, version in enumerate(versions): 
-                version["version_number"] = version_number
-                version_number -= 1
-            
-        return objects
+                    'storage_class': blob.storage_class
+                }, [])
+            current[1].append(self._object_version(blob))
+
+        if current is not None:
+            yield self._finalize_object(*current)
+
+    def _list_objects(self, bucket: storage.Bucket, folder_path: str = None, recursive: bool = False, versions: bool = None) -> List[Dict[str, Any]]:
+        """Helper function to list objects in bucket with optional folder filtering"""
+        return list(self._iter_objects(bucket, folder_path, recursive, versions))
 
     def execute(self, **kwargs: Any) -> Tuple[ExecutionStatus, Dict[str, Any]]:
         self.validate_parameters(kwargs)
@@ -140,6 +140,10 @@ class GCPEnumerateCloudStorageObjects(BaseTechnique):
             folder_path: str = kwargs.get("folder_path", None)
             recursive: bool = kwargs.get("recursive", False)
             all_versions: bool = kwargs.get("all_versions", False)
+            stream_output: bool = kwargs.get("stream_output", False)
+
+            if stream_output in [None, ""]:
+                stream_output = False
             
             # Input validation
             if bucket_name in [None, ""]:
@@ -165,13 +169,41 @@ class GCPEnumerateCloudStorageObjects(BaseTechnique):
                     "message": f"Failed to access bucket: {bucket_name}"
                 }
             
+            if stream_output:
+                # Write objects to the technique output file as they are listed instead of collecting them in memory
+                stats = {
+                    "total_objects": 0,
+                    "total_size": 0,
+                    "folder_path": folder_path if folder_path else "root",
+                    "recursive": recursive
+                }
+
+                def count_objects(objects):
+                    for obj in objects:
+                        stats["total_objects"] += 1
+                        stats["total_size"] += obj["size"] or 0
+                        yield obj
+
+                with OutputManager.get_instance().open_output_stream(self.__class__.__name__) as output_stream:
+                    output_stream.write_many(count_objects(self._iter_objects(bucket, folder_path, recursive, all_versions)))
+
+                return ExecutionStatus.SUCCESS, {
+                    "message": f"Successfully enumerated {stats['total_objects']} objects in bucket '{bucket_name}' to {output_stream.file_path}",
+                    "value": {
+                        "bucket_name": bucket_name,
+                        "statistics": stats,
+                        "output_file": str(output_stream.file_path),
+                        "event_id": output_stream.event_id
+                    }
+                }
+
             # List objects based on parameters
             objects = self._list_objects(bucket, folder_path, recursive, all_versions)
             
             # Create output statistics
             stats = {
                 "total_objects": len(objects),
-                "total_size": sum(obj["size"] for obj in objects),
+                "total_size": sum(obj["size"] or 0 for obj in objects),
                 "folder_path": folder_path if folder_path else "root",
                 "recursive": recursive
             }
@@ -238,5 +270,11 @@ class GCPEnumerateCloudStorageObjects(BaseTechnique):
                 "name": "All Versions",
                 "input_field_type": "bool"
             },
-            
+            "stream_output": {
+                "type": "bool",
+                "required": False,
+                "default": False,
+                "name": "Stream Objects to Output File (for large buckets)",
+                "input_field_type": "bool"
+            }
         }
\ No newline at end of file
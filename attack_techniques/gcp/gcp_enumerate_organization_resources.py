@@ -0,0 +1,197 @@
+from ..base_technique import BaseTechnique, ExecutionStatus, MitreTechnique, TechniqueNote, TechniqueReference
+from ..technique_registry import TechniqueRegistry
+from .gcp_enumerate_projects import GCPEnumerateProjects
+from .gcp_enumerate_cloud_storage_buckets import GCPEnumerateCloudStorageBuckets
+from .gcp_enumerate_compute_engine_instances import GCPEnumerateComputeEngineInstances
+
+from typing import Dict, Any, Tuple
+import time
+import concurrent.futures
+
+from core.gcp.gcp_quota_limiter import GCPQuotaLimiter
+from core.output_manager.output_manager import OutputManager
+
+# Resources enumerated per project: technique and the API whose quota it uses
+RESOURCE_TECHNIQUES = {
+    "storage_buckets": (GCPEnumerateCloudStorageBuckets, "storage"),
+    "compute_instances": (GCPEnumerateComputeEngineInstances, "compute")
+}
+
+@TechniqueRegistry.register
+class GCPEnumerateOrganizationResources(BaseTechnique):
+    def __init__(self):
+        mitre_techniques = [
+            MitreTechnique(
+                technique_id="T1526",
+                technique_name="Cloud Service Discovery",
+                tactics=["Discovery"],
+                sub_technique_name=None
+            ),
+            MitreTechnique(
+                technique_id="T1580",
+                technique_name="Cloud Infrastructure Discovery",
+                tactics=["Discovery"],
+                sub_technique_name=None
+            )
+        ]
+        technique_notes = [
+            TechniqueNote("Projects are listed with the Enumerate Projects technique and require resourcemanager.projects.list permission"),
+            TechniqueNote("Each resource type requires the permissions of its enumeration technique in every project, projects without access are reported as failed"),
+            TechniqueNote("Results are streamed to the technique output file, one line per project and resource type")
+        ]
+        technique_refs = [
+            TechniqueReference("GCP Resource Manager API", "https://cloud.google.com/resource-manager/reference/rest/v1/projects/list"),
+            TechniqueReference("GCP API Quotas", "https://cloud.google.com/docs/quotas/overview")
+        ]
+
+        super().__init__(
+            name="Enumerate Organization Resources",
+            description=("Enumerates resources across all projects of an organization or folder. "
+            "Projects are discovered with the Enumerate Projects technique, then storage buckets and compute "
+            "engine instances of every active project are enumerated concurrently on a bounded worker pool. "
+            "Requests share per-project API quota tracking, so throttled APIs back off without failing the run. "
+            "Results of each project are written to the technique output as they complete, making the technique "
+            "suitable for organizations with hundreds of projects."),
+            mitre_techniques=mitre_techniques,
+            references=technique_refs,
+            notes=technique_notes
+        )
+
+    def _enumerate_project_resource(self, project_id: str, resource: str, firewall_detail: bool) -> Dict[str, Any]:
+        """Runs the enumeration technique of a resource type in a project"""
+        technique_class, _ = RESOURCE_TECHNIQUES[resource]
+        params = {"project_id": project_id}
+        if technique_class is GCPEnumerateComputeEngineInstances:
+            params["firewall_detail"] = firewall_detail
+
+        start = time.monotonic()
+        status, output = technique_class().execute(**params)
+        return {
+            "project_id": project_id,
+            "resource": resource,
+            "status": status.value,
+            "duration_seconds": round(time.monotonic() - start, 2),
+            **output
+        }
+
+    def execute(self, **kwargs: Any) -> Tuple[ExecutionStatus, Dict[str, Any]]:
+        self.validate_parameters(kwargs)
+        try:
+            organization_id: str = kwargs.get("organization_id", None)
+            folder_id: str = kwargs.get("folder_id", None)
+            resources: list[str] = [resource.strip() for resource in kwargs.get("resources").split(",")] if kwargs.get("resources") else list(RESOURCE_TECHNIQUES)
+            max_workers: int = kwargs.get("max_workers", 10) or 10
+            firewall_detail: bool = kwargs.get("firewall_detail", False)
+
+            # Input validation
+            invalid_resources = [resource for resource in resources if resource not in RESOURCE_TECHNIQUES]
+            if invalid_resources:
+                return ExecutionStatus.FAILURE, {
+                    "error": "Invalid Technique Input",
+                    "message": {"Error": f"Invalid resources {invalid_resources} - Resources must be in {list(RESOURCE_TECHNIQUES)}"}
+                }
+
+            # Discover projects
+            project_status, project_output = GCPEnumerateProjects().execute(organization_id=organization_id, folder_id=folder_id)
+            if project_status == ExecutionStatus.FAILURE:
+                return project_status, project_output
+            project_ids = [project["project_id"] for project in project_output["value"]["projects"] if project.get("state") == "ACTIVE"]
+
+            if not project_ids:
+                return ExecutionStatus.SUCCESS, {
+                    "message": "No active projects found",
+                    "value": {
+                        "projects_scanned": 0,
+                        "projects": {}
+                    }
+                }
+
+            summary = {project_id: {} for project_id in project_ids}
+            api_stats = {api: {"projects": 0, "failed": 0, "duration_seconds": 0.0} for _, api in RESOURCE_TECHNIQUES.values()}
+
+            # Fan out per project and resource type, writing each result as it completes
+            with OutputManager.get_instance().open_output_stream(self.__class__.__name__) as output_stream:
+                with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(project_ids) * len(resources))) as executor:
+                    futures = {
+                        executor.submit(self._enumerate_project_resource, project_id, resource, firewall_detail): (project_id, resource)
+                        for project_id in project_ids
+                        for resource in resources
+                    }
+                    for future in concurrent.futures.as_completed(futures):
+                        project_id, resource = futures[future]
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            result = {"project_id": project_id, "resource": resource, "status": ExecutionStatus.FAILURE.value, "error": str(e), "duration_seconds": None}
+                        output_stream.write(result)
+
+                        api = RESOURCE_TECHNIQUES[resource][1]
+                        api_stats[api]["projects"] += 1
+                        api_stats[api]["duration_seconds"] += result["duration_seconds"] or 0.0
+                        if result["status"] == ExecutionStatus.FAILURE.value:
+                            api_stats[api]["failed"] += 1
+                        summary[project_id][resource] = result["status"]
+
+            # Request counters of the scanned projects from the shared quota limiter
+            quota_stats = {
+                key: counters for key, counters in GCPQuotaLimiter.get_instance().get_stats().items()
+                if key.rsplit("/", 1)[0] in summary
+            }
+            failed = sum(stats["failed"] for stats in api_stats.values())
+
+            return ExecutionStatus.SUCCESS if failed == 0 else ExecutionStatus.PARTIAL_SUCCESS, {
+                "message": f"Enumerated {len(resources)} resource types in {len(project_ids)} projects to {output_stream.file_path}" + (f" - {failed} enumerations failed" if failed else ""),
+                "value": {
+                    "projects_scanned": len(project_ids),
+                    "output_file": str(output_stream.file_path),
+                    "event_id": output_stream.event_id,
+                    "projects": summary,
+                    "api_stats": {api: dict(stats, duration_seconds=round(stats["duration_seconds"], 2)) for api, stats in api_stats.items() if stats["projects"]},
+                    "quota_stats": quota_stats
+                }
+            }
+
+        except Exception as e:
+            return ExecutionStatus.FAILURE, {
+                "error": str(e),
+                "message": "Failed to enumerate organization resources"
+            }
+
+    def get_parameters(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            "organization_id": {
+                "type": "str",
+                "required": False,
+                "default": None,
+                "name": "Organization ID",
+                "input_field_type": "text"
+            },
+            "folder_id": {
+                "type": "str",
+                "required": False,
+                "default": None,
+                "name": "Folder ID",
+                "input_field_type": "text"
+            },
+            "resources": {
+                "type": "str",
+                "required": False,
+                "default": None,
+                "name": 'Resources (storage_buckets / compute_instances, with "," separator)',
+                "input_field_type": "text"
+            },
+            "max_workers": {
+                "type": "int",
+                "required": False,
+                "default": 10,
+                "name": "Max Worker Threads",
+                "input_field_type": "number"
+            },
+            "firewall_detail": {
+                "type": "bool",
+                "required": False,
+                "default": False,
+                "name": "Compute Instance Firewall Detail",
+                "input_field_type": "bool"
+            }
+        }
@@ -2,7 +2,7 @@
 from ..base_technique import BaseTechnique, ExecutionStatus, MitreTechnique, TechniqueNote, TechniqueReference
 from ..technique_registry import TechniqueRegistry
 
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, List, Tuple
 
 from core.gcp.gcp_access import GCPAccess
 from googleapiclient import discovery
@@ -25,6 +25,16 @@ class GCPEnumerateProjects(BaseTechnique):
 
         super().__init__("Enumerate Projects", "Enumerate Google Cloud Platform projects accessible with the current credentials. This technique leverages the GCP Resource Manager API to list all projects that the authenticated user or service account has access to. By enumerating projects, attackers can identify potential targets for further exploitation, assess the scope of their access, and gather information about the cloud environment. The technique handles API interactions, manages pagination for large result sets, and formats the output for easy analysis.", mitre_techniques=mitre_techniques, references=technique_references)
 
+    def _list_projects(self, service: Any, project_filter: str = None) -> List[Dict[str, Any]]:
+        """Lists all pages of projects matching a filter"""
+        projects = []
+        request = service.projects().list(filter=project_filter)
+        while request is not None:
+            response = request.execute()
+            projects.extend(response.get('projects', []))
+            request = service.projects().list_next(previous_request=request, previous_response=response)
+        return projects
+
     def execute(self, **kwargs: Any) -> Tuple[ExecutionStatus, Dict[str, Any]]:
         self.validate_parameters(kwargs)
         try:
@@ -49,12 +59,10 @@ class GCPEnumerateProjects(BaseTechnique):
             manager.get_current_access()
             credential = manager.credential
             service = discovery.build('cloudresourcemanager', 'v1', credentials=credential)
-            request_by_org = service.projects().list(filter=filter_by_org) if org_id else None
-            request_by_folder = service.projects().list(filter=filter_by_folder) if folder_id else None
             
             if org_id and folder_id:
-                response_by_folder = request_by_folder.execute()
-                response_by_org = request_by_org.execute()
+                response_by_folder = {'projects': self._list_projects(service, filter_by_folder)}
+                response_by_org = {'projects': self._list_projects(service, filter_by_org)}
                 # Combine projects from both responses without duplicates
                 projects = []
                 seen_project_ids = set()
@@ -69,11 +77,11 @@ class GCPEnumerateProjects(BaseTechnique):
                 
                 response = {'projects': projects}
             elif org_id:
-                response = request_by_org.execute()
+                response = {'projects': self._list_projects(service, filter_by_org)}
             elif folder_id:
-                response = request_by_folder.execute()
+                response = {'projects': self._list_projects(service, filter_by_folder)}
             else:
-                response = service.projects().list().execute()
+                response = {'projects': self._list_projects(service)}
             
 
             if 'projects' in response:
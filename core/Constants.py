@@ -3,12 +3,15 @@ AUTOMATOR_PLAYBOOKS_DIR = AUTOMATOR_DIR+"/Playbooks"
 AUTOMATOR_OUTPUT_DIR = AUTOMATOR_DIR+"/Outputs"
 AUTOMATOR_SCHEDULES_FILE = AUTOMATOR_DIR+"/Schedules.yml"
 AUTOMATOR_EXPORTS_DIR = AUTOMATOR_DIR+"/Exports"
+AUTOMATOR_EXECUTION_CATALOG_FILE = AUTOMATOR_DIR+"/Execution_Catalog.json"
+AUTOMATOR_SCHEDULE_STATE_FILE = AUTOMATOR_DIR+"/Schedule_State.json"
 
 APP_LOCAL_DIR = "./local"
 APP_LOG_FILE = APP_LOCAL_DIR+"/app.log"
 MSFT_TOKENS_FILE = APP_LOCAL_DIR+"/MSFT_Graph_Tokens.yml"
 GCP_CREDS_FILE = APP_LOCAL_DIR+"/GCP_Service_Account.json"
 TECHNIQUE_OUTPUT_DIR = APP_LOCAL_DIR+"/technique_output"
+EXECUTION_HISTORY_DIR = APP_LOCAL_DIR+"/execution_history"
 
 OUTPUT_DIR = "./output"
 REPORT_DIR = "./report"
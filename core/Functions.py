@@ -5,6 +5,7 @@ import os
 import sys
 import shutil
 import json
+import re
 from typing import Union, Any, Optional
 import datetime
 from pathlib import Path
@@ -16,10 +17,13 @@ from dash_iconify import DashIconify
 import pandas as pd
 from core.Constants import *
 from core.playbook.playbook import Playbook
+from core.playbook.execution_catalog import ExecutionCatalog, parse_execution_report
 from core.entra.entra_token_manager import EntraTokenManager
 from core.aws.aws_session_manager import SessionManager
 from core.azure.azure_access import AzureAccess
 from core.gcp.gcp_access import GCPAccess
+from core.logging.log_reader import AppLogReader
+from core.logging.execution_history import ExecutionHistoryStore
 from attack_techniques.technique_registry import TechniqueRegistry
 from google.oauth2.service_account import Credentials as ServiceAccountCredentials
 from google.oauth2.credentials import Credentials as UserAccountCredentials
@@ -1784,17 +1788,8 @@ def generate_azure_access_info(subscription):
     return info_output_div
 
 def parse_app_log_file(file_path):
-    """Function to parse the app log file"""
-    events = []
-    with open(file_path, 'r') as file:
-        next(file)  # Skip the header line
-        for line in file:
-            if "Technique Execution" in line:
-                parts = line.split(" - INFO - Technique Execution ")
-                timestamp = parts[0].split(',')[0]
-                event_data = json.loads(parts[1])
-                event_data['log_timestamp'] = timestamp
-                events.append(event_data)
+    """Function to parse the app log file. Only lines appended since the last call are parsed"""
+    events = AppLogReader.get_instance(file_path).get_events()
     return events[::-1]  # Reverse the list to show newest first
 
 def group_app_log_events(events):
@@ -1825,23 +1820,133 @@ def create_app_log_event_summary(grouped_events):
             })
     return summary
 
+# Regex to split a single DataTable filter expression, e.g. "{Result} eq success" or "{Steps} >= 3"
+DATATABLE_FILTER_PATTERN = re.compile(r'^\{(?P<column>[^}]+)\}\s+(?P<case>[is]?)(?P<operator>contains|datestartswith|eq|ne|lt|le|gt|ge|<=|>=|!=|<|>|=)\s+(?P<value>.+)$')
+DATATABLE_OPERATOR_ALIASES = {"=": "eq", "!=": "ne", "<": "lt", "<=": "le", ">": "gt", ">=": "ge"}
+
+# Attack trace table columns that map to filters of the execution history store
+ATTACK_TRACE_STORE_FILTERS = {"Technique": "techniques", "Source": "sources", "Result": "results", "Tactic": "tactics"}
+
+def parse_datatable_filter_query(filter_query: Optional[str]) -> list:
+    """
+    Function to parse a DataTable 'custom' filter query into (column, operator, value, case_insensitive) tuples
+    """
+    filters = []
+    for filter_part in (filter_query or "").split(" && "):
+        match = DATATABLE_FILTER_PATTERN.match(filter_part.strip())
+        if not match:
+            continue
+        operator = DATATABLE_OPERATOR_ALIASES.get(match.group('operator'), match.group('operator'))
+        value = match.group('value').strip()
+        if value[0] == value[-1] and value[0] in ("'", '"', '`') and len(value) > 1:
+            value = value[1:-1].replace('\\' + value[0], value[0])
+        else:
+            try:
+                value = float(value)
+            except ValueError:
+                pass
+        filters.append((match.group('column'), operator, value, match.group('case') == 'i'))
+    return filters
+
+def apply_datatable_query(df: pd.DataFrame, filters: list, sort_by: Optional[list], page_current: Optional[int], page_size: int):
+    """
+    Function to filter, sort and paginate a DataFrame for a DataTable in 'custom' mode.
+
+    Returns:
+        tuple: (records of the requested page, total page count)
+    """
+    for column, operator, value, case_insensitive in filters:
+        if column not in df.columns:
+            continue
+        series = df[column]
+        if operator in ["contains", "datestartswith"] or not isinstance(value, float):
+            series = series.astype(str)
+            value = str(value) if not isinstance(value, float) or not value.is_integer() else str(int(value))
+            if case_insensitive:
+                series = series.str.lower()
+                value = value.lower()
+        else:
+            series = pd.to_numeric(series, errors='coerce')
+
+        if operator == "contains":
+            mask = series.str.contains(value, regex=False)
+        elif operator == "datestartswith":
+            mask = series.str.startswith(value)
+        elif operator == "eq":
+            mask = series == value
+        elif operator == "ne":
+            mask = series != value
+        elif operator == "lt":
+            mask = series < value
+        elif operator == "le":
+            mask = series <= value
+        elif operator == "gt":
+            mask = series > value
+        else:
+            mask = series >= value
+        df = df.loc[mask.fillna(False).astype(bool)]
+
+    if sort_by:
+        sort_columns = [col['column_id'] for col in sort_by if col['column_id'] in df.columns]
+        if sort_columns:
+            df = df.sort_values(
+                sort_columns,
+                ascending=[col['direction'] == 'asc' for col in sort_by if col['column_id'] in df.columns],
+                inplace=False
+            )
+
+    page_current = page_current or 0
+    page_count = max(1, -(-len(df) // page_size))
+    page = df.iloc[page_current * page_size:(page_current + 1) * page_size]
+    return page.to_dict('records'), page_count
+
+def query_attack_trace_table(page_current: Optional[int] = 0, page_size: int = 5, sort_by: Optional[list] = None, filter_query: Optional[str] = None):
+    """
+    Function to get a single page of the attack trace table.
+
+    Exact match filters on technique, source, result and tactic are pushed down to the
+    execution history store. Remaining filters, sorting and pagination are applied on the result.
+
+    Returns:
+        tuple: (records of the requested page, total page count)
+    """
+    filters = parse_datatable_filter_query(filter_query)
+    store_filters = {}
+    remaining_filters = []
+    for column, operator, value, case_insensitive in filters:
+        if column in ATTACK_TRACE_STORE_FILTERS and operator == "eq" and isinstance(value, str) and not case_insensitive:
+            store_filters.setdefault(ATTACK_TRACE_STORE_FILTERS[column], []).append(value)
+        else:
+            remaining_filters.append((column, operator, value, case_insensitive))
+
+    # Get completed executions from execution history store, newest first
+    executions = ExecutionHistoryStore.get_instance().query(**store_filters).sort_values('start_time', ascending=False)
+
+    df = pd.DataFrame({
+        'Technique': executions['technique'].fillna('N/A'),
+        'Source': executions['source'].fillna('Unknown'),
+        'Start Time': executions['start_time'].dt.strftime('%Y-%m-%d %H:%M:%S'),
+        'Result': executions['result'].fillna('N/A'),
+        'Tactic': executions['tactic'].fillna('N/A'),
+        'Event ID': executions['event_id']
+    }, columns=['Technique', 'Source', 'Start Time', 'Result', 'Tactic', 'Event ID'])
+
+    return apply_datatable_query(df, remaining_filters, sort_by, page_current, page_size)
+
 def generate_attack_trace_table():
     """Function to generate the attack trace table view"""
     
-    # Parse log file and create summary
-    events = parse_app_log_file(APP_LOG_FILE)
-    grouped_events = group_app_log_events(events)
-    summary = create_app_log_event_summary(grouped_events)
-
-    # Create DataFrame
-    df = pd.DataFrame(summary)
+    # Get first page of the trace table. Later pages are served by the table's paging callback
+    page_size = 5
+    data, page_count = query_attack_trace_table(page_current=0, page_size=page_size)
+    columns = ['Technique', 'Source', 'Start Time', 'Result', 'Tactic', 'Event ID']
 
     # Return app layout
     return html.Div([
         dash_table.DataTable(
             id='trace-table',
-            columns=[{"name": i, "id": i, "presentation": "markdown" if i == "Output" else None} for i in df.columns],
-            data=df.to_dict('records'),
+            columns=[{"name": i, "id": i} for i in columns],
+            data=data,
             style_table={
                 'overflowX': 'auto',
                 'backgroundColor': '#2F4F4F'
@@ -1891,11 +1996,17 @@ def generate_attack_trace_table():
                 'if': {'column_id': c},
                 'backgroundColor': '#2b2b2b',
                 'color': 'white',
-            } for c in df.columns],
-            sort_action='native',
+            } for c in columns],
+            page_action='custom',
+            page_current=0,
+            page_size=page_size,
+            page_count=page_count,
+            sort_action='custom',
+            sort_mode='single',
+            sort_by=[],
             row_selectable='single',
-            filter_action = 'native',
-            page_size=5,
+            filter_action='custom',
+            filter_query='',
             markdown_options={"html": True}  # Allow HTML in markdown
         ),
     ], 
@@ -1940,37 +2051,12 @@ def get_playbook_stats():
             "last_sync": None
         }
     
-def parse_execution_report(execution_folder):
-    """Parse the execution report CSV file"""
-    report_file = os.path.join(execution_folder, "Report.csv")
-    
-    if not os.path.exists(report_file):
-        return []
-        
-    results = []
-    try:
-        with open(report_file, 'r') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row.get('Time_Stamp') != 'Time_Stamp':
-                    results.append({
-                        'module': row.get('Module'),
-                        'status': row.get('Result'),
-                        'timestamp': row.get('Time_Stamp'),
-                        'event_id': row.get('Event_ID', '')
-                    })
-    except Exception as e:
-        print(f"Error parsing report: {str(e)}")
-        return []
-        
-    return results
-
 def get_all_automator_executions():
     """
-    Scan automator/Outputs/ directory and return list of all executions with metadata.
+    Return list of all automator executions with metadata from the execution catalog.
     
     Returns:
-        list: List of dictionaries containing execution metadata:
+        list: List of dictionaries containing execution metadata, newest first:
             - folder_name: Name of the execution folder
             - folder_path: Full path to the execution folder
             - playbook_name: Name of the playbook (extracted from folder name)
@@ -1979,55 +2065,33 @@ def get_all_automator_executions():
             - success_count: Number of successful steps
             - failed_count: Number of failed steps
     """
-    executions = []
-    
-    if not os.path.exists(AUTOMATOR_OUTPUT_DIR):
-        return executions
-    
     try:
-        # List all directories in automator outputs
-        for folder_name in os.listdir(AUTOMATOR_OUTPUT_DIR):
-            folder_path = os.path.join(AUTOMATOR_OUTPUT_DIR, folder_name)
-            
-            # Skip if not a directory
-            if not os.path.isdir(folder_path):
-                continue
-            
-            # Parse folder name to extract playbook name and timestamp
-            # Format: <playbook_name>_<YYYY-MM-DD>_<HH-MM-SS>
-            parts = folder_name.rsplit('_', 2)
-            if len(parts) >= 3:
-                playbook_name = parts[0]
-                execution_date = parts[1]
-                execution_time = parts[2]
-                execution_timestamp = f"{execution_date} {execution_time.replace('-', ':')}"
-            else:
-                playbook_name = folder_name
-                execution_timestamp = "Unknown"
-            
-            # Parse execution report for step counts
-            report_results = parse_execution_report(folder_path)
-            step_count = len(report_results)
-            success_count = sum(1 for r in report_results if r.get('status') == 'success')
-            failed_count = sum(1 for r in report_results if r.get('status') == 'failed')
-            
-            executions.append({
-                'folder_name': folder_name,
-                'folder_path': folder_path,
-                'playbook_name': playbook_name,
-                'execution_time': execution_timestamp,
-                'step_count': step_count,
-                'success_count': success_count,
-                'failed_count': failed_count
-            })
+        return ExecutionCatalog.get_instance().list_executions()
     except Exception as e:
-        print(f"Error scanning automator executions: {str(e)}")
+        print(f"Error reading automator executions: {str(e)}")
         return []
+
+def query_automator_execution_table(page_current: Optional[int] = 0, page_size: int = 5, sort_by: Optional[list] = None, filter_query: Optional[str] = None):
+    """
+    Function to get a single page of the automator execution history table.
+
+    Returns:
+        tuple: (records of the requested page, total page count, total number of executions)
+    """
+    executions = get_all_automator_executions()
     
-    # Sort by execution time (newest first)
-    executions.sort(key=lambda x: x['execution_time'], reverse=True)
-    
-    return executions
+    # Create DataFrame for display
+    df = pd.DataFrame({
+        'Playbook': [execution['playbook_name'] for execution in executions],
+        'Execution Time': [execution['execution_time'] for execution in executions],
+        'Steps': [execution['step_count'] for execution in executions],
+        'Success': [execution['success_count'] for execution in executions],
+        'Failed': [execution['failed_count'] for execution in executions],
+        'Folder': [execution['folder_name'] for execution in executions]
+    })
+
+    data, page_count = apply_datatable_query(df, parse_datatable_filter_query(filter_query), sort_by, page_current, page_size)
+    return data, page_count, len(df)
 
 def generate_automator_execution_table():
     """
@@ -2036,24 +2100,13 @@ def generate_automator_execution_table():
     Returns:
         html.Div: A Dash HTML component containing the execution history table
     """
-    executions = get_all_automator_executions()
-    
-    # Create DataFrame for display
-    display_data = []
-    for execution in executions:
-        display_data.append({
-            'Playbook': execution['playbook_name'],
-            'Execution Time': execution['execution_time'],
-            'Steps': execution['step_count'],
-            'Success': execution['success_count'],
-            'Failed': execution['failed_count'],
-            'Folder': execution['folder_name']
-        })
-    
-    df = pd.DataFrame(display_data)
+    # Get first page of the execution table. Later pages are served by the table's paging callback
+    page_size = 5
+    data, page_count, total_executions = query_automator_execution_table(page_current=0, page_size=page_size)
+    columns = ['Playbook', 'Execution Time', 'Steps', 'Success', 'Failed']
     
-    # Handle empty dataframe
-    if df.empty:
+    # Handle no executions
+    if total_executions == 0:
         return html.Div([
             html.P("No playbook executions found.", className="text-muted text-center py-3")
         ])
@@ -2062,10 +2115,10 @@ def generate_automator_execution_table():
         dash_table.DataTable(
             id='automator-execution-table',
             columns=[
-                {"name": i, "id": i} 
-                for i in df.columns if i != 'Folder'
+                {"name": i, "id": i, "type": "numeric" if i in ['Steps', 'Success', 'Failed'] else "text"} 
+                for i in columns
             ],
-            data=df.to_dict('records'),
+            data=data,
             style_table={
                 'overflowX': 'auto',
                 'backgroundColor': '#2F4F4F'
@@ -2131,10 +2184,16 @@ def generate_automator_execution_table():
                 'if': {'column_id': c},
                 'backgroundColor': '#2b2b2b',
                 'color': 'white',
-            } for c in df.columns],
-            sort_action='native',
+            } for c in columns],
+            page_action='custom',
+            page_current=0,
+            page_size=page_size,
+            page_count=page_count,
+            sort_action='custom',
+            sort_mode='single',
+            sort_by=[],
             row_selectable='single',
-            filter_action='native',
-            page_size=5
+            filter_action='custom',
+            filter_query=''
         ),
     ], className="bg-halberd-dark halberd-text")
\ No newline at end of file
@@ -1,47 +1,199 @@
 import subprocess
 import json
 import sys
+import copy
 import shutil
 import os
+import threading
+import configparser
+from typing import Any, Callable, Dict, Optional, Tuple
 from azure.identity import AzureCliCredential, DefaultAzureCredential
+from azure.core.pipeline.transport import RequestsTransport
+from core.azure.azure_task_runner import AzureTaskRunner
 
 class AzureAccess:
-    """Azure access manager"""
+    """
+    Azure access manager
+
+    Results of az CLI account commands are cached process-wide until the az CLI profile
+    (azureProfile.json) changes, and the current subscription is read from the profile
+    directly instead of running az account show.
+
+    Azure SDK management clients are pooled per subscription and signed in identity. Pooled
+    clients share one credential and one HTTP transport, so access tokens and connections are
+    reused across technique executions. The pool is cleared when the signed in identity
+    changes, the active subscription is switched or the account is logged out. Requests of
+    pooled clients are reported to the AzureTaskRunner, which backs off throttled subscriptions.
+    """
+    DEFAULT_CLOUD = "AzureCloud"
+
+    _cache: Dict[str, Tuple[Optional[Tuple[int, int]], Any]] = {}  # Class variable to store cached az CLI results with the profile state they were read at
+    _cache_lock = threading.Lock()
+
+    _clients: Dict[Tuple[type, str], Any] = {}  # Class variable to store pooled management clients
+    _clients_identity: Optional[Tuple[Optional[str], Optional[str]]] = None
+    _credential = None
+    _transport: Optional[RequestsTransport] = None
+    _clients_lock = threading.Lock()
+
     def __init__(self):
         self.az_command = check_azure_cli_install()
 
-    def get_current_subscription_info(self):
-        """Get current subscription info for connected account."""
-        raw_response = subprocess.run([self.az_command, "account", "show"], capture_output=True)
+    @staticmethod
+    def get_config_dir() -> str:
+        """Returns the az CLI configuration directory"""
+        return os.environ.get("AZURE_CONFIG_DIR") or os.path.join(os.path.expanduser("~"), ".azure")
+
+    def _profile_state(self) -> Optional[Tuple[int, int]]:
+        """Returns the modification time and size of the az CLI profile, None if there is no profile"""
+        try:
+            stat = os.stat(os.path.join(self.get_config_dir(), "azureProfile.json"))
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def _cached(self, name: str, loader: Callable[[], Any]) -> Any:
+        """Returns a cached az CLI result, loading it if the profile changed since it was cached"""
+        state = self._profile_state()
+        with AzureAccess._cache_lock:
+            entry = AzureAccess._cache.get(name)
+        if entry is None or entry[0] != state:
+            entry = (state, loader())
+            with AzureAccess._cache_lock:
+                AzureAccess._cache[name] = entry
+        # Callers get their own copy, so changes to it do not leak into the cache
+        return copy.deepcopy(entry[1])
+
+    @classmethod
+    def invalidate_cache(cls) -> None:
+        """Drops all cached az CLI results"""
+        with cls._cache_lock:
+            cls._cache.clear()
+
+    def _active_cloud(self) -> str:
+        """Returns the active az CLI cloud from the az CLI config file"""
+        config = configparser.ConfigParser()
+        config.read(os.path.join(self.get_config_dir(), "config"))
+        return config.get("cloud", "name", fallback=self.DEFAULT_CLOUD)
+
+    def _read_profile_subscription(self) -> Optional[Dict[str, Any]]:
+        """Reads the default subscription of the active cloud from the az CLI profile, as returned by az account show"""
+        # az CLI writes the profile with a byte order mark
+        with open(os.path.join(self.get_config_dir(), "azureProfile.json"), 'r', encoding='utf-8-sig') as f:
+            profile = json.load(f)
+        cloud = self._active_cloud()
+        for subscription in profile.get("subscriptions", []):
+            if subscription.get("isDefault") and subscription.get("environmentName", cloud) == cloud:
+                return subscription
+        return None
+
+    def _run_az_json(self, *args):
+        raw_response = subprocess.run([self.az_command, *args], capture_output=True)
         if raw_response.returncode == 0:
             output = raw_response.stdout
             return json.loads(output.decode('utf-8'))
         return None
 
+    def _load_current_subscription_info(self):
+        try:
+            return self._read_profile_subscription()
+        except Exception:
+            # Profile missing or in an unknown format, ask the az CLI
+            return self._run_az_json("account", "show")
+
+    def get_current_subscription_info(self):
+        """Get current subscription info for connected account."""
+        return self._cached("account show", self._load_current_subscription_info)
+
     def get_account_available_subscriptions(self):
         """Get list of available subscriptions."""
-        raw_response = subprocess.run([self.az_command, "account", "list"], capture_output=True)
-        if raw_response.returncode == 0:
-            output = raw_response.stdout
-            return json.loads(output.decode('utf-8'))
-        return None
+        return self._cached("account list", lambda: self._run_az_json("account", "list"))
 
     def set_active_subscription(self, subscription_id):
         """Set default subscription in environment to use."""
         raw_response = subprocess.run([self.az_command, "account", "set", "--subscription", subscription_id], capture_output=True)
+        self.invalidate_cache()
+        self.clear_client_pool()
         return True if raw_response.returncode == 0 else None
 
     @staticmethod
-    def get_azure_auth_credential():
-        """Get Azure authentication credential."""
+    def _create_azure_auth_credential():
         try:
             return AzureCliCredential()
         except:
             return DefaultAzureCredential()
 
+    @staticmethod
+    def get_azure_auth_credential():
+        """Get Azure authentication credential. The credential is shared by all callers"""
+        with AzureAccess._clients_lock:
+            if AzureAccess._credential is None:
+                AzureAccess._credential = AzureAccess._create_azure_auth_credential()
+            return AzureAccess._credential
+
+    def get_management_client(self, client_class: type, subscription_id: Optional[str] = None) -> Any:
+        """
+        Returns a pooled Azure SDK management client, creating it on first use.
+
+        Args:
+            client_class: Management client class, e.g. ResourceManagementClient
+            subscription_id: Subscription of the client. Defaults to the current subscription
+
+        Returns:
+            Management client shared with other callers for the same subscription
+
+        Example:
+            resource_client = AzureAccess().get_management_client(ResourceManagementClient, subscription_id)
+        """
+        subscription_info = self.get_current_subscription_info() or {}
+        subscription_id = subscription_id or subscription_info.get("id")
+        identity = ((subscription_info.get("user") or {}).get("name"), subscription_info.get("tenantId"))
+
+        with AzureAccess._clients_lock:
+            if identity != AzureAccess._clients_identity:
+                # Signed in as a different identity, clients and their cached tokens must not be reused
+                self._reset_client_pool()
+                AzureAccess._clients_identity = identity
+            key = (client_class, subscription_id)
+            client = AzureAccess._clients.get(key)
+            if client is None:
+                if AzureAccess._credential is None:
+                    AzureAccess._credential = self._create_azure_auth_credential()
+                if AzureAccess._transport is None:
+                    AzureAccess._transport = RequestsTransport()
+                runner = AzureTaskRunner.get_instance()
+                client = client_class(
+                    AzureAccess._credential,
+                    subscription_id,
+                    transport=AzureAccess._transport,
+                    raw_request_hook=runner.on_request,
+                    raw_response_hook=runner.on_response
+                )
+                AzureAccess._clients[key] = client
+            return client
+
+    @classmethod
+    def _reset_client_pool(cls) -> None:
+        """Drops pooled clients, credential and transport. Called with clients lock held"""
+        # Not closed, as requests of dropped clients may still be in flight
+        cls._clients = {}
+        cls._clients_identity = None
+        cls._credential = None
+        cls._transport = None
+
+    @classmethod
+    def clear_client_pool(cls) -> None:
+        """Drops all pooled management clients"""
+        with cls._clients_lock:
+            cls._reset_client_pool()
+
     def execute_az_command(self, *args):
         """Execute an arbitrary Azure CLI command."""
         raw_response = subprocess.run([self.az_command, *args], capture_output=True)
+        if args and args[0] in ["account", "login", "logout"]:
+            self.invalidate_cache()
+            if args[0] != "account" or args[1:2] in [["set"], ["clear"]]:
+                self.clear_client_pool()
         if raw_response.returncode == 0:
             output = raw_response.stdout
             try:
@@ -53,6 +205,8 @@ class AzureAccess:
     def logout(self):
         """Remove established access by logging out the current user."""
         raw_response = subprocess.run([self.az_command, "logout"], capture_output=True)
+        self.invalidate_cache()
+        self.clear_client_pool()
         if raw_response.returncode == 0:
             return True
         return False
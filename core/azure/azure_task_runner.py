@@ -0,0 +1,169 @@
+import re
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from core.logging.logger import app_logger
+
+_SUBSCRIPTION_PATTERN = re.compile(r"/subscriptions/([^/?#]+)", re.IGNORECASE)
+
+class _SubscriptionGate:
+    """Concurrency limit and throttling state of one subscription"""
+    def __init__(self, max_concurrency: int) -> None:
+        self.semaphore = threading.BoundedSemaphore(max_concurrency)
+        # time.monotonic() until which no requests are sent to the subscription
+        self.paused_until = 0.0
+        self.counters = {"tasks": 0, "requests": 0, "throttled": 0, "wait_seconds": 0.0, "remaining_quota": None}
+
+class AzureTaskRunner:
+    """
+    Process-wide bounded-concurrency executor for Azure Resource Manager (ARM) techniques.
+
+    Techniques fan out independent work, such as one task per resource group, with map().
+    Tasks run on a thread pool of at most max_workers threads, and tasks of one subscription
+    are additionally limited to MAX_CONCURRENCY_PER_SUBSCRIPTION across all techniques
+    running in the process.
+
+    Pooled management clients from AzureAccess report every ARM request and response to the
+    runner. A throttled response (429) pauses all requests to its subscription for
+    Retry-After, and requests are slowed down when the x-ms-ratelimit-remaining-subscription-*
+    headers show the subscription is running out of quota. The Azure SDK retries the
+    throttled request itself.
+
+    Example:
+        results = AzureTaskRunner.get_instance().map(scan_resource_group, resource_groups, subscription_id, max_workers=10)
+    """
+    DEFAULT_MAX_WORKERS = 10
+    MAX_WORKERS = 32
+    MAX_CONCURRENCY_PER_SUBSCRIPTION = 16
+    # Delay of throttled responses without Retry-After
+    DEFAULT_RETRY_AFTER = 10
+    # Remaining quota below which requests to a subscription are paused for LOW_QUOTA_PAUSE seconds
+    LOW_QUOTA_THRESHOLD = 25
+    LOW_QUOTA_PAUSE = 1.0
+
+    _instance: Optional['AzureTaskRunner'] = None  # Class variable to store the shared runner
+    _instance_lock = threading.Lock()
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._gates: Dict[str, _SubscriptionGate] = {}
+
+    @classmethod
+    def get_instance(cls) -> 'AzureTaskRunner':
+        """Returns the process-wide Azure task runner, creating it on first use"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def _gate(self, subscription_id: Optional[str]) -> _SubscriptionGate:
+        key = (subscription_id or "default").lower()
+        with self._lock:
+            if key not in self._gates:
+                self._gates[key] = _SubscriptionGate(self.MAX_CONCURRENCY_PER_SUBSCRIPTION)
+            return self._gates[key]
+
+    @staticmethod
+    def _subscription_of(url: str) -> Optional[str]:
+        match = _SUBSCRIPTION_PATTERN.search(url or "")
+        return match.group(1) if match else None
+
+    def map(self, func: Callable[[Any], Any], items: Iterable[Any], subscription_id: Optional[str] = None,
+            max_workers: Optional[int] = None) -> List[Any]:
+        """
+        Runs func for every item concurrently and blocks until all complete.
+
+        Tasks must not call map() for the same subscription themselves, as they already hold
+        one of the subscription's concurrency slots.
+
+        Args:
+            func: Function called with each item
+            items: Items to process, e.g. resource group names
+            subscription_id: Subscription the tasks send requests to
+            max_workers: Maximum number of tasks running at the same time. Defaults to DEFAULT_MAX_WORKERS
+
+        Returns:
+            List[Any]: Return value of func for each item, in the order of items, or the
+            exception raised by func
+        """
+        items = list(items)
+        if not items:
+            return []
+        max_workers = min(max(1, int(max_workers or self.DEFAULT_MAX_WORKERS)), self.MAX_WORKERS, len(items))
+        gate = self._gate(subscription_id)
+
+        def run(item: Any) -> Any:
+            with gate.semaphore:
+                with self._lock:
+                    gate.counters["tasks"] += 1
+                try:
+                    return func(item)
+                except Exception as e:
+                    return e
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="azure-task") as executor:
+            return list(executor.map(run, items))
+
+    def on_request(self, request: Any) -> None:
+        """
+        Azure SDK raw_request_hook. Waits while the subscription of the request is paused.
+
+        Args:
+            request: azure.core PipelineRequest
+        """
+        gate = self._gate(self._subscription_of(request.http_request.url))
+        with self._lock:
+            gate.counters["requests"] += 1
+            delay = gate.paused_until - time.monotonic()
+            if delay > 0:
+                gate.counters["wait_seconds"] += delay
+        if delay > 0:
+            time.sleep(delay)
+
+    def on_response(self, response: Any) -> None:
+        """
+        Azure SDK raw_response_hook. Pauses the subscription of a throttled response, or of a
+        response showing the subscription is running out of quota.
+
+        Args:
+            response: azure.core PipelineResponse
+        """
+        subscription_id = self._subscription_of(response.http_request.url)
+        gate = self._gate(subscription_id)
+        headers = {name.lower(): value for name, value in response.http_response.headers.items()}
+        remaining = [
+            value for name, value in headers.items()
+            if name.startswith("x-ms-ratelimit-remaining-subscription-") and value.isdigit()
+        ]
+
+        pause = None
+        with self._lock:
+            if remaining:
+                gate.counters["remaining_quota"] = min(int(value) for value in remaining)
+            if response.http_response.status_code == 429:
+                try:
+                    pause = float(headers["retry-after"])
+                except (KeyError, ValueError):
+                    pause = self.DEFAULT_RETRY_AFTER
+                gate.counters["throttled"] += 1
+            elif remaining and gate.counters["remaining_quota"] < self.LOW_QUOTA_THRESHOLD:
+                pause = self.LOW_QUOTA_PAUSE
+            if pause is not None:
+                gate.paused_until = max(gate.paused_until, time.monotonic() + pause)
+
+        if response.http_response.status_code == 429:
+            app_logger.warning(f"ARM throttled subscription {subscription_id}. Pausing requests for {pause} seconds.")
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns task and request counters of every subscription.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Counters keyed by subscription id
+        """
+        with self._lock:
+            return {
+                subscription_id: dict(gate.counters, wait_seconds=round(gate.counters["wait_seconds"], 2))
+                for subscription_id, gate in self._gates.items()
+            }
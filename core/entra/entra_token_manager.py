@@ -1,87 +1,182 @@
+import os
 import yaml
+import atexit
 import threading
 import time
-import datetime
 import requests
 from typing import Optional, Dict, Tuple, Union
 from core.Constants import MSFT_TOKENS_FILE
-from core.entra.token_info import Msft_Token
+from core.entra.token_info import TokenInfoCache
 from core.logging.logger import graph_logger
 
 class TokenRefreshError(Exception):
     """Custom exception for token refresh failures"""
     pass
 
+class _TokenStore:
+    """
+    Process-wide in-memory copy of a token file, shared by all EntraTokenManager instances.
+
+    The file is re-read only when it was changed by another process (checked at most every
+    CHANGE_CHECK_INTERVAL seconds). Changes are written back after FLUSH_DELAY seconds, so
+    bursts of updates cause one write, and are written to a temporary file and swapped in so
+    readers never see a partially written file. Pending changes are written on exit.
+    """
+    FLUSH_DELAY = 0.5
+    CHANGE_CHECK_INTERVAL = 1.0
+
+    _instances: Dict[str, '_TokenStore'] = {}  # Class variable to store shared token stores
+    _instances_lock = threading.Lock()
+
+    def __init__(self, yaml_file: str):
+        self.yaml_file = yaml_file
+        self.lock = threading.RLock()
+        # Notified and version incremented whenever the tokens change
+        self.changed = threading.Condition(self.lock)
+        self.version = 0
+        self._file_state: Optional[Tuple[int, int]] = None
+        self._checked_at = 0.0
+        self._dirty = False
+        self._flush_timer: Optional[threading.Timer] = None
+        self.tokens = self._load()
+
+    @classmethod
+    def get_instance(cls, yaml_file: str) -> '_TokenStore':
+        """Returns the process-wide store of a token file, creating it on first use"""
+        key = os.path.abspath(yaml_file)
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(yaml_file)
+            return cls._instances[key]
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.yaml_file)
+            return stat.st_mtime_ns, stat.st_size
+        except FileNotFoundError:
+            return None
+
+    def _load(self) -> Dict:
+        """Load tokens from YAML file with default structure if file not found"""
+        self._file_state = self._stat()
+        self._checked_at = time.monotonic()
+        try:
+            with open(self.yaml_file, 'r') as file:
+                tokens = yaml.safe_load(file) or {}
+        except FileNotFoundError:
+            tokens = {}
+        # Initialize with default structure if empty
+        if not tokens:
+            tokens = {
+                'Current': None,
+                'AllTokens': []
+            }
+        return tokens
+
+    def refresh(self) -> None:
+        """Reloads tokens if the token file was changed externally. Unsaved changes take precedence"""
+        with self.lock:
+            if self._dirty or time.monotonic() - self._checked_at < self.CHANGE_CHECK_INTERVAL:
+                return
+            self._checked_at = time.monotonic()
+            if self._stat() != self._file_state:
+                try:
+                    self.tokens = self._load()
+                    self._notify_changed()
+                except Exception as e:
+                    graph_logger.error(f"Error reloading token file: {str(e)}")
+
+    def _notify_changed(self) -> None:
+        """Called with lock held"""
+        self.version += 1
+        self.changed.notify_all()
+
+    def save(self) -> None:
+        """Schedules writing the tokens to the token file"""
+        with self.lock:
+            self._dirty = True
+            self._notify_changed()
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.FLUSH_DELAY, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def flush(self) -> None:
+        """Writes pending changes to a temporary file and swaps it in"""
+        with self.lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._dirty:
+                return
+            try:
+                temp_file = self.yaml_file + ".tmp"
+                with open(temp_file, 'w') as file:
+                    yaml.dump(self.tokens, file)
+                os.replace(temp_file, self.yaml_file)
+                self._file_state = self._stat()
+                self._dirty = False
+            except Exception as e:
+                graph_logger.error(f"Error saving token file: {str(e)}")
+
+@atexit.register
+def _flush_token_stores() -> None:
+    """Writes pending token changes of all token stores on interpreter exit"""
+    for store in list(_TokenStore._instances.values()):
+        store.flush()
+
 class EntraTokenManager:
     """
     Store, retrieve, set and manage Entra ID authentication tokens.
     Handles both access tokens and their associated refresh tokens with auto-refresh capability.
+
+    Token managers are lightweight views over a process-wide in-memory token store, so
+    constructing one does not read the token file and all instances see the same tokens.
     """
     MS_TOKEN_REFRESH_ENDPOINT = "https://login.microsoftonline.com/{tenant_id}/oauth2/v2.0/token"
 
+    # Pooled HTTP session used for token refreshes
+    _refresh_session: Optional[requests.Session] = None
+    _refresh_session_lock = threading.Lock()
+
     def __init__(self, check_interval: int = 300):  # 5 minutes check default
         self.yaml_file = MSFT_TOKENS_FILE
-        self.tokens = self._load_tokens()
-        self.active_token = self._get_token_value(self.tokens.get('Current'))
         self.check_interval = check_interval
-        
-        # Start token refresh monitoring in a separate thread
-        self._stop_monitoring = False
-        self._monitor_thread = threading.Thread(target=self._token_monitor, daemon=True)
+        self._store = _TokenStore.get_instance(self.yaml_file)
 
-    def __del__(self):
-        """Ensure monitoring thread is stopped when object is destroyed"""
-        self.stop_token_monitoring()
+    @property
+    def tokens(self) -> Dict:
+        """Shared in-memory token store"""
+        self._store.refresh()
+        return self._store.tokens
 
-    def stop_token_monitoring(self):
-        """Stop the token monitoring thread"""
-        self._stop_monitoring = True
-        if hasattr(self, '_monitor_thread') and self._monitor_thread.is_alive():
-            self._monitor_thread.join()
-
-    def _token_monitor(self):
-        """Background thread that periodically checks token expiration and refreshes as needed"""
-        while not self._stop_monitoring:
-            try:
-                self._check_and_refresh_tokens()
-            except Exception as e:
-                graph_logger.error(f"Error in token monitor: {str(e)}")
-            time.sleep(self.check_interval)
+    @property
+    def active_token(self) -> Optional[str]:
+        return self._get_token_value(self.tokens.get('Current'))
 
-    def _check_and_refresh_tokens(self):
-        """Check all tokens for expiration and refresh if needed"""
-        current_time = datetime.datetime.now(datetime.timezone.utc)
-        tokens_to_refresh = []
+    def start_token_monitoring(self):
+        """Start the background token refresher. Only one refresher runs per process"""
+        # Imported here as the scheduler depends on this module
+        from core.entra.token_refresh_scheduler import TokenRefreshScheduler
+        TokenRefreshScheduler.get_instance(rescan_interval=self.check_interval).start()
 
-        # Collect tokens that need refresh
-        for token_entry in self.tokens["AllTokens"]:
-            access_token = self._get_token_value(token_entry)
-            if not access_token:
-                continue
+    def stop_token_monitoring(self):
+        """Stop the background token refresher"""
+        from core.entra.token_refresh_scheduler import TokenRefreshScheduler
+        TokenRefreshScheduler.get_instance().stop()
 
-            try:
-                token_info = self.decode_jwt_token(access_token)
-                expiration = datetime.datetime.strptime(
-                    token_info["Access Exp"], 
-                    '%Y-%m-%dT%H:%M:%SZ'
-                ).replace(tzinfo=datetime.timezone.utc)
-                
-                # Refresh if token expires in next 10 minutes
-                if (expiration - current_time).total_seconds() < 600:  # 10 minutes
-                    refresh_token = self._get_refresh_token(token_entry)
-                    if refresh_token:
-                        tokens_to_refresh.append((access_token, refresh_token, token_info))
-                    else:
-                        graph_logger.info(f"Token near expiration but no refresh token available: {access_token[:10]}...")
-            except Exception as e:
-                graph_logger.error(f"Error checking token expiration: {str(e)}")
+    def get_refresh_stats(self) -> Dict:
+        """Returns token refresh counters, latency and the next scheduled refresh of the background refresher"""
+        from core.entra.token_refresh_scheduler import TokenRefreshScheduler
+        return TokenRefreshScheduler.get_instance().get_stats()
 
-        # Refresh collected tokens
-        for access_token, refresh_token, token_info in tokens_to_refresh:
-            try:
-                self._refresh_token(access_token, refresh_token, token_info)
-            except TokenRefreshError as e:
-                graph_logger.error(f"Failed to refresh token: {str(e)}")
+    @classmethod
+    def _get_refresh_session(cls) -> requests.Session:
+        """Returns the HTTP session shared by token refreshes, so concurrent refreshes reuse connections"""
+        with cls._refresh_session_lock:
+            if cls._refresh_session is None:
+                cls._refresh_session = requests.Session()
+            return cls._refresh_session
 
     def _refresh_token(self, access_token: str, refresh_token: str, token_info: Dict) -> None:
         """
@@ -109,7 +204,7 @@ class EntraTokenManager:
                 'Content-Type': 'application/x-www-form-urlencoded'
             }
             
-            response = requests.post(refresh_endpoint, data=data, headers=headers)
+            response = self._get_refresh_session().post(refresh_endpoint, data=data, headers=headers)
             
             if response.status_code == 200:
                 token_data = response.json()
@@ -133,24 +228,25 @@ class EntraTokenManager:
 
     def _update_token(self, old_access_token: str, new_access_token: str, new_refresh_token: str):
         """Update a token entry with new access and refresh tokens"""
-        # Find and update token in AllTokens
-        for i, token_entry in enumerate(self.tokens["AllTokens"]):
-            if self._get_token_value(token_entry) == old_access_token:
-                self.tokens["AllTokens"][i] = {
+        with self._store.lock:
+            # Find and update token in AllTokens
+            for i, token_entry in enumerate(self.tokens["AllTokens"]):
+                if self._get_token_value(token_entry) == old_access_token:
+                    self.tokens["AllTokens"][i] = {
+                        'access_token': new_access_token,
+                        'refresh_token': new_refresh_token
+                    }
+                    break
+            
+            # Update Current if it was the active token
+            if self.active_token == old_access_token:
+                self.tokens['Current'] = {
                     'access_token': new_access_token,
                     'refresh_token': new_refresh_token
                 }
-                break
-        
-        # Update Current if it was the active token
-        if self.active_token == old_access_token:
-            self.tokens['Current'] = {
-                'access_token': new_access_token,
-                'refresh_token': new_refresh_token
-            }
-            self.active_token = new_access_token
-        
-        self._save_tokens()
+            
+            TokenInfoCache.get_instance().invalidate(old_access_token)
+            self._save_tokens()
 
     def _get_refresh_token(self, token_entry: Union[str, Dict]) -> Optional[str]:
         """Extract refresh token from token entry"""
@@ -164,28 +260,9 @@ class EntraTokenManager:
             return token_entry.get('access_token')
         return token_entry
 
-    def _load_tokens(self) -> Dict:
-        """Load tokens from YAML file with default structure if file not found"""
-        try:
-            with open(self.yaml_file, 'r') as file:
-                tokens = yaml.safe_load(file) or {}
-                # Initialize with default structure if empty
-                if not tokens:
-                    tokens = {
-                        'Current': None,
-                        'AllTokens': []
-                    }
-                return tokens
-        except FileNotFoundError:
-            return {
-                'Current': None,
-                'AllTokens': []
-            }
-
     def _save_tokens(self):
         """Save tokens to YAML file"""
-        with open(self.yaml_file, 'w') as file:
-            yaml.dump(self.tokens, file)
+        self._store.save()
 
     def _get_token_entry(self, token_value: str) -> Optional[Dict]:
         """Get full token entry (including refresh token) from access token value"""
@@ -211,8 +288,9 @@ class EntraTokenManager:
             'refresh_token': refresh_token
         } if refresh_token else access_token
         
-        self.tokens["AllTokens"].append(token_entry)
-        self._save_tokens()
+        with self._store.lock:
+            self.tokens["AllTokens"].append(token_entry)
+            self._save_tokens()
 
     def set_active_token(self, token_value: str):
         """
@@ -225,13 +303,13 @@ class EntraTokenManager:
         Raises:
             ValueError: If token not found in app
         """
-        token_entry = self._get_token_entry(token_value)
-        if token_entry:
-            self.tokens['Current'] = token_entry
-            self.active_token = token_value
-            self._save_tokens()
-        else:
-            raise ValueError("Token not found in app")
+        with self._store.lock:
+            token_entry = self._get_token_entry(token_value)
+            if token_entry:
+                self.tokens['Current'] = token_entry
+                self._save_tokens()
+            else:
+                raise ValueError("Token not found in app")
 
     def delete_token(self, token_value: str):
         """
@@ -243,15 +321,16 @@ class EntraTokenManager:
         Raises:
             ValueError: If token not found in app
         """
-        token_entry = self._get_token_entry(token_value)
-        if token_entry:
-            self.tokens["AllTokens"].remove(token_entry)
-            if self.active_token == token_value:
-                self.active_token = None
-                self.tokens['Current'] = None
-            self._save_tokens()
-        else:
-            raise ValueError("Token not found in app")
+        with self._store.lock:
+            token_entry = self._get_token_entry(token_value)
+            if token_entry:
+                self.tokens["AllTokens"].remove(token_entry)
+                if self.active_token == token_value:
+                    self.tokens['Current'] = None
+                TokenInfoCache.get_instance().invalidate(token_value)
+                self._save_tokens()
+            else:
+                raise ValueError("Token not found in app")
 
     def get_all_tokens(self) -> list:
         """
@@ -294,10 +373,10 @@ class EntraTokenManager:
         Returns:
             Tuple of (access_token, refresh_token). Both may be None
         """
-        if not self.active_token:
+        current = self.tokens.get('Current')
+        if not self._get_token_value(current):
             return None, None
             
-        current = self.tokens.get('Current')
         if isinstance(current, dict):
             return current.get('access_token'), current.get('refresh_token')
         return current, None
@@ -330,7 +409,7 @@ class EntraTokenManager:
 
     def decode_jwt_token(self, token_value: str) -> dict:
         """
-        Decodes MSFT JWT and returns token information
+        Decodes MSFT JWT and returns token information. Decoded tokens are cached process-wide
         
         Args:
             token_value: The access token to decode
@@ -338,5 +417,4 @@ class EntraTokenManager:
         Returns:
             Dict with decoded token information
         """
-        access_info = Msft_Token(token_value).get_access_info()
-        return access_info
\ No newline at end of file
+        return TokenInfoCache.get_instance().get_access_info(token_value)
\ No newline at end of file
@@ -0,0 +1,145 @@
+import asyncio
+import threading
+import importlib.util
+from typing import Any, Awaitable, Dict, List, Optional, Union
+import httpx
+from .entra_token_manager import EntraTokenManager
+from .graph_rate_limiter import GraphRateLimiter
+from core.logging.logger import graph_logger
+
+class AsyncGraphClient:
+    """
+    Asynchronous Microsoft Graph API client with a shared connection pool.
+
+    A single httpx.AsyncClient (HTTP/2 when the h2 package is installed) runs on a dedicated
+    event loop thread and is shared by all callers in the process. Blocking code such as
+    technique execute() methods uses the synchronous get_many() wrapper to fan out
+    independent requests, while async code can await get() and gather() directly on the
+    client's loop. All requests go through the process-wide GraphRateLimiter.
+
+    Example:
+        client = AsyncGraphClient.get_instance()
+        user, groups = client.get_many([
+            "https://graph.microsoft.com/v1.0/users/<id>",
+            "https://graph.microsoft.com/v1.0/users/<id>/memberOf"
+        ])
+    """
+    MAX_CONNECTIONS = 20
+    REQUEST_TIMEOUT = 60.0
+
+    _instance: Optional['AsyncGraphClient'] = None  # Class variable to store the shared client
+    _instance_lock = threading.Lock()
+
+    def __init__(self) -> None:
+        self.rate_limiter = GraphRateLimiter.get_instance()
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._loop.run_forever, name="graph-async-client", daemon=True)
+        self._loop_thread.start()
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @classmethod
+    def get_instance(cls) -> 'AsyncGraphClient':
+        """Returns the process-wide async Graph client, creating it on first use"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Returns the shared httpx client. Must be called on the client's event loop"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=importlib.util.find_spec("h2") is not None,
+                limits=httpx.Limits(max_connections=self.MAX_CONNECTIONS, max_keepalive_connections=self.MAX_CONNECTIONS),
+                timeout=self.REQUEST_TIMEOUT
+            )
+        return self._client
+
+    @staticmethod
+    def _create_headers(access_token: Optional[str]) -> Dict[str, str]:
+        """Create headers for the request including authorization"""
+        manager = EntraTokenManager()
+        return manager.create_auth_header(access_token or manager.get_active_token())
+
+    async def request(self, method: str, url: str, headers: Dict[str, str], **kwargs: Any) -> httpx.Response:
+        """
+        Makes an HTTP request through the shared rate limiter, retrying throttled requests.
+
+        Args:
+            method: HTTP method to use
+            url: URL to make request to
+            headers: Request headers including authorization
+            **kwargs: Additional arguments to pass to httpx
+
+        Returns:
+            Response from the request
+        """
+        key = self.rate_limiter.key_for(url, headers)
+        attempt = 0
+        while True:
+            await asyncio.sleep(self.rate_limiter.reserve(key))
+            response = await self._get_client().request(method, url, headers=headers, **kwargs)
+            if not self.rate_limiter.record_response(key, response.status_code, response.headers, attempt):
+                break
+            attempt += 1
+        return response
+
+    async def get(self, url: str, params: Optional[Dict] = None, pagination: bool = True,
+                  access_token: Optional[str] = None, headers: Optional[Dict[str, str]] = None) -> Union[List[Dict[str, Any]], Dict[str, Any], Exception]:
+        """
+        Make GET request to Graph API with pagination support.
+
+        Returns the same shapes as GraphRequest.get - list of results if paginated, otherwise
+        single result (including Graph error responses), or the exception if the request failed.
+        """
+        headers = headers or self._create_headers(access_token)
+        graph_results = []
+
+        while url:
+            try:
+                response = await self.request('GET', url, headers=headers, params=params)
+                result = response.json()
+
+                if 'value' in result:
+                    graph_results.extend(result['value'])
+                else:
+                    return result
+
+                url = result.get('@odata.nextLink') if pagination else None
+                # nextLink already contains the query parameters
+                params = None
+
+            except Exception as e:
+                graph_logger.error(f"GET request failed: {str(e)}")
+                return e
+
+        return graph_results
+
+    async def gather(self, *requests: Awaitable[Any]) -> List[Any]:
+        """Runs request coroutines concurrently and returns their results in order"""
+        return list(await asyncio.gather(*requests))
+
+    def run(self, coroutine: Awaitable[Any]) -> Any:
+        """
+        Runs a coroutine on the client's event loop and blocks until it completes.
+        Must not be called from the client's event loop thread.
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def get_many(self, urls: List[str], params: Optional[Dict] = None, pagination: bool = True,
+                 access_token: Optional[str] = None, extra_headers: Optional[Dict[str, str]] = None) -> List[Union[List[Dict[str, Any]], Dict[str, Any], Exception]]:
+        """
+        Make concurrent GET requests to Graph API, blocking until all complete.
+
+        Args:
+            urls: Graph API endpoint URLs
+            params: Optional query parameters applied to every request
+            pagination: Whether to handle pagination
+            access_token: Optional access token to use
+            extra_headers: Optional headers sent with every request, e.g. ConsistencyLevel
+
+        Returns:
+            Results of GraphRequest.get shape for each URL, in the order of urls
+        """
+        headers = {**self._create_headers(access_token), **(extra_headers or {})}
+        return self.run(self.gather(*[self.get(url, params=params, pagination=pagination, headers=headers) for url in urls]))
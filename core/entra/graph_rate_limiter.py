@@ -0,0 +1,210 @@
+import time
+import json
+import base64
+import random
+import threading
+from functools import lru_cache
+from urllib.parse import urlparse
+from typing import Any, Dict, Mapping, Optional, Tuple
+from core.logging.logger import graph_logger
+
+# Path segments identifying the Graph workload a request is throttled by. Checked in order, first match wins
+WORKLOAD_SEGMENTS = [
+    ("mail", {"messages", "mailFolders", "sendMail", "mailboxSettings", "outlook"}),
+    ("sites", {"sites", "drive", "drives"}),
+    ("users", {"users", "me"})
+]
+
+@lru_cache(maxsize=64)
+def _token_tenant(authorization: str) -> str:
+    """Returns the tenant id (tid claim) of a bearer token, or 'default' if it cannot be read"""
+    try:
+        payload = authorization.split()[-1].split('.')[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+        return claims.get('tid') or 'default'
+    except Exception:
+        return 'default'
+
+class _TokenBucket:
+    """Request schedule and counters of one tenant and workload"""
+    def __init__(self, rate: float) -> None:
+        self.rate = rate
+        # Theoretical arrival time of the next request (GCRA)
+        self.tat = 0.0
+        self.counters = {"requests": 0, "throttled": 0, "retries": 0, "retries_exhausted": 0, "wait_seconds": 0.0}
+
+class GraphRateLimiter:
+    """
+    Process-wide token-bucket rate limiter for Microsoft Graph API requests.
+
+    Graph throttles per tenant and per workload, so a bucket is kept for every tenant (from
+    the token's tid claim) and workload (users, mail, sites or the first path segment) and
+    shared by all Graph clients in the process. Concurrent techniques therefore share
+    capacity instead of each assuming the full Graph limit. Callers reserve a request slot
+    and wait for the returned delay, which works for both blocking (time.sleep) and asyncio
+    (asyncio.sleep) callers, then report the response with record_response().
+
+    The rate of a bucket adapts to Graph's feedback: throttled responses pause the bucket for
+    Retry-After (or an exponential backoff) and halve its rate, RateLimit-* headers pause or
+    slow the bucket before the limit is hit, and successful responses slowly restore the rate.
+    Retries of a single request are capped by MAX_RETRIES and MAX_RETRY_WAIT.
+    """
+    DEFAULT_REQUESTS_PER_SECOND = 20
+    # Number of requests a bucket may send at once after being idle
+    DEFAULT_BURST = 10
+    MIN_REQUESTS_PER_SECOND = 1
+    # Requests per second restored on every successful response
+    RECOVERY_STEP = 0.1
+    # Retry budget of a single request
+    MAX_RETRIES = 3
+    MAX_RETRY_WAIT = 300
+    # Exponential backoff of throttled responses without Retry-After
+    BASE_BACKOFF = 2
+    MAX_BACKOFF = 60
+    RETRY_STATUS_CODES = (429, 503)
+
+    _instance: Optional['GraphRateLimiter'] = None  # Class variable to store the shared limiter
+    _instance_lock = threading.Lock()
+
+    def __init__(self, requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND, burst: int = DEFAULT_BURST):
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._buckets: Dict[Tuple[str, str], _TokenBucket] = {}
+
+    @classmethod
+    def get_instance(cls) -> 'GraphRateLimiter':
+        """Returns the process-wide Graph rate limiter, creating it on first use"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    @staticmethod
+    def key_for(url: str, headers: Optional[Mapping[str, str]] = None) -> Tuple[str, str]:
+        """
+        Returns the bucket key of a request.
+
+        Args:
+            url: Absolute Graph URL or URL relative to the API version root (as in $batch items)
+            headers: Request headers carrying the bearer token
+
+        Returns:
+            Tuple[str, str]: (tenant id, workload)
+        """
+        tenant = _token_tenant((headers or {}).get('Authorization', ''))
+        segments = [segment for segment in urlparse(url).path.split('/') if segment]
+        if segments and segments[0] in ("v1.0", "beta"):
+            segments = segments[1:]
+        names = {segment.split('(')[0] for segment in segments}
+        for workload, workload_segments in WORKLOAD_SEGMENTS:
+            if names & workload_segments:
+                return tenant, workload
+        return tenant, segments[0] if segments else "default"
+
+    def _bucket(self, key: Tuple[str, str]) -> _TokenBucket:
+        """Returns the bucket of a key, creating it on first use. Called with lock held"""
+        if key not in self._buckets:
+            self._buckets[key] = _TokenBucket(self.requests_per_second)
+        return self._buckets[key]
+
+    def reserve(self, key: Tuple[str, str]) -> float:
+        """
+        Reserves the next request slot of a bucket.
+
+        Args:
+            key: Bucket key from key_for()
+
+        Returns:
+            float: Seconds the caller must wait before sending the request.
+        """
+        with self._lock:
+            bucket = self._bucket(key)
+            now = time.monotonic()
+            interval = 1.0 / bucket.rate
+            start = max(now, bucket.tat - (self.burst - 1) * interval)
+            bucket.tat = max(bucket.tat, now) + interval
+            bucket.counters["requests"] += 1
+            bucket.counters["wait_seconds"] += start - now
+            return start - now
+
+    def _pause(self, bucket: _TokenBucket, seconds: float) -> None:
+        """Delays the next request of a bucket by at least seconds, without a burst afterwards. Called with lock held"""
+        bucket.tat = max(bucket.tat, time.monotonic() + seconds + (self.burst - 1) / bucket.rate)
+
+    def throttle(self, key: Tuple[str, str], retry_after: float) -> None:
+        """
+        Pauses all requests of a bucket after Graph throttled a request.
+
+        Args:
+            key: Bucket key from key_for()
+            retry_after: Seconds to wait, from the Retry-After header of the throttled response.
+        """
+        with self._lock:
+            self._pause(self._bucket(key), retry_after)
+        graph_logger.warning(f"Rate limit hit for {key[1]} in tenant {key[0]}. Pausing requests for {retry_after} seconds.")
+
+    def record_response(self, key: Tuple[str, str], status_code: int, headers: Optional[Mapping[str, str]], attempt: int = 0) -> bool:
+        """
+        Adapts the bucket to a Graph response and decides whether the request is retried.
+
+        Args:
+            key: Bucket key from key_for()
+            status_code: HTTP status of the response (or of the $batch item)
+            headers: Response headers (or headers of the $batch item)
+            attempt: Number of times the request was already retried
+
+        Returns:
+            bool: True if the request was throttled and should be sent again. The delay is
+            applied to the next reserve() of the bucket.
+        """
+        headers = {name.lower(): value for name, value in (headers or {}).items()}
+        with self._lock:
+            bucket = self._bucket(key)
+
+            if status_code in self.RETRY_STATUS_CODES:
+                try:
+                    delay = float(headers['retry-after'])
+                except (KeyError, ValueError):
+                    delay = min(self.MAX_BACKOFF, self.BASE_BACKOFF * 2 ** attempt) * random.uniform(0.5, 1.0)
+                bucket.counters["throttled"] += 1
+                bucket.rate = max(self.MIN_REQUESTS_PER_SECOND, bucket.rate / 2)
+                # A Retry-After beyond the retry budget fails the request, other requests are not held for all of it
+                self._pause(bucket, min(delay, self.MAX_RETRY_WAIT))
+                retry = attempt < self.MAX_RETRIES and delay <= self.MAX_RETRY_WAIT
+                bucket.counters["retries" if retry else "retries_exhausted"] += 1
+            else:
+                delay = None
+                retry = False
+                remaining = headers.get('ratelimit-remaining', headers.get('x-ratelimit-remaining'))
+                limit = headers.get('ratelimit-limit')
+                try:
+                    if remaining is not None and int(remaining) <= 0:
+                        # Quota of the current window used up, wait for it to reset
+                        self._pause(bucket, float(headers.get('ratelimit-reset', 1)))
+                    elif remaining is not None and limit is not None and int(remaining) < int(limit) * 0.1:
+                        bucket.rate = max(self.MIN_REQUESTS_PER_SECOND, bucket.rate / 2)
+                    elif status_code < 400:
+                        bucket.rate = min(self.requests_per_second, bucket.rate + self.RECOVERY_STEP)
+                except ValueError:
+                    pass
+
+        if delay is not None:
+            if retry:
+                graph_logger.warning(f"Rate limit hit for {key[1]} in tenant {key[0]}. Retrying after {delay:.1f} seconds.")
+            else:
+                graph_logger.error(f"Rate limit hit for {key[1]} in tenant {key[0]}. Retry budget exhausted after {attempt} retries.")
+        return retry
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the request counters and current rate of every bucket.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Counters keyed by '<tenant>/<workload>'
+        """
+        with self._lock:
+            return {
+                f"{tenant}/{workload}": dict(bucket.counters, wait_seconds=round(bucket.counters["wait_seconds"], 2), requests_per_second=round(bucket.rate, 2))
+                for (tenant, workload), bucket in self._buckets.items()
+            }
@@ -2,62 +2,28 @@ import requests
 import json
 import re
 import time
-from typing import Optional, Dict, Any, Union, List
+from typing import Optional, Dict, Any, Union, List, Tuple, Iterator
 from .entra_token_manager import EntraTokenManager
+from .graph_async_client import AsyncGraphClient
+from .graph_rate_limiter import GraphRateLimiter
 from core.logging.logger import graph_logger
 
-class RateLimiter:
-    """Handles rate limiting for Graph API requests"""
-    def __init__(self, requests_per_second: int = 20):
-        self.requests_per_second = requests_per_second
-        self.last_request_time = 0.0
-        self._remaining_requests = None
-        self._throttle_until = None
-
-    def wait_if_needed(self, response: Optional[requests.Response] = None) -> None:
-        """
-        Implements rate limiting based on time between requests and response headers.
-        
-        Args:
-            response: Optional response object to check for throttling headers
-        """
-        current_time = time.time()
-
-        # Check for throttling headers if response is provided
-        if response is not None:
-            remaining = response.headers.get('X-RateLimit-Remaining')
-            retry_after = response.headers.get('Retry-After')
-
-            if remaining is not None:
-                self._remaining_requests = int(remaining)
-
-            if retry_after is not None:
-                self._throttle_until = current_time + int(retry_after)
-                graph_logger.warning(f"Rate limit hit. Waiting {retry_after} seconds.")
-                time.sleep(int(retry_after))
-                return
-
-        # If in a throttle window, wait
-        if self._throttle_until and current_time < self._throttle_until:
-            wait_time = self._throttle_until - current_time
-            graph_logger.debug(f"In throttle window. Waiting {wait_time:.2f} seconds.")
-            time.sleep(wait_time)
-            return
-
-        # Rate limiting based on requests per second
-        elapsed = current_time - self.last_request_time
-        if elapsed < (1.0 / self.requests_per_second):
-            wait_time = (1.0 / self.requests_per_second) - elapsed
-            time.sleep(wait_time)
-
-        self.last_request_time = time.time()
+class GraphRequestError(Exception):
+    """Graph API returned an error response to a streaming request"""
+    def __init__(self, error: Any):
+        self.error = error
+        message = error.get('message', str(error)) if isinstance(error, dict) else str(error)
+        super().__init__(message)
 
 class GraphRequest:
     """Handles Microsoft Graph API requests with rate limiting and error handling"""
+    GRAPH_URL_PATTERN = re.compile(r'^https://graph\.microsoft\.com/(v1\.0|beta)(/.*)$')
+    # Maximum number of requests in a single $batch call
+    MAX_BATCH_SIZE = 20
     
-    def __init__(self, requests_per_second: int = 20):
+    def __init__(self):
         self.manager = EntraTokenManager()
-        self.rate_limiter = RateLimiter(requests_per_second)
+        self.rate_limiter = GraphRateLimiter.get_instance()
         self._session = requests.Session()
 
     def _get_token(self, access_token: Optional[str]) -> str:
@@ -71,13 +37,15 @@ class GraphRequest:
         token = self._get_token(access_token)
         return self.manager.create_auth_header(token)
 
-    def _make_request(self, method: str, url: str, **kwargs) -> requests.Response:
+    def _make_request(self, method: str, url: str, rate_limit_keys: Optional[List[Tuple[str, str]]] = None, **kwargs) -> requests.Response:
         """
-        Makes an HTTP request with rate limiting and error handling.
+        Makes an HTTP request through the shared rate limiter, retrying throttled requests
+        within the limiter's retry budget.
         
         Args:
             method: HTTP method to use
             url: URL to make request to
+            rate_limit_keys: Rate limiter buckets the request counts against. Defaults to the bucket of url
             **kwargs: Additional arguments to pass to requests
             
         Returns:
@@ -86,23 +54,21 @@ class GraphRequest:
         Raises:
             requests.exceptions.RequestException: If the request fails
         """
-        self.rate_limiter.wait_if_needed()
-        
-        try:
+        keys = rate_limit_keys or [self.rate_limiter.key_for(url, kwargs.get('headers'))]
+        attempt = 0
+        while True:
+            time.sleep(max(self.rate_limiter.reserve(key) for key in keys))
             response = self._session.request(method, url, **kwargs)
-            self.rate_limiter.wait_if_needed(response)
-            if response.status_code == 429:  # Too Many Requests
-                retry_after = int(response.headers.get('Retry-After', 30))
-                graph_logger.warning(f"Rate limit exceeded. Retrying after {retry_after} seconds")
-                time.sleep(retry_after)
-                return self._make_request(method, url, **kwargs)
-                
-            response.raise_for_status()
-            return response
+            retry = [self.rate_limiter.record_response(key, response.status_code, response.headers, attempt) for key in keys]
+            if not all(retry):
+                break
+            attempt += 1
             
+        try:
+            response.raise_for_status()
         except requests.exceptions.RequestException as e:
             graph_logger.error(f"Request failed: {str(e)}")
-            return response
+        return response
 
     def get(self, url: str, params: Optional[Dict] = None, 
             pagination: bool = True, access_token: Optional[str] = None, 
@@ -142,6 +108,256 @@ class GraphRequest:
 
         return graph_results
 
+    def iter_pages(self, url: str, params: Optional[Dict] = None,
+                   access_token: Optional[str] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Make paginated GET request to Graph API, yielding each page of results as it arrives.
+        
+        Unlike get(), pages are not accumulated, so enumerating large collections runs in
+        memory bounded by the page size.
+        
+        Args:
+            url: Graph API endpoint URL of a collection
+            params: Optional query parameters
+            access_token: Optional access token to use
+            
+        Yields:
+            List of results of each page
+            
+        Raises:
+            GraphRequestError: If Graph returns an error or the response is not a collection
+        """
+        headers = self._create_headers(access_token)
+
+        while url:
+            response = self._make_request('GET', url, headers=headers, params=params)
+            result = response.json()
+
+            if 'value' not in result:
+                raise GraphRequestError(result.get('error', "Graph response is not a collection"))
+            yield result['value']
+
+            url = result.get('@odata.nextLink')
+            # nextLink already contains the query parameters
+            params = None
+
+    def iter_items(self, url: str, params: Optional[Dict] = None,
+                   access_token: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Make paginated GET request to Graph API, yielding results one at a time as pages arrive.
+        
+        Example:
+            for user in GraphRequest().iter_items("https://graph.microsoft.com/v1.0/users"):
+                output_stream.write(user)
+        
+        Raises:
+            GraphRequestError: If Graph returns an error or the response is not a collection
+        """
+        for page in self.iter_pages(url, params=params, access_token=access_token):
+            yield from page
+
+    def get_many(self, urls: List[str], params: Optional[Dict] = None,
+                 pagination: bool = True, access_token: Optional[str] = None,
+                 extra_headers: Optional[Dict[str, str]] = None) -> List[Union[List[Dict[str, Any]], Dict[str, Any]]]:
+        """
+        Make concurrent GET requests to Graph API on the shared AsyncGraphClient.
+        
+        Args:
+            urls: Graph API endpoint URLs
+            params: Optional query parameters applied to every request
+            pagination: Whether to handle pagination
+            access_token: Optional access token to use
+            extra_headers: Optional headers sent with every request, e.g. ConsistencyLevel
+            
+        Returns:
+            Result of each URL in the same shape as get(), in the order of urls
+        """
+        return AsyncGraphClient.get_instance().get_many(urls, params=params, pagination=pagination, 
+                                                        access_token=access_token or self._get_token(None),
+                                                        extra_headers=extra_headers)
+
+    def batch(self, requests: List[Union[str, Dict[str, Any]]], pagination: bool = True,
+              access_token: Optional[str] = None) -> List[Union[List[Dict[str, Any]], Dict[str, Any]]]:
+        """
+        Make multiple Graph API requests using JSON batching ($batch).
+        
+        Requests are packed up to MAX_BATCH_SIZE per $batch call. Every item counts against the
+        shared rate limiter bucket of its workload. Throttled items are resent after their
+        Retry-After within the limiter's retry budget, together with items that failed only because
+        a throttled item they depend on did. Remaining pages of paginated collections are then
+        fetched concurrently with get_many(), so the result of a collection request holds all of its pages.
+        
+        Args:
+            requests: Graph API endpoint URLs, or request dicts with the keys 'url' (required),
+                'method' (default GET), 'body', 'headers', 'id' (default: position in requests) and
+                'depends_on' (ids of requests in this call that must complete first)
+            pagination: Whether to handle pagination
+            access_token: Optional access token to use
+            
+        Returns:
+            Result of each request in the order of requests - list of results for collections,
+            otherwise the response body (including Graph error responses)
+            
+        Raises:
+            ValueError: If request ids are not unique or dependent requests cannot be sent in one batch
+        """
+        headers = self._create_headers(access_token)
+
+        items = []
+        for index, request in enumerate(requests):
+            if isinstance(request, str):
+                request = {'url': request}
+            version, relative_url = self._split_graph_url(request['url'])
+            items.append({
+                'id': str(request.get('id', index)),
+                'method': request.get('method', 'GET').upper(),
+                'url': relative_url,
+                'version': version,
+                'body': request.get('body'),
+                'headers': request.get('headers'),
+                'depends_on': [str(dep) for dep in request.get('depends_on') or []],
+                'key': self.rate_limiter.key_for(relative_url, headers),
+                'attempt': 0
+            })
+        if len({item['id'] for item in items}) != len(items):
+            raise ValueError("Batch request ids must be unique")
+
+        results: Dict[str, Any] = {item['id']: None for item in items}
+        next_links: Dict[str, str] = {}
+        pending = items
+        while pending:
+            responses = {}
+            for chunk in self._batch_chunks(pending):
+                responses.update(self._send_batch(chunk, headers))
+
+            retry = []
+            retry_ids = set()
+            for item in pending:
+                response = responses[item['id']]
+                if self.rate_limiter.record_response(item['key'], response.get('status', 500), response.get('headers'), item['attempt']):
+                    retry_ids.add(item['id'])
+            # Items that failed because a resent item they depend on failed are resent with it
+            added = bool(retry_ids)
+            while added:
+                added = False
+                for item in pending:
+                    if item['id'] not in retry_ids and responses[item['id']].get('status') == 424 and retry_ids.intersection(item['depends_on']):
+                        retry_ids.add(item['id'])
+                        added = True
+
+            for item in pending:
+                if item['id'] in retry_ids:
+                    retry.append(item)
+                    continue
+
+                response = responses[item['id']]
+                body = response.get('body')
+                if isinstance(body, dict) and 'value' in body and response.get('status', 500) < 400:
+                    results[item['id']] = body['value']
+                    if pagination and body.get('@odata.nextLink'):
+                        next_links[item['id']] = body['@odata.nextLink']
+                else:
+                    results[item['id']] = body
+
+            if retry:
+                graph_logger.warning(f"Batch rate limit exceeded. Retrying {len(retry)} requests")
+                for item in retry:
+                    item['attempt'] += 1
+                    # Dependencies that completed are no longer sent with the retried items
+                    item['depends_on'] = [dep for dep in item['depends_on'] if dep in retry_ids]
+            pending = retry
+
+        # Follow the remaining pages of all collections concurrently, grouped by their request headers
+        follow_ups: Dict[str, List[str]] = {}
+        item_headers = {item['id']: item['headers'] for item in items}
+        for item_id in next_links:
+            follow_ups.setdefault(json.dumps(item_headers[item_id] or {}, sort_keys=True), []).append(item_id)
+        for extra_headers, item_ids in follow_ups.items():
+            pages = self.get_many([next_links[item_id] for item_id in item_ids], access_token=access_token,
+                                  extra_headers=json.loads(extra_headers) or None)
+            for item_id, page in zip(item_ids, pages):
+                if isinstance(page, list):
+                    results[item_id] = results[item_id] + page
+                elif isinstance(page, Exception):
+                    results[item_id] = {'error': {'code': 'RequestFailed', 'message': str(page)}}
+                else:
+                    results[item_id] = page
+
+        return [results[item['id']] for item in items]
+
+    def _split_graph_url(self, url: str) -> Tuple[str, str]:
+        """Split a Graph API URL into API version and URL relative to the version root"""
+        match = self.GRAPH_URL_PATTERN.match(url)
+        if match:
+            return match.group(1), match.group(2)
+        return 'v1.0', url if url.startswith('/') else '/' + url
+
+    def _batch_chunks(self, items: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Pack batch items into chunks of up to MAX_BATCH_SIZE, keeping dependent items in the same chunk"""
+        # Group items connected through depends_on
+        group_of = {item['id']: item['id'] for item in items}
+        def find(item_id):
+            while group_of[item_id] != item_id:
+                group_of[item_id] = group_of[group_of[item_id]]
+                item_id = group_of[item_id]
+            return item_id
+        for item in items:
+            for dep in item['depends_on']:
+                if dep not in group_of:
+                    raise ValueError(f"Batch request '{item['id']}' depends on unknown request '{dep}'")
+                group_of[find(item['id'])] = find(dep)
+
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for item in items:
+            groups.setdefault(find(item['id']), []).append(item)
+
+        chunks: Dict[str, List[List[Dict[str, Any]]]] = {}
+        for group in groups.values():
+            if len(group) > self.MAX_BATCH_SIZE:
+                raise ValueError(f"Dependent batch requests exceed the batch size of {self.MAX_BATCH_SIZE}")
+            if len({item['version'] for item in group}) > 1:
+                raise ValueError("Dependent batch requests must use the same Graph API version")
+            version_chunks = chunks.setdefault(group[0]['version'], [[]])
+            if len(version_chunks[-1]) + len(group) > self.MAX_BATCH_SIZE:
+                version_chunks.append([])
+            version_chunks[-1].extend(group)
+        return [chunk for version_chunks in chunks.values() for chunk in version_chunks if chunk]
+
+    def _send_batch(self, chunk: List[Dict[str, Any]], headers: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """Send a single $batch call. Returns the response of each item by id"""
+        batch_requests = []
+        for item in chunk:
+            batch_request = {'id': item['id'], 'method': item['method'], 'url': item['url']}
+            if item['body'] is not None:
+                batch_request['body'] = item['body']
+                batch_request['headers'] = item['headers'] or {'Content-Type': 'application/json'}
+            elif item['headers']:
+                batch_request['headers'] = item['headers']
+            if item['depends_on']:
+                batch_request['dependsOn'] = item['depends_on']
+            batch_requests.append(batch_request)
+
+        try:
+            response = self._make_request('POST', f"https://graph.microsoft.com/{chunk[0]['version']}/$batch",
+                                          rate_limit_keys=[item['key'] for item in chunk],
+                                          headers=headers, data=json.dumps({'requests': batch_requests}))
+            result = response.json()
+            if 'responses' not in result:
+                raise ValueError(result.get('error', {}).get('message', 'Invalid batch response'))
+            responses = {item_response['id']: item_response for item_response in result['responses']}
+        except Exception as e:
+            graph_logger.error(f"Batch request failed: {str(e)}")
+            responses = {}
+
+        # Items missing from the batch response are reported as failed
+        return {
+            item['id']: responses.get(item['id'], {
+                'id': item['id'], 'status': 500,
+                'body': {'error': {'code': 'BatchRequestFailed', 'message': 'No response for batch request item'}}
+            })
+            for item in chunk
+        }
+
     def post(self, url: str, data: Dict[str, Any], 
              access_token: Optional[str] = None) -> requests.Response:
         """Make POST request to Graph API"""
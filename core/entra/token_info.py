@@ -1,6 +1,11 @@
 import jwt
+import time
+import hashlib
 import datetime
-from typing import Optional, Union
+import threading
+from collections import OrderedDict
+from functools import cached_property
+from typing import Any, Dict, Optional, Tuple, Union
 
 class Msft_Token:
     """
@@ -8,14 +13,44 @@ class Msft_Token:
     """
     def __init__(self, token_value: str):
         self.token_value = token_value
-        self.decoded_token = self._decode_token()
-        self.target_tenant = self.decoded_token['tid']
-        self.entity_type = self.decoded_token['idtyp']
-        self.expiration = self._convert_expiration(self.decoded_token['exp'])
-        self.authenticated_entity = self._get_authenticated_entity()
-        self.scope = self._get_scope()
-        self.access_type = "Delegated" if self.entity_type == "user" else "App-only"
-        self.app_name = self._get_app_name()
+
+    # Claims are decoded on first access and derived attributes are computed once
+    @cached_property
+    def decoded_token(self) -> dict:
+        return self._decode_token()
+
+    @cached_property
+    def target_tenant(self) -> str:
+        return self.decoded_token['tid']
+
+    @cached_property
+    def entity_type(self) -> str:
+        return self.decoded_token['idtyp']
+
+    @cached_property
+    def expires_at(self) -> int:
+        """Token expiration as epoch seconds"""
+        return self.decoded_token['exp']
+
+    @cached_property
+    def expiration(self) -> str:
+        return self._convert_expiration(self.expires_at)
+
+    @cached_property
+    def authenticated_entity(self) -> str:
+        return self._get_authenticated_entity()
+
+    @cached_property
+    def scope(self) -> Union[str, list]:
+        return self._get_scope()
+
+    @cached_property
+    def access_type(self) -> str:
+        return self._get_access_type()
+
+    @cached_property
+    def app_name(self) -> Optional[str]:
+        return self._get_app_name()
 
     def _decode_token(self) -> dict:
         """
@@ -77,4 +112,84 @@ class Msft_Token:
     def from_token(cls, token_value: Optional[str] = None) -> 'Msft_Token':
         if token_value is None:
             raise ValueError("Token not found")
-        return cls(token_value)
\ No newline at end of file
+        return cls(token_value)
+
+class TokenInfoCache:
+    """
+    Process-wide cache of decoded MSFT token information.
+
+    Tokens are decoded once and their access info is kept in an LRU cache keyed by the SHA-256
+    hash of the token, so token values are not held as keys. When the cache is full, expired
+    tokens are evicted before least recently used ones.
+    """
+    MAX_ENTRIES = 128
+
+    _instance: Optional['TokenInfoCache'] = None  # Class variable to store the shared cache
+    _instance_lock = threading.Lock()
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # token hash -> (expiration epoch, access info)
+        self._entries: 'OrderedDict[str, Tuple[int, Dict[str, Any]]]' = OrderedDict()
+
+    @classmethod
+    def get_instance(cls) -> 'TokenInfoCache':
+        """Returns the process-wide token info cache, creating it on first use"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    @staticmethod
+    def _hash(token_value: str) -> str:
+        return hashlib.sha256(token_value.encode()).hexdigest()
+
+    @staticmethod
+    def _copy(access_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Returns a copy of cached access info so callers cannot modify the cache"""
+        access_info = dict(access_info)
+        if isinstance(access_info["Access scope"], list):
+            access_info["Access scope"] = list(access_info["Access scope"])
+        return access_info
+
+    def get_access_info(self, token_value: str) -> Dict[str, Any]:
+        """
+        Returns the access info of a token (see Msft_Token.get_access_info), decoding it on first use.
+
+        Raises:
+            ValueError: If the token is not a valid JWT
+        """
+        key = self._hash(token_value)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return self._copy(entry[1])
+
+        # Decode outside the lock, concurrent misses of the same token decode it twice at worst
+        token = Msft_Token(token_value)
+        access_info = token.get_access_info()
+
+        with self._lock:
+            self._entries[key] = (token.expires_at, access_info)
+            self._entries.move_to_end(key)
+            self._evict()
+        return self._copy(access_info)
+
+    def _evict(self) -> None:
+        """Evicts entries over max_entries, expired tokens first. Called with lock held"""
+        if len(self._entries) <= self.max_entries:
+            return
+        now = time.time()
+        for key in [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]:
+            if len(self._entries) <= self.max_entries:
+                return
+            del self._entries[key]
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, token_value: str) -> None:
+        """Removes a token from the cache"""
+        with self._lock:
+            self._entries.pop(self._hash(token_value), None)
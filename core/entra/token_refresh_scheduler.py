@@ -0,0 +1,173 @@
+import time
+import heapq
+import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple
+from core.entra.entra_token_manager import EntraTokenManager
+from core.logging.logger import graph_logger
+
+class TokenRefreshScheduler:
+    """
+    Process-wide background refresher of Entra tokens.
+
+    Refresh times of all stored tokens that have a refresh token (expiration minus
+    REFRESH_MARGIN) are kept in a min-heap. The scheduler thread sleeps until the next token is
+    due, or until the token store changes, and refreshes due tokens concurrently on a small
+    thread pool. Failed refreshes are retried with exponential backoff. Refresh latency and
+    failures are available from get_stats().
+    """
+    # Seconds before expiration at which a token is refreshed
+    REFRESH_MARGIN = 600
+    MAX_WORKERS = 4
+    # Delay of the first retry of a failed refresh, doubled on every further failure
+    RETRY_DELAY = 60
+
+    _instance: Optional['TokenRefreshScheduler'] = None  # Class variable to store the shared scheduler
+    _instance_lock = threading.Lock()
+
+    def __init__(self, rescan_interval: float = 300, max_workers: int = MAX_WORKERS) -> None:
+        """
+        Args:
+            rescan_interval: Maximum seconds between checks of the token file for tokens added by other processes
+            max_workers: Maximum number of tokens refreshed at the same time
+        """
+        self.manager = EntraTokenManager()
+        self.rescan_interval = rescan_interval
+        self._store = self.manager._store
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="entra-token-refresh")
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+        # Guarded by the token store condition
+        self._heap: List[Tuple[float, str]] = []
+        self._seen_version: Optional[int] = None
+        self._in_flight: Set[str] = set()
+        # access token -> (retry time, number of failures)
+        self._retries: Dict[str, Tuple[float, int]] = {}
+        self._stats = {"refreshed": 0, "failed": 0, "last_error": None, "last_latency": None, "max_latency": 0.0, "total_latency": 0.0}
+
+    @classmethod
+    def get_instance(cls, **kwargs: Any) -> 'TokenRefreshScheduler':
+        """Returns the process-wide refresh scheduler, creating it on first use"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(**kwargs)
+            return cls._instance
+
+    def start(self) -> None:
+        """Starts the scheduler thread"""
+        with self._store.changed:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, name="entra-token-refresher", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stops the scheduler thread. Refreshes already started complete"""
+        with self._store.changed:
+            self._stopped = True
+            self._store.changed.notify_all()
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join()
+
+    def _rebuild(self) -> None:
+        """Rebuilds the heap of refresh times from the token store. Called with store condition held"""
+        heap = []
+        access_tokens = set()
+        for token_entry in self.manager.tokens["AllTokens"]:
+            access_token = self.manager._get_token_value(token_entry)
+            if not access_token or not self.manager._get_refresh_token(token_entry):
+                continue
+            access_tokens.add(access_token)
+            try:
+                token_info = self.manager.decode_jwt_token(access_token)
+                expiration = datetime.datetime.strptime(
+                    token_info["Access Exp"],
+                    '%Y-%m-%dT%H:%M:%SZ'
+                ).replace(tzinfo=datetime.timezone.utc).timestamp()
+            except Exception as e:
+                graph_logger.error(f"Error checking token expiration: {str(e)}")
+                continue
+            refresh_at = expiration - self.REFRESH_MARGIN
+            if access_token in self._retries:
+                refresh_at = max(refresh_at, self._retries[access_token][0])
+            heap.append((refresh_at, access_token))
+        heapq.heapify(heap)
+        self._heap = heap
+        # Forget failures of tokens that were replaced or deleted
+        self._retries = {token: retry for token, retry in self._retries.items() if token in access_tokens}
+
+    def _run(self) -> None:
+        with self._store.changed:
+            while not self._stopped:
+                # Accessing the tokens picks up changes of the token file by other processes
+                self.manager.tokens
+                if self._store.version != self._seen_version:
+                    self._seen_version = self._store.version
+                    self._rebuild()
+
+                now = time.time()
+                while self._heap and self._heap[0][0] <= now:
+                    _, access_token = heapq.heappop(self._heap)
+                    if access_token not in self._in_flight:
+                        self._in_flight.add(access_token)
+                        self._executor.submit(self._refresh, access_token)
+
+                timeout = self.rescan_interval
+                if self._heap:
+                    timeout = min(timeout, max(0.0, self._heap[0][0] - now))
+                self._store.changed.wait(timeout)
+
+    def _refresh(self, access_token: str) -> None:
+        """Refreshes a token on the thread pool and records the outcome"""
+        start = time.monotonic()
+        try:
+            access_token, refresh_token = self.manager.get_token_pair(access_token)
+            token_info = self.manager.decode_jwt_token(access_token)
+            self.manager._refresh_token(access_token, refresh_token, token_info)
+            error = None
+        except Exception as e:
+            error = e
+        latency = time.monotonic() - start
+
+        with self._store.changed:
+            self._in_flight.discard(access_token)
+            if error is None:
+                self._retries.pop(access_token, None)
+                self._stats["refreshed"] += 1
+                self._stats["last_latency"] = latency
+                self._stats["max_latency"] = max(self._stats["max_latency"], latency)
+                self._stats["total_latency"] += latency
+            else:
+                failures = self._retries.get(access_token, (0.0, 0))[1] + 1
+                delay = min(self.rescan_interval, self.RETRY_DELAY * 2 ** (failures - 1))
+                self._retries[access_token] = (time.time() + delay, failures)
+                self._stats["failed"] += 1
+                self._stats["last_error"] = str(error)
+                # Reschedule the token with its retry time
+                self._seen_version = None
+            self._store.changed.notify_all()
+
+        if error is None:
+            graph_logger.info(f"Refreshed token {access_token[:10]}... in {latency:.2f} seconds")
+        else:
+            graph_logger.error(f"Failed to refresh token: {str(error)}. Retrying in {delay} seconds")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Returns refresh counters and latency, and the next scheduled refresh.
+
+        Returns:
+            Dict[str, Any]: refreshed, failed, last_error, last_latency, max_latency and avg_latency
+            (seconds), scheduled_tokens, next_refresh (ISO time or None)
+        """
+        with self._store.changed:
+            stats = dict(self._stats)
+            total_latency = stats.pop("total_latency")
+            stats["avg_latency"] = total_latency / stats["refreshed"] if stats["refreshed"] else None
+            stats["scheduled_tokens"] = len(self._heap)
+            stats["next_refresh"] = datetime.datetime.fromtimestamp(self._heap[0][0]).isoformat() if self._heap else None
+            return stats
@@ -1,8 +1,10 @@
 import base64
-from datetime import datetime, timedelta
+import copy
+from datetime import datetime, timedelta, timezone
 import os
+import threading
 from dataclasses import dataclass
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 from google.oauth2.service_account import Credentials as ServiceAccountCredentials
 from google.oauth2.credentials import Credentials as UserAccountCredentials
 from google.oauth2.credentials import Credentials as ShortLivedTokenCredentials
@@ -21,12 +23,29 @@ class TokenInfoResponse:
     error: Optional[str] = None
 
 class GCPAccess():
-    """GCP access manager"""
+    """
+    GCP access manager
+
+    Saved credentials are cached process-wide. The credentials file is parsed again only when
+    it changes, and the google.auth credential object of every saved credential is kept alive,
+    so its access token is reused by all GCPAccess instances until it is about to expire
+    (REFRESH_SKEW seconds before expiry). Expiration of short-lived tokens is looked up once
+    from the tokeninfo endpoint. The cache is invalidated when credentials are saved or deleted.
+    """
+    # Seconds before expiry at which a token is refreshed
+    REFRESH_SKEW = 300
+
     credential = None
     credential_type: str = None
     credential_name: str = None
     credential_current: bool = False
 
+    _credentials_cache: Optional[Tuple[Optional[Tuple[int, int]], List[Dict[str, Any]]]] = None  # Class variable to store the parsed credentials file with the file state it was read at
+    _decoded_credentials: Dict[str, Any] = {}  # Class variable to store decoded credentials by their base64 encoding
+    _live_credentials: Dict[Tuple[str, str, str], Any] = {}  # Class variable to store google.auth credentials of saved credentials
+    _token_expiry: Dict[str, Optional[datetime]] = {}  # Class variable to store expiration of short-lived tokens
+    _cache_lock = threading.RLock()
+
     def __init__(self, token=None, raw_credentials=None, scopes=None, name=None):
         """Initialize GCPAccess directly with raw credential string and optional scopes"""
         # Only initialize if it's not already initialized
@@ -78,6 +97,7 @@ class GCPAccess():
                     
                     if not token_response.success:
                         raise ValueError(f"Failed to validate token with Google tokeninfo endpoint: HTTP {token_response.status_code} - {token_response.error}")
+                    self._store_token_expiry(token, token_response)
 
                     # Initialize with short-lived token
                     self.credential = ShortLivedTokenCredentials(
@@ -104,11 +124,10 @@ class GCPAccess():
             detailed_credential = None
             for credential in credentials:
                 if credential["name"] == name:
-                    decoded_credential = base64.b64decode(credential["credential"]).decode("utf-8")
                     detailed_credential = {
                         "name": credential["name"],
                         "current": credential["current"],
-                        "credential": json.loads(decoded_credential),
+                        "credential": self._decode_credential(credential["credential"]),
                         "type": credential["type"],
                     }
                     return detailed_credential
@@ -124,8 +143,21 @@ class GCPAccess():
             return detailed_credential
         raise ValueError("No credential data provided")
 
-    def refresh_token(self):
-        """Refresh the token associated with the credentials."""
+    def _token_is_fresh(self) -> bool:
+        """Checks whether the credential has a token that is valid for more than REFRESH_SKEW seconds"""
+        if not getattr(self.credential, "token", None):
+            return False
+        expiry = getattr(self.credential, "expiry", None)
+        if expiry is None:
+            return True
+        # google.auth expiry is a naive UTC datetime
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return expiry - now > timedelta(seconds=self.REFRESH_SKEW)
+
+    def refresh_token(self, force: bool = False):
+        """Refresh the token associated with the credentials, unless it is still valid beyond the refresh skew window or force is set."""
+        if not force and self._token_is_fresh():
+            return
         try:
             request = Request()
             self.credential.refresh(request)
@@ -157,12 +189,16 @@ class GCPAccess():
                     return True, None
                 return False, None
             elif self.credential_type == "short_lived_token":
-                token_response = self._get_token_info(self.credential.token)
-    
-                if token_response.success:
-                    now = datetime.now()
-                    new_time = now + timedelta(seconds=float(token_response.data.get("expires_in", 0)))
-                    readable_str = new_time.strftime("%Y-%m-%d %H:%M:%S")
+                token = self.credential.token
+                with GCPAccess._cache_lock:
+                    known = token in GCPAccess._token_expiry
+                if not known:
+                    self._store_token_expiry(token, self._get_token_info(token))
+                with GCPAccess._cache_lock:
+                    expires_at = GCPAccess._token_expiry.get(token)
+
+                if expires_at is not None and expires_at > datetime.now():
+                    readable_str = expires_at.strftime("%Y-%m-%d %H:%M:%S")
                     return False, readable_str
                 else:
                     return True, None
@@ -230,14 +266,68 @@ class GCPAccess():
 
             data.append(credential_to_saved)
             
-            with open(GCP_CREDS_FILE, 'w') as file:
-                json.dump(data, file)
+            self._write_credentials(data)
+            self.invalidate_cache()
 
         except ValueError as e:
             raise e
     
+    @staticmethod
+    def _file_state() -> Optional[Tuple[int, int]]:
+        """Returns the modification time and size of the credentials file, or None if it does not exist"""
+        try:
+            stat = os.stat(GCP_CREDS_FILE)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    @classmethod
+    def invalidate_cache(cls) -> None:
+        """Drops cached credentials, live credential objects and token expirations"""
+        with cls._cache_lock:
+            cls._credentials_cache = None
+            cls._decoded_credentials = {}
+            cls._live_credentials = {}
+            cls._token_expiry = {}
+
+    @classmethod
+    def _write_credentials(cls, data: List[Dict[str, Any]]) -> None:
+        """Writes the credentials file"""
+        with cls._cache_lock:
+            with open(GCP_CREDS_FILE, 'w') as file:
+                json.dump(data, file)
+            cls._credentials_cache = None
+
+    @classmethod
+    def _decode_credential(cls, encoded_credential: str) -> Any:
+        """Returns a copy of a base64 encoded credential, decoding it once"""
+        with cls._cache_lock:
+            if encoded_credential not in cls._decoded_credentials:
+                cls._decoded_credentials[encoded_credential] = json.loads(base64.b64decode(encoded_credential).decode("utf-8"))
+            return copy.deepcopy(cls._decoded_credentials[encoded_credential])
+
+    @classmethod
+    def _store_token_expiry(cls, token: str, token_response: 'TokenInfoResponse') -> None:
+        """Records the expiration of a short-lived token from a tokeninfo response. Failed lookups are retried, rejected tokens are not"""
+        if token_response.success:
+            expires_at = datetime.now() + timedelta(seconds=float(token_response.data.get("expires_in", 0)))
+        elif token_response.status_code is not None:
+            expires_at = None
+        else:
+            return
+        with cls._cache_lock:
+            cls._token_expiry[token] = expires_at
+
     def list_credentials(self):
         """List all credentials"""
+        state = self._file_state()
+        with GCPAccess._cache_lock:
+            if GCPAccess._credentials_cache is None or GCPAccess._credentials_cache[0] != state:
+                GCPAccess._credentials_cache = (state, self._load_credentials())
+            return copy.deepcopy(GCPAccess._credentials_cache[1])
+
+    def _load_credentials(self):
+        """Reads all credentials from the credentials file"""
         try :
             if os.path.exists(GCP_CREDS_FILE):
                 with open(GCP_CREDS_FILE, "r") as file:
@@ -260,8 +350,8 @@ class GCPAccess():
         for credential in credentials:
             if credential["current"] == False:
                 filtered_credentials.append(credential)
-        with open(GCP_CREDS_FILE, 'w') as file:
-            json.dump(filtered_credentials, file)
+        self._write_credentials(filtered_credentials)
+        self.invalidate_cache()
           
             
     
@@ -272,27 +362,21 @@ class GCPAccess():
             return None
         for credential in credentials:
             if credential["current"] == True:
-                decoded_cred = base64.b64decode(credential["credential"]).decode("utf-8")
-                cred_dict = json.loads(decoded_cred)
-                if credential["type"] == "service_account_private_key":
-                    self.credential = ServiceAccountCredentials.from_service_account_info(
-                        cred_dict,
-                        scopes=["https://www.googleapis.com/auth/cloud-platform"]
-                    )
-                elif credential["type"] in ["adc", "regular"]:
-                    self.credential = UserAccountCredentials.from_authorized_user_info(
-                        cred_dict,
-                        scopes=["https://www.googleapis.com/auth/cloud-platform"]
-                    )
-                elif credential["type"] == "short_lived_token":
+                cred_dict = self._decode_credential(credential["credential"])
+                if credential["type"] == "short_lived_token":
                     # Handle double-wrapped JSON (to_json() returns string, then json.dumps wraps it again)
                     if isinstance(cred_dict, str):
                         cred_dict = json.loads(cred_dict)
-                    token = cred_dict.get("token")
-                    scopes = cred_dict.get("scopes", ["https://www.googleapis.com/auth/cloud-platform"])
-                    self.credential = ShortLivedTokenCredentials(token=token, scopes=scopes)
-                else:
-                    self.credential = cred_dict
+
+                # Reuse the credential object, and with it its access token, of earlier calls
+                key = (credential["name"], credential["type"], credential["credential"])
+                with GCPAccess._cache_lock:
+                    live_credential = GCPAccess._live_credentials.get(key)
+                if live_credential is None:
+                    live_credential = self._create_credential(credential["type"], copy.deepcopy(cred_dict))
+                    with GCPAccess._cache_lock:
+                        live_credential = GCPAccess._live_credentials.setdefault(key, live_credential)
+                self.credential = live_credential
                 self.credential_type = credential["type"]
                 self.credential_name = credential["name"]
                 return {
@@ -304,6 +388,25 @@ class GCPAccess():
         return None
         
     
+    @staticmethod
+    def _create_credential(credential_type: str, cred_dict: Any) -> Any:
+        """Creates the google.auth credential of a saved credential"""
+        if credential_type == "service_account_private_key":
+            return ServiceAccountCredentials.from_service_account_info(
+                cred_dict,
+                scopes=["https://www.googleapis.com/auth/cloud-platform"]
+            )
+        elif credential_type in ["adc", "regular"]:
+            return UserAccountCredentials.from_authorized_user_info(
+                cred_dict,
+                scopes=["https://www.googleapis.com/auth/cloud-platform"]
+            )
+        elif credential_type == "short_lived_token":
+            token = cred_dict.get("token")
+            scopes = cred_dict.get("scopes", ["https://www.googleapis.com/auth/cloud-platform"])
+            return ShortLivedTokenCredentials(token=token, scopes=scopes)
+        return cred_dict
+
     def set_deactivate_current_credentials(self):
         """Deactivate current credential"""
         credentials = self.list_credentials()
@@ -311,8 +414,7 @@ class GCPAccess():
             if credential["current"] == True:
                 credential["current"] = False
             
-        with open(GCP_CREDS_FILE, 'w') as file:
-            json.dump(credentials, file)
+        self._write_credentials(credentials)
           
     def set_activate_credentials(self, name):
         """Set the credential to activate"""
@@ -321,8 +423,7 @@ class GCPAccess():
         for credential in credentials:
             if credential["name"] == name:
                 credential["current"] = True
-                with open(GCP_CREDS_FILE, 'w') as file:
-                    json.dump(credentials, file)
+                self._write_credentials(credentials)
                 break
         else:
             raise ValueError("Credential not found")
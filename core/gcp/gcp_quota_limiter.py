@@ -0,0 +1,156 @@
+import time
+import random
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+from google.api_core.exceptions import Forbidden, ServiceUnavailable, TooManyRequests
+
+class _QuotaBucket:
+    """Request schedule and counters of one project and API"""
+    def __init__(self, rate: float) -> None:
+        self.rate = rate
+        # Theoretical arrival time of the next request (GCRA)
+        self.tat = 0.0
+        self.counters = {"requests": 0, "throttled": 0, "retries": 0, "failed": 0, "wait_seconds": 0.0}
+
+class GCPQuotaLimiter:
+    """
+    Process-wide token-bucket limiter for Google Cloud API requests.
+
+    Google Cloud enforces request quotas per project and API (e.g. Compute Engine read
+    requests per minute), so a bucket is kept for every (project, api) pair and shared by all
+    techniques in the process. call() waits for a request slot of the bucket before running
+    the request. Quota errors (ResourceExhausted / 429, or 403 with a rate limit or quota
+    reason as returned by Compute Engine) and unavailable responses halve the rate of the bucket and pause it with exponential backoff before the request is retried,
+    and successful requests slowly restore the rate.
+
+    Example:
+        limiter = GCPQuotaLimiter.get_instance()
+        zones = limiter.call((project_id, "compute"), zones_client.list, project=project_id)
+    """
+    DEFAULT_REQUESTS_PER_SECOND = 20
+    # Number of requests a bucket may send at once after being idle
+    DEFAULT_BURST = 10
+    MIN_REQUESTS_PER_SECOND = 1
+    # Requests per second restored on every successful request
+    RECOVERY_STEP = 0.1
+    MAX_RETRIES = 5
+    BASE_BACKOFF = 1
+    MAX_BACKOFF = 60
+    RETRY_EXCEPTIONS = (TooManyRequests, ServiceUnavailable)
+    # Reasons of 403 errors caused by quotas rather than missing permissions
+    FORBIDDEN_QUOTA_REASONS = {"rateLimitExceeded", "userRateLimitExceeded", "quotaExceeded", "dailyLimitExceeded"}
+
+    _instance: Optional['GCPQuotaLimiter'] = None  # Class variable to store the shared limiter
+    _instance_lock = threading.Lock()
+
+    def __init__(self, requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND, burst: int = DEFAULT_BURST):
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._buckets: Dict[Tuple[str, str], _QuotaBucket] = {}
+
+    @classmethod
+    def get_instance(cls) -> 'GCPQuotaLimiter':
+        """Returns the process-wide GCP quota limiter, creating it on first use"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def _bucket(self, key: Tuple[str, str]) -> _QuotaBucket:
+        """Returns the bucket of a key, creating it on first use. Called with lock held"""
+        if key not in self._buckets:
+            self._buckets[key] = _QuotaBucket(self.requests_per_second)
+        return self._buckets[key]
+
+    def reserve(self, key: Tuple[str, str]) -> float:
+        """
+        Reserves the next request slot of a bucket.
+
+        Args:
+            key: (project id, api name), e.g. ("my-project", "compute")
+
+        Returns:
+            float: Seconds the caller must wait before sending the request.
+        """
+        with self._lock:
+            bucket = self._bucket(key)
+            now = time.monotonic()
+            interval = 1.0 / bucket.rate
+            start = max(now, bucket.tat - (self.burst - 1) * interval)
+            bucket.tat = max(bucket.tat, now) + interval
+            bucket.counters["requests"] += 1
+            bucket.counters["wait_seconds"] += start - now
+            return start - now
+
+    @classmethod
+    def _is_quota_error(cls, error: Exception) -> bool:
+        """Checks if an error is caused by a quota, as opposed to e.g. a missing permission"""
+        if isinstance(error, cls.RETRY_EXCEPTIONS):
+            return True
+        if not isinstance(error, Forbidden):
+            return False
+        reasons = {getattr(error, "reason", None)}
+        for detail in getattr(error, "errors", None) or []:
+            reasons.add(detail.get("reason") if isinstance(detail, dict) else getattr(detail, "reason", None))
+        if reasons & cls.FORBIDDEN_QUOTA_REASONS:
+            return True
+        # Some clients only include the reason in the message
+        return any(reason in str(error) for reason in cls.FORBIDDEN_QUOTA_REASONS)
+
+    def call(self, key: Tuple[str, str], func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Runs a request within the quota of a project and API, retrying quota errors.
+
+        Args:
+            key: (project id, api name), e.g. ("my-project", "compute")
+            func: Function sending the request
+            *args, **kwargs: Arguments of func
+
+        Returns:
+            Any: Return value of func
+
+        Raises:
+            Exception: Error raised by func, after MAX_RETRIES retries for quota errors. Other
+                errors, including 403 permission errors, are raised unchanged
+        """
+        attempt = 0
+        while True:
+            time.sleep(self.reserve(key))
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                if not self._is_quota_error(e):
+                    raise
+                delay = min(self.MAX_BACKOFF, self.BASE_BACKOFF * 2 ** attempt) * random.uniform(0.5, 1.0)
+                with self._lock:
+                    bucket = self._bucket(key)
+                    bucket.counters["throttled"] += 1
+                    bucket.rate = max(self.MIN_REQUESTS_PER_SECOND, bucket.rate / 2)
+                    # Pause the bucket, without a burst afterwards
+                    bucket.tat = max(bucket.tat, time.monotonic() + delay + (self.burst - 1) / bucket.rate)
+                    retry = attempt < self.MAX_RETRIES
+                    bucket.counters["retries" if retry else "failed"] += 1
+                if not retry:
+                    raise
+                print(f"Quota exceeded for {key[1]} in project {key[0]}. Retrying after {delay:.1f} seconds.")
+                attempt += 1
+                continue
+
+            with self._lock:
+                bucket = self._bucket(key)
+                bucket.rate = min(self.requests_per_second, bucket.rate + self.RECOVERY_STEP)
+            return result
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the request counters and current rate of every bucket.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Counters keyed by '<project>/<api>'
+        """
+        with self._lock:
+            return {
+                f"{project}/{api}": dict(bucket.counters, wait_seconds=round(bucket.counters["wait_seconds"], 2), requests_per_second=round(bucket.rate, 2))
+                for (project, api), bucket in self._buckets.items()
+            }
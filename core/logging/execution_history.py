@@ -0,0 +1,261 @@
+import os
+import json
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from core.Constants import APP_LOG_FILE, EXECUTION_HISTORY_DIR
+from core.logging.log_reader import AppLogReader
+
+# Schema of a completed technique execution row
+EXECUTION_SCHEMA = pa.schema([
+    ('event_id', pa.string()),
+    ('technique', pa.string()),
+    ('tactic', pa.string()),
+    ('source', pa.string()),
+    ('result', pa.string()),
+    ('target', pa.string()),
+    ('playbook', pa.string()),
+    ('step_number', pa.int64()),
+    ('start_time', pa.timestamp('ms')),
+    ('end_time', pa.timestamp('ms')),
+])
+
+# Partitions are named day=YYYY-MM-DD after the execution completion date
+PARTITIONING = ds.partitioning(pa.schema([('day', pa.string())]), flavor='hive')
+PARTITION_FILE_NAME = "executions.parquet"
+# Ingestion watermark. Files starting with '_' or '.' are ignored by dataset discovery
+SYNC_STATE_FILE_NAME = "_sync_state.json"
+
+class ExecutionHistoryStore:
+    """
+    Persisted columnar store of completed technique executions.
+
+    Executions are ingested from the app log through the shared AppLogReader and written
+    to one Parquet file per day under the history directory. Queries prune day partitions
+    and filter rows with vectorized Arrow expressions, so history outlives app log rotation
+    and date range filtering does not depend on the number of days stored.
+
+    The log time of the newest ingested execution is persisted next to the partitions, so
+    executions already stored by an earlier process are skipped instead of being merged
+    into their partitions again after a restart.
+
+    Attributes:
+        history_dir (str): Directory holding the day partitions.
+    """
+    _instances: Dict[str, 'ExecutionHistoryStore'] = {}  # Class variable to store shared stores
+    _instances_lock = threading.Lock()
+
+    def __init__(self, history_dir: str = EXECUTION_HISTORY_DIR, log_file: str = APP_LOG_FILE) -> None:
+        self.history_dir = history_dir
+        self._reader = AppLogReader.get_instance(log_file)
+        self._lock = threading.RLock()
+        self._position = 0
+        self._open_executions: Dict[str, Dict[str, Any]] = {}
+        os.makedirs(history_dir, exist_ok=True)
+
+    @classmethod
+    def get_instance(cls, history_dir: str = EXECUTION_HISTORY_DIR, log_file: str = APP_LOG_FILE) -> 'ExecutionHistoryStore':
+        """Returns the process-wide store for a history directory, creating it on first use"""
+        key = os.path.abspath(history_dir)
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(history_dir, log_file)
+            return cls._instances[key]
+
+    @staticmethod
+    def _parse_log_time(value: Optional[str]) -> Optional[datetime]:
+        try:
+            return datetime.strptime(value, "%Y-%m-%d %H:%M:%S")
+        except (TypeError, ValueError):
+            return None
+
+    def _to_row(self, start_event: Optional[Dict[str, Any]], end_event: Dict[str, Any]) -> Dict[str, Any]:
+        """Combines the started and completed log events of an execution into a single row"""
+        first_event = start_event or end_event
+        end_time = self._parse_log_time(end_event.get('log_timestamp'))
+        start_time = self._parse_log_time(first_event.get('log_timestamp')) or end_time
+        step_number = first_event.get('step_number')
+        return {
+            'event_id': end_event['event_id'],
+            'technique': first_event.get('technique'),
+            'tactic': first_event.get('tactic'),
+            'source': first_event.get('source'),
+            'result': end_event.get('result'),
+            'target': None if end_event.get('target') is None else str(end_event.get('target')),
+            'playbook': first_event.get('playbook'),
+            'step_number': int(step_number) if step_number is not None else None,
+            'start_time': start_time,
+            'end_time': end_time,
+        }
+
+    def _partition_path(self, day: str) -> str:
+        return os.path.join(self.history_dir, f"day={day}", PARTITION_FILE_NAME)
+
+    @staticmethod
+    def _temp_path(path: str) -> str:
+        """Returns a hidden temporary file name next to path, unique to the process and thread"""
+        directory, file_name = os.path.split(path)
+        return os.path.join(directory, f".{file_name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+    def _load_sync_state(self) -> Dict[str, Any]:
+        """
+        Returns the ingestion watermark - log time of the newest ingested execution ('last_time')
+        and the event IDs completed at that time ('last_event_ids')
+        """
+        try:
+            with open(os.path.join(self.history_dir, SYNC_STATE_FILE_NAME), 'r') as f:
+                state = json.load(f)
+            return {'last_time': state.get('last_time'), 'last_event_ids': set(state.get('last_event_ids', []))}
+        except (OSError, ValueError):
+            return {'last_time': None, 'last_event_ids': set()}
+
+    def _save_sync_state(self, state: Dict[str, Any]) -> None:
+        state_path = os.path.join(self.history_dir, SYNC_STATE_FILE_NAME)
+        temp_path = self._temp_path(state_path)
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump({'last_time': state['last_time'], 'last_event_ids': sorted(state['last_event_ids'])}, f)
+            os.replace(temp_path, state_path)
+        except OSError as e:
+            print(f"Error saving execution history state: {str(e)}")
+
+    @staticmethod
+    def _is_ingested(event: Dict[str, Any], state: Dict[str, Any]) -> bool:
+        """Checks if a completion event is at or before the ingestion watermark"""
+        log_time = event.get('log_timestamp')
+        if state['last_time'] is None or log_time is None:
+            return False
+        return log_time < state['last_time'] or (log_time == state['last_time'] and event['event_id'] in state['last_event_ids'])
+
+    @staticmethod
+    def _advance_sync_state(event: Dict[str, Any], state: Dict[str, Any]) -> None:
+        """Moves the ingestion watermark to a newly ingested completion event"""
+        log_time = event.get('log_timestamp')
+        if log_time is None:
+            return
+        if state['last_time'] is None or log_time > state['last_time']:
+            state['last_time'] = log_time
+            state['last_event_ids'] = {event['event_id']}
+        elif log_time == state['last_time']:
+            state['last_event_ids'].add(event['event_id'])
+
+    def _write(self, rows: List[Dict[str, Any]]) -> None:
+        """Merges new rows into their day partitions. Re-ingested executions replace existing rows"""
+        rows_by_day: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            if row['end_time'] is None:
+                continue
+            rows_by_day.setdefault(row['end_time'].strftime("%Y-%m-%d"), []).append(row)
+
+        for day, day_rows in rows_by_day.items():
+            partition_path = self._partition_path(day)
+            os.makedirs(os.path.dirname(partition_path), exist_ok=True)
+
+            new_table = pa.Table.from_pylist(day_rows, schema=EXECUTION_SCHEMA)
+            if os.path.exists(partition_path):
+                existing = pq.read_table(partition_path, schema=EXECUTION_SCHEMA).to_pandas()
+                merged = pd.concat([existing, new_table.to_pandas()], ignore_index=True)
+                merged = merged.drop_duplicates(subset='event_id', keep='last')
+                new_table = pa.Table.from_pandas(merged, schema=EXECUTION_SCHEMA, preserve_index=False)
+
+            # Write to a temporary file and swap in, so readers never see a partial partition
+            temp_path = self._temp_path(partition_path)
+            pq.write_table(new_table, temp_path)
+            os.replace(temp_path, partition_path)
+
+    def sync(self) -> int:
+        """
+        Ingests technique executions completed since the last sync from the app log.
+
+        Executions at or before the persisted ingestion watermark were stored by an earlier
+        sync, possibly of another process, and are skipped.
+
+        Returns:
+            int: Number of executions written to the store.
+        """
+        with self._lock:
+            events, self._position = self._reader.read_new_events(self._position)
+            state = self._load_sync_state()
+            rows = []
+            for event in events:
+                event_id = event.get('event_id')
+                if not event_id:
+                    continue
+                if event.get('status') == 'started':
+                    self._open_executions[event_id] = event
+                elif event.get('status') in ['completed', 'failed']:
+                    start_event = self._open_executions.pop(event_id, None)
+                    if self._is_ingested(event, state):
+                        continue
+                    rows.append(self._to_row(start_event, event))
+                    self._advance_sync_state(event, state)
+
+            if rows:
+                self._write(rows)
+                self._save_sync_state(state)
+            return len(rows)
+
+    def query(self,
+              start_date: Optional[Any] = None,
+              end_date: Optional[Any] = None,
+              tactics: Optional[List[str]] = None,
+              sources: Optional[List[str]] = None,
+              results: Optional[List[str]] = None,
+              techniques: Optional[List[str]] = None,
+              columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Returns completed executions matching the filters, after syncing new executions from the app log.
+
+        Args:
+            start_date: Only executions completed at or after this time (anything pd.to_datetime accepts).
+            end_date: Only executions completed at or before this time.
+            tactics: Only executions of these MITRE tactics.
+            sources: Only executions by these source entities.
+            results: Only executions with these results ('success', 'failed').
+            techniques: Only executions of these technique IDs.
+            columns: Columns to return. Defaults to all columns of EXECUTION_SCHEMA.
+
+        Returns:
+            pd.DataFrame: Matching executions, one row per event ID.
+        """
+        self.sync()
+        columns = columns or EXECUTION_SCHEMA.names
+
+        if not any(name.startswith("day=") for name in os.listdir(self.history_dir)):
+            return pa.Table.from_pylist([], schema=EXECUTION_SCHEMA).select(columns).to_pandas()
+
+        expression = None
+        def add_filter(condition):
+            nonlocal expression
+            expression = condition if expression is None else expression & condition
+
+        if start_date is not None:
+            start = pd.to_datetime(start_date)
+            add_filter(ds.field('day') >= start.strftime("%Y-%m-%d"))
+            add_filter(ds.field('end_time') >= pa.scalar(start.to_pydatetime(), type=pa.timestamp('ms')))
+        if end_date is not None:
+            end = pd.to_datetime(end_date)
+            add_filter(ds.field('day') <= end.strftime("%Y-%m-%d"))
+            add_filter(ds.field('end_time') <= pa.scalar(end.to_pydatetime(), type=pa.timestamp('ms')))
+        if tactics:
+            add_filter(ds.field('tactic').isin(tactics))
+        if sources:
+            add_filter(ds.field('source').isin(sources))
+        if results:
+            add_filter(ds.field('result').isin(results))
+        if techniques:
+            add_filter(ds.field('technique').isin(techniques))
+
+        with self._lock:
+            dataset = ds.dataset(
+                self.history_dir,
+                schema=EXECUTION_SCHEMA.append(pa.field('day', pa.string())),
+                format='parquet',
+                partitioning=PARTITIONING
+            )
+            table = dataset.to_table(columns=columns, filter=expression)
+        return table.to_pandas()
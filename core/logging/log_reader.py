@@ -0,0 +1,183 @@
+import os
+import json
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+import pandas as pd
+from core.Constants import APP_LOG_FILE
+
+TECHNIQUE_EXECUTION_MARKER = " - INFO - Technique Execution "
+
+def parse_technique_execution_line(line: str) -> Optional[Dict[str, Any]]:
+    """
+    Parses a 'Technique Execution' line of the app log.
+
+    Args:
+        line (str): A single line of the app log.
+
+    Returns:
+        Optional[Dict[str, Any]]: The structured event data with the log record time added
+        as 'log_timestamp' (YYYY-MM-DD HH:MM:SS), or None if the line is not a technique execution log.
+    """
+    if TECHNIQUE_EXECUTION_MARKER not in line:
+        return None
+    try:
+        prefix, log_data = line.split(TECHNIQUE_EXECUTION_MARKER, 1)
+        event = json.loads(log_data)
+    except (ValueError, json.JSONDecodeError):
+        return None
+    if not isinstance(event, dict):
+        return None
+    event['log_timestamp'] = prefix.split(' - ')[0].split(',')[0]
+    return event
+
+class AppLogReader:
+    """
+    Incrementally reads technique execution events from the app log.
+
+    The reader remembers the inode and byte offset of the log file it has consumed,
+    so each refresh only parses lines appended since the previous refresh. Rotated
+    backups created by RotatingFileHandler (app.log.1, app.log.2, ...) are read on the
+    first load and followed when the active log file is rolled over.
+
+    Attributes:
+        log_file (str): Path to the active app log file.
+    """
+    _instances: Dict[str, 'AppLogReader'] = {}  # Class variable to store shared readers
+    _instances_lock = threading.Lock()
+
+    def __init__(self, log_file: str = APP_LOG_FILE) -> None:
+        self.log_file = log_file
+        self._lock = threading.RLock()
+        self._inode: Optional[int] = None
+        self._offset: int = 0
+        self._events: List[Dict[str, Any]] = []
+        self._frame: Optional[pd.DataFrame] = None
+        self._frame_rows: int = 0
+
+    @classmethod
+    def get_instance(cls, log_file: str = APP_LOG_FILE) -> 'AppLogReader':
+        """Returns the process-wide reader for a log file, creating it on first use"""
+        key = os.path.abspath(log_file)
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(log_file)
+            return cls._instances[key]
+
+    def _backup_files(self) -> List[str]:
+        """Returns existing rotated backups of the log file, newest first"""
+        backups = []
+        index = 1
+        while os.path.exists(f"{self.log_file}.{index}"):
+            backups.append(f"{self.log_file}.{index}")
+            index += 1
+        return backups
+
+    def _read_from(self, file_path: str, offset: int) -> int:
+        """Parses complete lines of a file starting at offset. Returns the offset after the last complete line"""
+        try:
+            with open(file_path, 'rb') as f:
+                f.seek(offset)
+                chunk = f.read()
+        except FileNotFoundError:
+            return offset
+
+        # Leave a partially written last line for the next refresh
+        end = chunk.rfind(b'\n')
+        if end == -1:
+            return offset
+        for line in chunk[:end].decode('utf-8', errors='replace').split('\n'):
+            event = parse_technique_execution_line(line)
+            if event is not None:
+                self._events.append(event)
+        return offset + end + 1
+
+    def _locate_previous_file(self, backups: List[str]) -> Tuple[Optional[int], Optional[str]]:
+        """Finds the backup that the previously tracked log file was rotated to"""
+        for index, backup in enumerate(backups):
+            try:
+                if os.stat(backup).st_ino == self._inode:
+                    return index, backup
+            except FileNotFoundError:
+                continue
+        return None, None
+
+    def refresh(self) -> int:
+        """
+        Parses log lines appended since the last refresh.
+
+        Returns:
+            int: Number of new technique execution events.
+        """
+        with self._lock:
+            events_before = len(self._events)
+            try:
+                stat = os.stat(self.log_file)
+            except FileNotFoundError:
+                return 0
+
+            if self._inode is None:
+                # First load - read rotated backups oldest first
+                for backup in reversed(self._backup_files()):
+                    self._read_from(backup, 0)
+                self._offset = 0
+            elif stat.st_ino != self._inode:
+                # Log file was rotated - finish the previous file, then any backups rotated after it
+                backups = self._backup_files()
+                index, previous_file = self._locate_previous_file(backups)
+                if previous_file is not None:
+                    self._read_from(previous_file, self._offset)
+                    for backup in reversed(backups[:index]):
+                        self._read_from(backup, 0)
+                self._offset = 0
+            elif stat.st_size < self._offset:
+                # Log file was truncated
+                self._offset = 0
+
+            self._inode = stat.st_ino
+            self._offset = self._read_from(self.log_file, self._offset)
+            return len(self._events) - events_before
+
+    def get_events(self) -> List[Dict[str, Any]]:
+        """
+        Returns all technique execution events in log order, after refreshing from the log.
+
+        The returned dictionaries are copies and can be modified by the caller.
+        """
+        with self._lock:
+            self.refresh()
+            return [dict(event) for event in self._events]
+
+    def read_new_events(self, position: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Returns events after a position in the event list, after refreshing from the log.
+
+        Args:
+            position (int): Number of events the caller has already consumed.
+
+        Returns:
+            Tuple[List[Dict[str, Any]], int]: Copies of the new events and the position to pass on the next call.
+        """
+        with self._lock:
+            self.refresh()
+            return [dict(event) for event in self._events[position:]], len(self._events)
+
+    def get_dataframe(self) -> pd.DataFrame:
+        """
+        Returns all technique execution events as a DataFrame, after refreshing from the log.
+
+        Only events added since the previous call are converted and appended to the cached
+        frame. 'log_timestamp' is returned as a datetime column. Callers must not modify
+        the returned frame in place.
+        """
+        with self._lock:
+            self.refresh()
+            if self._frame is None or self._frame_rows < len(self._events):
+                new_rows = pd.DataFrame(self._events[self._frame_rows:])
+                if 'log_timestamp' in new_rows:
+                    new_rows['log_timestamp'] = pd.to_datetime(new_rows['log_timestamp'])
+                if self._frame is None or self._frame.empty:
+                    self._frame = new_rows
+                else:
+                    self._frame = pd.concat([self._frame, new_rows], ignore_index=True)
+                self._frame_rows = len(self._events)
+            return self._frame
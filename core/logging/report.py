@@ -17,12 +17,19 @@ def read_log_file(file_path):
 
 def analyze_log(log_lines):
     """Function to analyze app logs to generate metrics"""
+    return analyze_events(entry for entry in map(parse_log_entry, log_lines) if entry)
+
+def analyze_execution_history(df):
+    """Function to analyze completed executions from the execution history store to generate metrics"""
+    events = df.assign(timestamp=df['end_time'].map(lambda t: t.isoformat())).to_dict('records')
+    return analyze_events(events)
+
+def analyze_events(events):
+    """Function to analyze parsed technique execution events to generate metrics"""
     executions = defaultdict(dict)
-    for line in log_lines:
-        entry = parse_log_entry(line)
-        if entry:
-            event_id = entry['event_id']
-            executions[event_id].update(entry)
+    for entry in events:
+        event_id = entry['event_id']
+        executions[event_id].update(entry)
 
     completed_executions = [ex for ex in executions.values() if 'result' in ex]
 
@@ -0,0 +1,249 @@
+import os
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Optional, Dict, List
+
+class EventIndexBackend(ABC):
+    """Storage backend for the technique output event index"""
+
+    @abstractmethod
+    def add(self, event_id: str, technique: str, timestamp: str, filepath: str, cache_key: Optional[str] = None) -> None:
+        """Adds or replaces a single event entry in the index. Entries with a cache key can be reused by find_cached"""
+        pass
+
+    @abstractmethod
+    def get(self, event_id: str) -> Optional[Dict[str, Any]]:
+        """Returns the index entry for an event ID, None if not indexed"""
+        pass
+
+    @abstractmethod
+    def query(self,
+              technique_name: Optional[str] = None,
+              start_date: Optional[str] = None,
+              end_date: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Returns matching index entries, newest first"""
+        pass
+
+    @abstractmethod
+    def find_cached(self, cache_key: str, start_date: str) -> Optional[Dict[str, Any]]:
+        """Returns the newest entry with a cache key stored at or after start_date (ISO format), None if there is none"""
+        pass
+
+    def add_many(self, entries: List[Dict[str, Any]]) -> None:
+        """Adds multiple event entries. Backends can override this to write in a single transaction"""
+        for entry in entries:
+            self.add(entry["event_id"], entry["technique"], entry["timestamp"], entry["filepath"], entry.get("cache_key"))
+
+    def close(self) -> None:
+        """Releases any resources held by the backend"""
+        pass
+
+class JsonEventIndex(EventIndexBackend):
+    """Legacy event index kept in a single JSON file. Rewrites the whole file on every change"""
+
+    def __init__(self, index_file: str):
+        self.index_file = index_file
+        self._lock = threading.Lock()
+        self.event_index = load_json_event_index(index_file)
+
+    def _save(self) -> None:
+        try:
+            with open(self.index_file, 'w') as f:
+                json.dump(self.event_index, f, indent=2)
+        except Exception as e:
+            print(f"Error saving event index: {str(e)}")
+
+    def add(self, event_id: str, technique: str, timestamp: str, filepath: str, cache_key: Optional[str] = None) -> None:
+        with self._lock:
+            self.event_index[event_id] = {
+                "technique": technique,
+                "timestamp": timestamp,
+                "filepath": filepath
+            }
+            if cache_key:
+                self.event_index[event_id]["cache_key"] = cache_key
+            self._save()
+
+    def add_many(self, entries: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            for entry in entries:
+                self.event_index[entry["event_id"]] = {
+                    "technique": entry["technique"],
+                    "timestamp": entry["timestamp"],
+                    "filepath": entry["filepath"]
+                }
+                if entry.get("cache_key"):
+                    self.event_index[entry["event_id"]]["cache_key"] = entry["cache_key"]
+            self._save()
+
+    def get(self, event_id: str) -> Optional[Dict[str, Any]]:
+        metadata = self.event_index.get(event_id)
+        return {"event_id": event_id, **metadata} if metadata else None
+
+    def query(self,
+              technique_name: Optional[str] = None,
+              start_date: Optional[str] = None,
+              end_date: Optional[str] = None) -> List[Dict[str, Any]]:
+        events = []
+        for event_id, metadata in list(self.event_index.items()):
+            if technique_name and metadata["technique"] != technique_name:
+                continue
+            if start_date and metadata["timestamp"] < start_date:
+                continue
+            if end_date and metadata["timestamp"] > end_date:
+                continue
+            events.append({"event_id": event_id, **metadata})
+
+        return sorted(events, key=lambda x: x["timestamp"], reverse=True)
+
+    def find_cached(self, cache_key: str, start_date: str) -> Optional[Dict[str, Any]]:
+        matches = [
+            {"event_id": event_id, **metadata}
+            for event_id, metadata in list(self.event_index.items())
+            if metadata.get("cache_key") == cache_key and metadata["timestamp"] >= start_date
+        ]
+        if not matches:
+            return None
+        newest = max(matches, key=lambda x: x["timestamp"])
+        return {key: newest[key] for key in ["event_id", "technique", "timestamp", "filepath"]}
+
+class SQLiteEventIndex(EventIndexBackend):
+    """
+    Event index stored in a SQLite database in WAL mode.
+
+    Each stored output is a single-row insert, and lookups by event ID, technique
+    and timestamp are served from indexes instead of a full scan of the index.
+    """
+
+    def __init__(self, db_file: str):
+        self.db_file = db_file
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_file, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS events (
+                event_id TEXT PRIMARY KEY,
+                technique TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                filepath TEXT NOT NULL,
+                cache_key TEXT
+            );
+        """)
+        # Indexes created before step result caching have no cache_key column
+        columns = [row["name"] for row in self._conn.execute("PRAGMA table_info(events)")]
+        if "cache_key" not in columns:
+            self._conn.execute("ALTER TABLE events ADD COLUMN cache_key TEXT")
+        self._conn.executescript("""
+            CREATE INDEX IF NOT EXISTS idx_events_technique_timestamp ON events (technique, timestamp);
+            CREATE INDEX IF NOT EXISTS idx_events_timestamp ON events (timestamp);
+            CREATE INDEX IF NOT EXISTS idx_events_cache_key_timestamp ON events (cache_key, timestamp);
+        """)
+        self._conn.commit()
+
+    def add(self, event_id: str, technique: str, timestamp: str, filepath: str, cache_key: Optional[str] = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO events (event_id, technique, timestamp, filepath, cache_key) VALUES (?, ?, ?, ?, ?)",
+                (event_id, technique, timestamp, filepath, cache_key)
+            )
+            self._conn.commit()
+
+    def add_many(self, entries: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO events (event_id, technique, timestamp, filepath, cache_key) VALUES (?, ?, ?, ?, ?)",
+                [(e["event_id"], e["technique"], e["timestamp"], e["filepath"], e.get("cache_key")) for e in entries]
+            )
+            self._conn.commit()
+
+    def get(self, event_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT event_id, technique, timestamp, filepath FROM events WHERE event_id = ?",
+                (event_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def query(self,
+              technique_name: Optional[str] = None,
+              start_date: Optional[str] = None,
+              end_date: Optional[str] = None) -> List[Dict[str, Any]]:
+        clauses = []
+        params = []
+        if technique_name:
+            clauses.append("technique = ?")
+            params.append(technique_name)
+        if start_date:
+            clauses.append("timestamp >= ?")
+            params.append(start_date)
+        if end_date:
+            clauses.append("timestamp <= ?")
+            params.append(end_date)
+
+        sql = "SELECT event_id, technique, timestamp, filepath FROM events"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY timestamp DESC"
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def find_cached(self, cache_key: str, start_date: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT event_id, technique, timestamp, filepath FROM events WHERE cache_key = ? AND timestamp >= ? ORDER BY timestamp DESC LIMIT 1",
+                (cache_key, start_date)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+def load_json_event_index(index_file: str) -> Dict[str, Any]:
+    """Loads a legacy JSON event index file. Returns an empty index if the file is missing or unreadable"""
+    try:
+        if os.path.exists(index_file):
+            with open(index_file, 'r') as f:
+                return json.load(f)
+    except Exception as e:
+        print(f"Error loading event index, creating new: {str(e)}")
+    return {}
+
+def migrate_json_event_index(index_file: str, backend: EventIndexBackend) -> int:
+    """
+    One-shot migration of a legacy JSON event index into another index backend.
+
+    The JSON file is renamed to '<index_file>.migrated' once its entries are written,
+    so the migration does not run again.
+
+    Args:
+        index_file: Path to the legacy event_index.json file
+        backend: Index backend to migrate the entries into
+
+    Returns:
+        int: Number of migrated events
+    """
+    if not os.path.exists(index_file):
+        return 0
+
+    event_index = load_json_event_index(index_file)
+    entries = [
+        {
+            "event_id": event_id,
+            "technique": metadata.get("technique", ""),
+            "timestamp": metadata.get("timestamp", ""),
+            "filepath": metadata.get("filepath", "")
+        }
+        for event_id, metadata in event_index.items()
+    ]
+    if entries:
+        backend.add_many(entries)
+
+    os.replace(index_file, index_file + ".migrated")
+    return len(entries)
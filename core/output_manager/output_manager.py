@@ -1,45 +1,105 @@
 import os
 import json
 import uuid
-from datetime import datetime
-from typing import Any, Optional, Dict, List
+import atexit
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Optional, Dict, List, Iterable, Iterator
 from pathlib import Path
 from core.Constants import TECHNIQUE_OUTPUT_DIR
+from core.output_manager.event_index import JsonEventIndex, SQLiteEventIndex, migrate_json_event_index
 
 class OutputManager:
     """Manages technique output storage and retrieval with event tracking"""
+    _instances: Dict[str, 'OutputManager'] = {}  # Class variable to store shared output managers
+    _instances_lock = threading.Lock()
+
+    # Pending index entries are flushed when this many accumulate or after the flush interval (seconds)
+    FLUSH_BATCH_SIZE = 50
+    FLUSH_INTERVAL = 2.0
     
-    def __init__(self, base_output_dir: str = TECHNIQUE_OUTPUT_DIR):
+    def __init__(self, base_output_dir: str = TECHNIQUE_OUTPUT_DIR, index_backend: str = "sqlite"):
+        """
+        Args:
+            base_output_dir: Directory to store technique outputs and the event index in
+            index_backend: Event index backend to use - "sqlite" (default) or "json" (legacy)
+        """
         self.base_output_dir = base_output_dir
         self.event_index_file = os.path.join(base_output_dir, "event_index.json")
+        self.event_index_db_file = os.path.join(base_output_dir, "event_index.db")
+        self._write_lock = threading.RLock()
+        self._pending_events: Dict[str, Dict[str, Any]] = {}
+        self._flush_timer: Optional[threading.Timer] = None
         self._check_base_dir()
-        self._load_event_index()
+        self._load_event_index(index_backend)
+
+    @classmethod
+    def get_instance(cls, base_output_dir: str = TECHNIQUE_OUTPUT_DIR) -> 'OutputManager':
+        """
+        Returns the process-wide output manager for an output directory, creating it on first use.
+        
+        Playbook threads, the attack agent and UI callbacks should use this instead of
+        constructing a new OutputManager per execution, so that they share one index
+        and one write lock.
+        
+        Example:
+            output_manager = OutputManager.get_instance()
+        """
+        key = os.path.abspath(base_output_dir)
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(base_output_dir)
+            return cls._instances[key]
 
     def _check_base_dir(self) -> None:
         """Ensures base output directory exists"""
         os.makedirs(self.base_output_dir, exist_ok=True)
 
-    def _load_event_index(self) -> None:
-        """Loads or initializes the event index"""
-        try:
-            if os.path.exists(self.event_index_file):
-                with open(self.event_index_file, 'r') as f:
-                    self.event_index = json.load(f)
-            else:
-                self.event_index = {}
-        except Exception as e:
-            print(f"Error loading event index, creating new: {str(e)}")
-            self.event_index = {}
+    def _load_event_index(self, index_backend: str) -> None:
+        """Opens the event index backend, migrating a legacy JSON index if one is present"""
+        if index_backend == "json":
+            self.event_index = JsonEventIndex(self.event_index_file)
+        elif index_backend == "sqlite":
+            self.event_index = SQLiteEventIndex(self.event_index_db_file)
+            try:
+                migrate_json_event_index(self.event_index_file, self.event_index)
+            except Exception as e:
+                print(f"Error migrating event index: {str(e)}")
+        else:
+            raise ValueError(f"Invalid event index backend: {index_backend}. Must be one of ['sqlite', 'json']")
 
-    def _save_event_index(self) -> None:
-        """Saves the current event index"""
-        try:
-            with open(self.event_index_file, 'w') as f:
-                json.dump(self.event_index, f, indent=2)
-        except Exception as e:
-            print(f"Error saving event index: {str(e)}")
+    def _queue_event(self, event_id: str, technique_name: str, timestamp: str, filepath: str, cache_key: Optional[str] = None) -> None:
+        """Queues an index entry for the next batched flush"""
+        with self._write_lock:
+            self._pending_events[event_id] = {
+                "event_id": event_id,
+                "technique": technique_name,
+                "timestamp": timestamp,
+                "filepath": filepath,
+                "cache_key": cache_key
+            }
+            if len(self._pending_events) >= self.FLUSH_BATCH_SIZE:
+                self.flush()
+            elif self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.FLUSH_INTERVAL, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
 
-    def store_technique_output(self, data: Any, technique_name: str, event_id: Optional[str] = None) -> Optional[str]:
+    def flush(self) -> None:
+        """Writes all pending index entries to the event index backend"""
+        with self._write_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._pending_events:
+                return
+            try:
+                self.event_index.add_many(list(self._pending_events.values()))
+                self._pending_events.clear()
+            except Exception as e:
+                print(f"Error flushing event index: {str(e)}")
+
+    def store_technique_output(self, data: Any, technique_name: str, event_id: Optional[str] = None, cache_key: Optional[str] = None) -> Optional[str]:
         """
         Stores technique output data with event tracking.
         
@@ -47,12 +107,13 @@ class OutputManager:
             data: The data to store (can be string, list, dict, or nested combinations)
             technique_name: Name of the technique generating the output
             event_id: Optional event ID (generated if not provided)
+            cache_key: Optional key under which the output can be reused by get_cached_output
             
         Returns:
             str: Event ID if successful, None if failed
             
         Example:
-            output_manager = OutputManager()
+            output_manager = OutputManager.get_instance()
             event_id = output_manager.store_technique_output(
                 {"scan_results": ["finding1"]}, 
                 "AzureAssignRole"
@@ -85,12 +146,7 @@ class OutputManager:
                 json.dump(output_data, f, indent=2, default=str, ensure_ascii=False)
             
             # Update event index
-            self.event_index[event_id] = {
-                "technique": technique_name,
-                "timestamp": timestamp.isoformat(),
-                "filepath": str(file_path)
-            }
-            self._save_event_index()
+            self._queue_event(event_id, technique_name, timestamp.isoformat(), str(file_path), cache_key)
             
             return file_path
         
@@ -98,6 +154,30 @@ class OutputManager:
             print(f"Error storing technique output: {str(e)}")
             return None
 
+    def open_output_stream(self, technique_name: str, event_id: Optional[str] = None, cache_key: Optional[str] = None) -> 'TechniqueOutputStream':
+        """
+        Opens a stream writing technique output items to a JSON Lines file as they are produced.
+        
+        Use this instead of store_technique_output for enumeration outputs that should not be
+        held in memory. The event is indexed when the stream is closed and its output is read
+        back by get_output_by_event_id like any other output.
+        
+        Args:
+            technique_name: Name of the technique generating the output
+            event_id: Optional event ID (generated if not provided)
+            cache_key: Optional key under which the output can be reused by get_cached_output
+            
+        Returns:
+            TechniqueOutputStream: Open stream, to be used as a context manager
+            
+        Example:
+            output_manager = OutputManager.get_instance()
+            with output_manager.open_output_stream("M365ExfilUserMailbox") as output_stream:
+                for email in GraphRequest().iter_items(url):
+                    output_stream.write(email)
+        """
+        return TechniqueOutputStream(self, technique_name, event_id or str(uuid.uuid4()), cache_key)
+
     def get_output_by_event_id(self, event_id: str) -> Optional[Dict[str, Any]]:
         """
         Retrieves technique output data by event ID.
@@ -109,21 +189,61 @@ class OutputManager:
             The stored data if found, None if not found or error
             
         Example:
-            output_manager = OutputManager()
+            output_manager = OutputManager.get_instance()
             data = output_manager.get_output_by_event_id("1234-5678-90ab")
         """
         try:
-            if event_id not in self.event_index:
+            with self._write_lock:
+                event = self._pending_events.get(event_id)
+            if event is None:
+                event = self.event_index.get(event_id)
+            if event is None:
                 print(f"Event ID {event_id} not found")
                 return None
                 
-            filepath = self.event_index[event_id]["filepath"]
-            return self.read_technique_output(filepath)
+            return self.read_technique_output(event["filepath"])
             
         except Exception as e:
             print(f"Error retrieving output for event {event_id}: {str(e)}")
             return None
 
+    def get_cached_output(self, cache_key: str, max_age: float) -> Optional[Dict[str, Any]]:
+        """
+        Finds the newest output stored with a cache key that is not older than max_age.
+        
+        Args:
+            cache_key: Cache key the output was stored with
+            max_age: Maximum age of the output in seconds
+            
+        Returns:
+            The index entry of the cached output (event_id, technique, timestamp, filepath), None if there is no fresh output
+        """
+        start_date = (datetime.now() - timedelta(seconds=max_age)).isoformat()
+        try:
+            with self._write_lock:
+                pending = [
+                    event for event in self._pending_events.values()
+                    if event.get("cache_key") == cache_key and event["timestamp"] >= start_date
+                ]
+            if pending:
+                event = max(pending, key=lambda x: x["timestamp"])
+                return {key: event[key] for key in ["event_id", "technique", "timestamp", "filepath"]}
+            return self.event_index.find_cached(cache_key, start_date)
+        except Exception as e:
+            print(f"Error looking up cached output: {str(e)}")
+            return None
+
+    def add_output_reference(self, event_id: str, cached_event: Dict[str, Any]) -> None:
+        """
+        Indexes a new event ID against an already stored output file, so that the output of a
+        cached step execution can be retrieved by its own event ID.
+        
+        Args:
+            event_id: Event ID of the new execution
+            cached_event: Index entry of the reused output, as returned by get_cached_output
+        """
+        self._queue_event(event_id, cached_event["technique"], datetime.now().isoformat(), cached_event["filepath"])
+
     def list_events(self, 
                    technique_name: Optional[str] = None, 
                    start_date: Optional[str] = None, 
@@ -140,29 +260,18 @@ class OutputManager:
             List of matching events with their metadata
             
         Example:
-            output_manager = OutputManager()
+            output_manager = OutputManager.get_instance()
             events = output_manager.list_events(
                 technique_name="azure_scan_storage",
                 start_date="2024-01-01"
             )
         """
-        events = []
-        for event_id, metadata in self.event_index.items():
-            if technique_name and metadata["technique"] != technique_name:
-                continue
-                
-            if start_date and metadata["timestamp"] < start_date:
-                continue
-                
-            if end_date and metadata["timestamp"] > end_date:
-                continue
-                
-            events.append({
-                "event_id": event_id,
-                **metadata
-            })
-            
-        return sorted(events, key=lambda x: x["timestamp"], reverse=True)
+        self.flush()
+        return self.event_index.query(
+            technique_name=technique_name,
+            start_date=start_date,
+            end_date=end_date
+        )
 
     def read_technique_output(self, filepath: str) -> Optional[Dict[str, Any]]:
         """
@@ -175,8 +284,88 @@ class OutputManager:
             The stored data structure if successful, None if failed
         """
         try:
+            if str(filepath).endswith(".jsonl"):
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    output_data = json.loads(f.readline())
+                output_data["data"] = list(self.iter_technique_output(filepath))
+                return output_data
             with open(filepath, 'r', encoding='utf-8') as f:
                 return json.load(f)
         except Exception as e:
             print(f"Error reading technique output: {str(e)}")
-            return None
\ No newline at end of file
+            return None
+
+    def iter_technique_output(self, filepath: str) -> Iterator[Any]:
+        """
+        Yields the items of a streamed (JSON Lines) technique output one at a time.
+        
+        Args:
+            filepath: Path to the JSON Lines output file
+        """
+        with open(filepath, 'r', encoding='utf-8') as f:
+            # First line holds the event metadata
+            f.readline()
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+class TechniqueOutputStream:
+    """
+    Technique output written incrementally as JSON Lines.
+    
+    The first line holds the event metadata (event_id, technique, timestamp), every following
+    line one output item. The event is indexed when the stream is closed, also if the technique
+    failed part way, so that partially collected output is kept.
+    """
+    def __init__(self, output_manager: OutputManager, technique_name: str, event_id: str, cache_key: Optional[str] = None):
+        self.output_manager = output_manager
+        self.technique_name = technique_name
+        self.event_id = event_id
+        self.cache_key = cache_key
+        self.timestamp = datetime.now()
+        self.count = 0
+
+        output_path = Path(os.path.join(output_manager.base_output_dir, technique_name))
+        output_path.mkdir(parents=True, exist_ok=True)
+        self.file_path = output_path / f"{technique_name}_{self.timestamp.strftime('%Y%m%d_%H%M%S')}_{event_id}.jsonl"
+
+        self._file = open(self.file_path, 'w', encoding='utf-8')
+        self._file.write(json.dumps({
+            "event_id": event_id,
+            "technique": technique_name,
+            "timestamp": self.timestamp.isoformat()
+        }) + "\n")
+
+    def write(self, item: Any) -> None:
+        """Appends an output item"""
+        self._file.write(json.dumps(item, default=str, ensure_ascii=False) + "\n")
+        self.count += 1
+
+    def write_many(self, items: Iterable[Any]) -> None:
+        """Appends output items, consuming items lazily"""
+        for item in items:
+            self.write(item)
+
+    def close(self) -> Path:
+        """
+        Closes the output file and indexes the event.
+        
+        Returns:
+            Path: Path of the output file
+        """
+        if not self._file.closed:
+            self._file.close()
+            self.output_manager._queue_event(self.event_id, self.technique_name, self.timestamp.isoformat(), str(self.file_path), self.cache_key)
+        return self.file_path
+
+    def __enter__(self) -> 'TechniqueOutputStream':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+@atexit.register
+def _flush_output_managers() -> None:
+    """Flushes pending index entries of all shared output managers on interpreter exit"""
+    for output_manager in list(OutputManager._instances.values()):
+        output_manager.flush()
@@ -0,0 +1,263 @@
+import os
+import csv
+import json
+import time
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
+from core.Constants import AUTOMATOR_OUTPUT_DIR, AUTOMATOR_EXECUTION_CATALOG_FILE
+
+def parse_execution_report(execution_folder):
+    """Parse the execution report CSV file"""
+    report_file = os.path.join(execution_folder, "Report.csv")
+
+    if not os.path.exists(report_file):
+        return []
+
+    results = []
+    try:
+        with open(report_file, 'r') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                if row.get('Time_Stamp') != 'Time_Stamp':
+                    results.append({
+                        'module': row.get('Module'),
+                        'status': row.get('Result'),
+                        'timestamp': row.get('Time_Stamp'),
+                        'event_id': row.get('Event_ID', ''),
+                        'cache_hit': row.get('Cache_Hit') == 'True'
+                    })
+    except Exception as e:
+        print(f"Error parsing report: {str(e)}")
+        return []
+
+    return results
+
+class ExecutionCatalog:
+    """
+    Persistent catalog of automator playbook executions.
+
+    Keeps a manifest of execution summaries next to the automator outputs directory so that
+    history pages do not scan every execution folder and parse every Report.csv. The
+    catalog is updated when a playbook execution finishes. Folders added or removed outside
+    of Halberd are picked up by rescanning when the outputs directory modification time
+    changes. Reports of executions not recorded through record_execution that were written
+    to within ACTIVE_REPORT_WINDOW may still be in progress in another process, and only
+    those are checked for changes on read. The manifest is reloaded when another process
+    rewrites it.
+    """
+    # Seconds after the last report write until an execution not recorded by Halberd is treated as finished
+    ACTIVE_REPORT_WINDOW = 24 * 60 * 60
+
+    _instances: Dict[str, 'ExecutionCatalog'] = {}  # Class variable to store shared catalogs
+    _instances_lock = threading.Lock()
+
+    def __init__(self, output_dir: str = AUTOMATOR_OUTPUT_DIR, catalog_file: str = AUTOMATOR_EXECUTION_CATALOG_FILE):
+        self.output_dir = output_dir
+        # Kept outside of output_dir so that writing the catalog does not change the directory mtime
+        self.catalog_file = catalog_file
+        self._lock = threading.RLock()
+        self._dir_mtime: Optional[float] = None
+        # Modification time and size of the manifest when it was last loaded or saved
+        self._catalog_state: Optional[Tuple[int, int]] = None
+        self._executions: Dict[str, Dict[str, Any]] = {}
+        self._sorted_executions: Optional[List[Dict[str, Any]]] = None
+        # Folders whose report may still be written to by another process
+        self._active: Set[str] = set()
+        self._load()
+
+    @classmethod
+    def get_instance(cls, output_dir: str = AUTOMATOR_OUTPUT_DIR, catalog_file: str = AUTOMATOR_EXECUTION_CATALOG_FILE) -> 'ExecutionCatalog':
+        """Returns the process-wide catalog for an automator outputs directory, creating it on first use"""
+        key = os.path.abspath(output_dir)
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(output_dir, catalog_file)
+            return cls._instances[key]
+
+    def _file_state(self) -> Optional[Tuple[int, int]]:
+        """Returns the modification time and size of the manifest, None if there is no manifest"""
+        try:
+            stat = os.stat(self.catalog_file)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def _load(self) -> None:
+        """Loads the catalog manifest from disk"""
+        self._catalog_state = self._file_state()
+        self._sorted_executions = None
+        try:
+            if os.path.exists(self.catalog_file):
+                with open(self.catalog_file, 'r') as f:
+                    manifest = json.load(f)
+                self._dir_mtime = manifest.get("dir_mtime")
+                self._executions = manifest.get("executions", {})
+        except Exception as e:
+            print(f"Error loading execution catalog, rebuilding: {str(e)}")
+            self._dir_mtime = None
+            self._executions = {}
+        self._active = {folder_name for folder_name, entry in self._executions.items() if self._is_active(entry)}
+
+    def _reload_if_changed(self) -> None:
+        """Reloads the manifest if another process rewrote it"""
+        if self._file_state() != self._catalog_state:
+            self._load()
+
+    def _save(self) -> None:
+        """Writes the catalog manifest to a temporary file and swaps it in"""
+        try:
+            # Temporary file unique to the process, so concurrent writers do not clobber each other
+            temp_file = f"{self.catalog_file}.{os.getpid()}.tmp"
+            with open(temp_file, 'w') as f:
+                json.dump({"dir_mtime": self._dir_mtime, "executions": self._executions}, f)
+            os.replace(temp_file, self.catalog_file)
+            self._catalog_state = self._file_state()
+        except Exception as e:
+            print(f"Error saving execution catalog: {str(e)}")
+
+    @staticmethod
+    def _report_mtime(folder_path: str) -> Optional[float]:
+        try:
+            return os.path.getmtime(os.path.join(folder_path, "Report.csv"))
+        except OSError:
+            return None
+
+    def _is_active(self, entry: Dict[str, Any]) -> bool:
+        """Checks if the report of an execution may still change"""
+        if entry.get('recorded'):
+            return False
+        last_write = entry.get('report_mtime')
+        if last_write is None:
+            try:
+                last_write = os.path.getmtime(os.path.join(self.output_dir, entry['folder_name']))
+            except OSError:
+                return False
+        return time.time() - last_write < self.ACTIVE_REPORT_WINDOW
+
+    def _build_entry(self, folder_name: str) -> Dict[str, Any]:
+        """Builds the catalog entry of an execution folder from its folder name and Report.csv"""
+        folder_path = os.path.join(self.output_dir, folder_name)
+
+        # Parse folder name to extract playbook name and timestamp
+        # Format: <playbook_name>_<YYYY-MM-DD>_<HH-MM-SS>
+        parts = folder_name.rsplit('_', 2)
+        if len(parts) >= 3:
+            playbook_name = parts[0]
+            execution_date = parts[1]
+            execution_time = parts[2]
+            execution_timestamp = f"{execution_date} {execution_time.replace('-', ':')}"
+        else:
+            playbook_name = folder_name
+            execution_timestamp = "Unknown"
+
+        # Parse execution report for step counts
+        report_results = parse_execution_report(folder_path)
+
+        return {
+            'folder_name': folder_name,
+            'folder_path': folder_path,
+            'playbook_name': playbook_name,
+            'execution_time': execution_timestamp,
+            'step_count': len(report_results),
+            'success_count': sum(1 for r in report_results if r.get('status') == 'success'),
+            'failed_count': sum(1 for r in report_results if r.get('status') == 'failed'),
+            'report_mtime': self._report_mtime(folder_path)
+        }
+
+    def _reconcile(self, dir_mtime: float) -> None:
+        """Syncs the catalog with execution folders on disk, re-parsing only new or modified folders"""
+        folder_names = set()
+        for entry in os.scandir(self.output_dir):
+            if not entry.is_dir():
+                continue
+            folder_names.add(entry.name)
+            cached = self._executions.get(entry.name)
+            if cached is None or cached.get('report_mtime') != self._report_mtime(entry.path):
+                entry_data = self._build_entry(entry.name)
+                # Completion recorded by Halberd still holds if the report was rewritten
+                entry_data['recorded'] = bool(cached and cached.get('recorded'))
+                self._executions[entry.name] = entry_data
+
+        for folder_name in list(self._executions):
+            if folder_name not in folder_names:
+                del self._executions[folder_name]
+
+        self._active = {folder_name for folder_name, entry in self._executions.items() if self._is_active(entry)}
+        self._dir_mtime = dir_mtime
+        self._sorted_executions = None
+        self._save()
+
+    def _refresh_reports(self) -> None:
+        """Re-parses active folders whose Report.csv changed since they were cataloged"""
+        changed = False
+        for folder_name in list(self._active):
+            cached = self._executions.get(folder_name)
+            if cached is None:
+                self._active.discard(folder_name)
+                continue
+            if cached.get('report_mtime') != self._report_mtime(os.path.join(self.output_dir, folder_name)):
+                cached = self._executions[folder_name] = self._build_entry(folder_name)
+                changed = True
+            if not self._is_active(cached):
+                self._active.discard(folder_name)
+
+        if changed:
+            self._sorted_executions = None
+            self._save()
+
+    def record_execution(self, execution_folder_path: str) -> None:
+        """
+        Adds or refreshes the catalog entry of an execution folder.
+
+        :param execution_folder_path: Path of the playbook execution folder
+        """
+        with self._lock:
+            # Keep executions cataloged by other processes since the manifest was loaded
+            self._reload_if_changed()
+
+            folder_name = os.path.basename(os.path.normpath(execution_folder_path))
+            entry = self._build_entry(folder_name)
+            entry['recorded'] = True
+            self._executions[folder_name] = entry
+            self._active.discard(folder_name)
+            self._sorted_executions = None
+
+            # Only a full reconcile may move the directory mtime forward, as other folders
+            # may have been added since it was recorded
+            try:
+                dir_mtime = os.path.getmtime(self.output_dir)
+            except OSError:
+                dir_mtime = self._dir_mtime
+            if dir_mtime != self._dir_mtime:
+                self._reconcile(dir_mtime)
+            else:
+                self._save()
+
+    def list_executions(self) -> List[Dict[str, Any]]:
+        """
+        Returns all playbook executions, newest first.
+
+        The outputs directory is only rescanned when its modification time differs from the
+        one recorded in the catalog. Otherwise only the reports of executions that may still
+        be in progress in another process are checked for changes.
+        """
+        with self._lock:
+            if not os.path.exists(self.output_dir):
+                return []
+
+            # Pick up executions cataloged by other processes
+            self._reload_if_changed()
+
+            dir_mtime = os.path.getmtime(self.output_dir)
+            if dir_mtime != self._dir_mtime:
+                self._reconcile(dir_mtime)
+            else:
+                self._refresh_reports()
+
+            if self._sorted_executions is None:
+                self._sorted_executions = sorted(
+                    self._executions.values(),
+                    key=lambda x: x['execution_time'],
+                    reverse=True
+                )
+            return [dict(execution) for execution in self._sorted_executions]
@@ -6,6 +6,10 @@ import os
 import time
 import copy
 import uuid
+import json
+import hashlib
+import threading
+from concurrent.futures import Future
 import boto3
 import requests
 from pathlib import Path
@@ -15,8 +19,11 @@ from typing import List, Dict, Any, Optional, Union, Tuple
 from core.playbook.playbook_error import PlaybookError
 from core.playbook.playbook_step import PlaybookStep
 from attack_techniques.technique_registry import TechniqueRegistry
+from attack_techniques.base_technique import ExecutionStatus
 from core.logging.logger import app_logger, StructuredAppLog
 from core.output_manager.output_manager import OutputManager
+from core.playbook.execution_catalog import ExecutionCatalog
+from core.playbook.playbook_runner import PlaybookRunner
 from core.entra.entra_token_manager import EntraTokenManager
 from core.aws.aws_session_manager import SessionManager
 from core.azure.azure_access import AzureAccess
@@ -25,6 +32,8 @@ from core.gcp.gcp_access import GCPAccess
 class Playbook:
     """Creates, modifies, executes and manages Halberd playbook"""
     REQUIRED_FIELDS = ['PB_Name', 'PB_Author', 'PB_Creation_Date', 'PB_Description', 'PB_Sequence']
+    # Default number of steps run concurrently in parallel (DAG) execution. Overridden by optional PB_Max_Workers field
+    DEFAULT_MAX_WORKERS = 4
 
     def __init__(self, pb_file_name: str):
         self.yaml_file = pb_file_name
@@ -43,6 +52,8 @@ class Playbook:
             self.min_exec_time_req += step_data['Wait']
 
         self._status = "Not started"
+        # Serializes report writes of concurrently executing steps
+        self._report_lock = threading.Lock()
     
     @classmethod
     def create_new(cls, name: str, author: Optional[str] = None, description: Optional[str] = None, references: Optional[List[str]] = None) -> 'Playbook':
@@ -177,6 +188,15 @@ class Playbook:
                 raise PlaybookError(message= f"Playbook Data Corrupt : Step '{step_num}' - Missing 'Wait' field", error_type= "data_error")
             if not isinstance(step_data['Params'], dict):
                 raise PlaybookError(message= f"Playbook Data Corrupt : Step '{step_num}' - Params data must be a dictionary", error_type= "data_error")
+            if 'Depends_On' in step_data and step_data['Depends_On'] is not None:
+                if not isinstance(step_data['Depends_On'], list) or not all(isinstance(dep, int) for dep in step_data['Depends_On']):
+                    raise PlaybookError(message= f"Playbook Data Corrupt : Step '{step_num}' - Depends_On must be a list of step numbers", error_type= "data_error")
+                for dep in step_data['Depends_On']:
+                    if dep == step_num or dep not in playbook_data['PB_Sequence']:
+                        raise PlaybookError(message= f"Playbook Data Corrupt : Step '{step_num}' - Invalid step '{dep}' in Depends_On", error_type= "data_error")
+            if 'Cache_TTL' in step_data and step_data['Cache_TTL'] is not None:
+                if not isinstance(step_data['Cache_TTL'], int) or isinstance(step_data['Cache_TTL'], bool) or step_data['Cache_TTL'] < 0:
+                    raise PlaybookError(message= f"Playbook Data Corrupt : Step '{step_num}' - Cache_TTL must be a number of seconds", error_type= "data_error")
             # Validate if module is a Halberd technique
             if step_data['Module'] not in halberd_techniques_list:
                 raise PlaybookError(message= f"Playbook Data Corrupt : Step '{step_num}' - Not a Halberd Module '{step_data['Module']}", error_type= "data_error")
@@ -204,6 +224,33 @@ class Playbook:
                     else:
                         # Playbook has additional params than required by module
                         raise PlaybookError(message= f"Playbook Data Corrupt : Excessive field added to Module params - [Step No: {step_num}, Module : {step_data['Module']}", error_type= "data_error")
+
+        # Validate step dependencies do not form a cycle
+        cls._dependency_order(playbook_data['PB_Sequence'])
+
+    @staticmethod
+    def _dependency_order(pb_sequence: Dict[int, Any]) -> List[int]:
+        """
+        Get step numbers in an order where every step comes after the steps it depends on.
+        
+        :param pb_sequence: PB_Sequence data of the playbook
+        :return: List of step numbers
+        :raises PlaybookError: If step dependencies form a cycle
+        """
+        remaining = {step_num: set(step_data.get('Depends_On') or []) for step_num, step_data in pb_sequence.items()}
+        order = []
+        ready = sorted(step_num for step_num, deps in remaining.items() if not deps)
+        while ready:
+            step_num = ready.pop(0)
+            order.append(step_num)
+            for other_num, deps in remaining.items():
+                if step_num in deps:
+                    deps.discard(step_num)
+                    if not deps:
+                        ready.append(other_num)
+        if len(order) != len(pb_sequence):
+            raise PlaybookError(message= "Playbook Data Corrupt : Depends_On of steps form a cycle", error_type= "data_error")
+        return order
             
     def step(self, step_number: Optional[int] = None) -> Union[PlaybookStep, List[PlaybookStep]]:
         """
@@ -215,11 +262,11 @@ class Playbook:
         if step_number is not None:
             if 1 <= step_number <= self.steps:
                 step_data = self.data['PB_Sequence'][step_number]
-                return PlaybookStep(step_data['Module'], step_data['Params'], step_data['Wait'])
+                return PlaybookStep(step_data['Module'], step_data['Params'], step_data['Wait'], step_data.get('Depends_On'), step_data.get('Cache_TTL'))
             else:
                 raise ValueError(f"Step number {step_number} is out of range")
         else:
-            return [PlaybookStep(step_data['Module'], step_data['Params'], step_data['Wait']) 
+            return [PlaybookStep(step_data['Module'], step_data['Params'], step_data['Wait'], step_data.get('Depends_On'), step_data.get('Cache_TTL')) 
                     for step_data in self.data['PB_Sequence'].values()]
 
     def add_step(self, new_step: PlaybookStep, step_no: Optional[int] = None) -> None:
@@ -228,6 +275,10 @@ class Playbook:
             'Params': new_step.params,
             'Wait': new_step.wait if new_step.wait else 0
         }
+        if new_step.depends_on:
+            step_dict['Depends_On'] = new_step.depends_on
+        if new_step.cache_ttl:
+            step_dict['Cache_TTL'] = new_step.cache_ttl
 
         if step_no is None:
             self.data['PB_Sequence'][self.steps + 1] = step_dict
@@ -244,11 +295,47 @@ class Playbook:
             
         self.save()  # save playbook after adding a step
 
-    def execute(self, step_number: Optional[int] = None) -> None:
+    def execute(self, step_number: Optional[int] = None, max_workers: Optional[int] = None) -> None:
         """
-        Execute the entire playbook or a specific step.
+        Execute the entire playbook or a specific step, blocking until execution finishes.
+        
+        Playbooks where any step defines 'Depends_On' are executed as a dependency graph, running
+        independent steps concurrently. Otherwise steps are executed sequentially in step order.
         
         :param step_number: If provided, execute only this step. Otherwise, execute the entire playbook.
+        :param max_workers: Maximum number of steps to run concurrently in parallel execution. Defaults to PB_Max_Workers or DEFAULT_MAX_WORKERS.
+        """
+        if step_number is None:
+            self.execute_async(max_workers).result()
+            return
+
+        if not 1 <= step_number <= self.steps:
+            raise ValueError(f"Step number {step_number} is out of range")
+
+        execution_folder_path = self._prepare_execution()
+        self._execute_and_report_step(step_number, execution_folder_path)
+        # Add finished run to execution catalog
+        ExecutionCatalog.get_instance().record_execution(execution_folder_path)
+
+    def execute_async(self, max_workers: Optional[int] = None) -> Future:
+        """
+        Start executing the entire playbook on the shared PlaybookRunner and return immediately.
+        
+        Waits between steps are scheduled as timers and do not hold a thread. Validation errors
+        are raised before execution starts.
+        
+        :param max_workers: Maximum number of steps to run concurrently in parallel execution. Defaults to PB_Max_Workers or DEFAULT_MAX_WORKERS.
+        :return: Future resolved when the playbook execution finishes.
+        """
+        execution_folder_path = self._prepare_execution()
+        self._status = "Running"
+        return PlaybookRunner.get_instance().submit(self, execution_folder_path, max_workers)
+
+    def _prepare_execution(self) -> str:
+        """
+        Validate the playbook and create its execution folder.
+        
+        :return: The path of the new playbook execution folder.
         """
         # Validate playbook before execution
         self._validate_playbook_structure(self.data, pb_input_validation = True)
@@ -265,40 +352,39 @@ class Playbook:
             # Write the YAML data to the file
             yaml.dump(self.data['PB_Sequence'], file, default_flow_style=False)
 
-        execution_report_file_path = os.path.join(execution_folder_path, "Report.csv")
+        return execution_folder_path
 
-        # Execute
-        if step_number is not None:
-            if 1 <= step_number <= self.steps:
-                # Log execution start time
-                execution_start_time = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-                
-                # Execute playbook step (returns tuple of result and event_id)
-                execution_result, event_id = self._execute_step(step_number)
-                self.generate_report(module_tid=self.step(step_number).module, execution_start_time=execution_start_time, execution_result=execution_result, execution_folder_path=execution_folder_path, event_id=event_id)
-            else:
-                raise ValueError(f"Step number {step_number} is out of range")
-        else:
-            self._status = "Running"
-            for step_no in range(1, self.steps + 1):
-                # Log execution start time
-                execution_start_time = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-                # Execute playbook step (returns tuple of result and event_id)
-                execution_result, event_id = self._execute_step(step_no)
-                # Generate report
-                self.generate_report(module_tid=self.step(step_no).module, execution_start_time=execution_start_time, execution_result=execution_result, execution_folder_path=execution_folder_path, event_id=event_id)
-                # Start wait to execute next step
-                time.sleep(self.step(step_no).wait if self.step(step_no).wait else 0)
-
-            # Update playbook run status
-            self._status = "Completed"
-
-    def _execute_step(self, step_number: int) -> Tuple[Any, str]:
+    def _finish_execution(self, execution_folder_path: str) -> None:
+        """Called by PlaybookRunner when a playbook run finishes"""
+        # Update playbook run status
+        self._status = "Completed"
+        # Add finished run to execution catalog
+        ExecutionCatalog.get_instance().record_execution(execution_folder_path)
+
+    def _execute_and_report_step(self, step_number: int, execution_folder_path: str) -> None:
+        """
+        Execute a single step of the playbook and add its result to the execution report.
+        
+        :param step_number: The step number to execute.
+        :param execution_folder_path: The path of current playbook execution folder.
+        """
+        # Log execution start time
+        execution_start_time = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        # Execute playbook step (returns tuple of result, event_id and whether a cached output was used)
+        execution_result, event_id, cache_hit = self._execute_step(step_number)
+        # Generate report
+        with self._report_lock:
+            self.generate_report(module_tid=self.step(step_number).module, execution_start_time=execution_start_time, execution_result=execution_result, execution_folder_path=execution_folder_path, event_id=event_id, cache_hit=cache_hit)
+
+    def _execute_step(self, step_number: int) -> Tuple[Any, str, bool]:
         """
         Execute a single step of the playbook with logging and output storage.
         
+        Steps with a 'Cache_TTL' reuse the newest successful output of the same module, params and
+        active entity stored within the last Cache_TTL seconds instead of executing the module.
+        
         :param step_number: The step number to execute.
-        :return: Tuple of (execution_result, event_id)
+        :return: Tuple of (execution_result, event_id, cache_hit)
         """
         step = self.step(step_number)
         print(f"Executing step {step_number}: {step.module}")
@@ -338,12 +424,40 @@ class Playbook:
             timestamp=datetime.now().isoformat())
         )
 
+        # Get shared output manager
+        output_manager = OutputManager.get_instance()
+
+        # Reuse a fresh cached output if step caching is enabled
+        cache_key = None
+        # Steps are only cached when the identity and the account it acts on are known
+        cache_scope = self._get_cache_scope(attack_surface, step_input) if step.cache_ttl else None
+        if cache_scope is not None:
+            cache_key = self._step_cache_key(t_id, step_input, cache_scope)
+            cached_event = output_manager.get_cached_output(cache_key, step.cache_ttl)
+            cached_output = output_manager.read_technique_output(cached_event["filepath"]) if cached_event else None
+            if cached_output is not None:
+                output_manager.add_output_reference(event_id, cached_event)
+                # Log technique execution served from cache
+                app_logger.info(StructuredAppLog("Technique Execution",
+                    event_id=event_id,
+                    source=active_entity,
+                    status="completed",
+                    result="success",
+                    technique=t_id,
+                    target=None,
+                    tactic=tactic,
+                    playbook=self.name,
+                    step_number=step_number,
+                    cache_hit=True,
+                    cached_event_id=cached_event["event_id"],
+                    timestamp=datetime.now().isoformat())
+                )
+                print(f"Using cached output of step {step_number}: {t_id} (event {cached_event['event_id']})")
+                return (ExecutionStatus.SUCCESS, {"message": f"Cached output of event {cached_event['event_id']}", "value": cached_output.get("data")}), event_id, True
+
         # Execute technique
         output = technique_instance.execute(**step_input)
 
-        # Initialize output manager
-        output_manager = OutputManager()
-
         # Check if technique output is in the expected tuple format (success, response)
         if isinstance(output, tuple) and len(output) == 2:
             result, response = output
@@ -367,7 +481,8 @@ class Playbook:
                 output_manager.store_technique_output(
                     data=response['value'], 
                     technique_name=t_id, 
-                    event_id=event_id
+                    event_id=event_id,
+                    cache_key=cache_key
                 )
             else:
                 # Log technique execution failure
@@ -405,7 +520,64 @@ class Playbook:
                 timestamp=datetime.now().isoformat())
             )
 
-        return output, event_id
+        return output, event_id, False
+
+    @staticmethod
+    def _step_cache_key(module: str, params: Dict[str, Any], cache_scope: Dict[str, Any]) -> str:
+        """Cache key of a step output - hash of the module, its params and the identity and account executing it"""
+        key_data = json.dumps({"module": module, "params": params, "scope": cache_scope}, sort_keys=True, default=str)
+        return hashlib.sha256(key_data.encode('utf-8')).hexdigest()
+
+    def _get_cache_scope(self, attack_surface: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Determine the identity and the account (tenant, subscription, AWS account or GCP project) a step acts on.
+        
+        :param attack_surface: The attack surface/category (entra_id, m365, aws, azure, gcp)
+        :param params: The step parameters
+        :return: Dict identifying the step scope, or None if it can not be fully determined
+        """
+        scope = None
+        try:
+            if attack_surface in ["m365", "entra_id"]:
+                manager = EntraTokenManager()
+                access_token = manager.get_active_token()
+                access_info = manager.decode_jwt_token(access_token) if access_token else None
+                if access_info:
+                    scope = {"entity": access_info.get('Entity'), "tenant_id": access_info.get('Target Tenant')}
+
+            elif attack_surface == "aws":
+                session_info = boto3.client('sts').get_caller_identity()
+                scope = {"arn": session_info.get('Arn'), "account_id": session_info.get('Account')}
+
+            elif attack_surface == "azure":
+                current_access = AzureAccess().get_current_subscription_info()
+                if current_access:
+                    scope = {
+                        "entity": current_access.get('user', {}).get('name'),
+                        "subscription_id": current_access.get('id'),
+                        "tenant_id": current_access.get('tenantId')
+                    }
+
+            elif attack_surface == "gcp":
+                current_access = GCPAccess().get_current_access()
+                if current_access:
+                    credential = current_access.get("credential", {})
+                    credential = credential if isinstance(credential, dict) else {}
+                    scope = {
+                        "credential": current_access.get("name"),
+                        "entity": credential.get("client_email", credential.get("client_id")),
+                        # Project targeted by the step, or used by clients created without an explicit project
+                        "project": params.get("project_id") or credential.get("project_id") or credential.get("quota_project_id") or os.environ.get("GOOGLE_CLOUD_PROJECT")
+                    }
+                    if scope["entity"] is None:
+                        scope["entity"] = self._get_active_entity(attack_surface)
+        except Exception:
+            return None
+
+        # Identities that can not be told apart must not share cached outputs
+        if not scope or any(value in [None, "", "Unknown"] for value in scope.values()):
+            return None
+        return scope
 
     def _get_active_entity(self, attack_surface: str) -> str:
         """
@@ -471,7 +643,7 @@ class Playbook:
 
         return active_entity
     
-    def generate_report(self, module_tid: str, execution_start_time, execution_result, execution_folder_path: str, event_id: str, save_output: Optional[bool] = True) -> None:
+    def generate_report(self, module_tid: str, execution_start_time, execution_result, execution_folder_path: str, event_id: str, save_output: Optional[bool] = True, cache_hit: bool = False) -> None:
         """
         Generate report of playbook step execution.
         
@@ -481,6 +653,7 @@ class Playbook:
         :param execution_folder_path: The path of current playbook execution folder.
         :param event_id: The unique event ID for this execution.
         :param save_output: Whether to save the output to a file.
+        :param cache_hit: Whether the step reused a cached output instead of executing the module.
         """
         execution_report_file_path = os.path.join(execution_folder_path, "Report.csv")
         module_output_file = os.path.join(execution_folder_path, f"Result_{module_tid}.txt")
@@ -494,11 +667,11 @@ class Playbook:
         # Create summary report
         try:
             if result.value == "success":
-                self._playbook_create_csv_report(execution_report_file_path, execution_start_time, module_tid, "success", event_id)
+                self._playbook_create_csv_report(execution_report_file_path, execution_start_time, module_tid, "success", event_id, cache_hit)
             else:
-                self._playbook_create_csv_report(execution_report_file_path, execution_start_time, module_tid, "failed", event_id)
+                self._playbook_create_csv_report(execution_report_file_path, execution_start_time, module_tid, "failed", event_id, cache_hit)
         except:
-            self._playbook_create_csv_report(execution_report_file_path, execution_start_time, module_tid, "failed", event_id)
+            self._playbook_create_csv_report(execution_report_file_path, execution_start_time, module_tid, "failed", event_id, cache_hit)
 
         # Store responses
         if save_output:
@@ -507,7 +680,7 @@ class Playbook:
                 # write result data to the file
                 file.write(str(response))
 
-    def _playbook_create_csv_report(self, report_file_name, time_stamp, module, result, event_id):
+    def _playbook_create_csv_report(self, report_file_name, time_stamp, module, result, event_id, cache_hit=False):
         """
         Create and write to execution summary report in CSV format.
         
@@ -516,23 +689,21 @@ class Playbook:
         :param module: The module ID.
         :param result: The result of playbook step execution.
         :param event_id: The unique event ID for this execution.
+        :param cache_hit: Whether the step reused a cached output.
         """
         # Define headers including event_id for traceability
-        headers = ["Time_Stamp", "Module", "Result", "Event_ID"]
+        headers = ["Time_Stamp", "Module", "Result", "Event_ID", "Cache_Hit"]
 
-        if Path(f"{AUTOMATOR_DIR}/{report_file_name}").exists():
-            pass
-        else:
-            # Create new report file with headers
-            f = open(report_file_name, "a")
-            report_input = {"Time_Stamp": "Time_Stamp", "Module": "Module", "Result": "Result", "Event_ID": "Event_ID"}
+        write_headers = not Path(report_file_name).exists()
+        with open(report_file_name, "a", newline='') as f:
             write_log = csv.DictWriter(f, fieldnames=headers)
-            write_log.writerow(report_input)
+            if write_headers:
+                # Create new report file with headers
+                write_log.writeheader()
 
-        # Write execution information to report
-        report_input = {"Time_Stamp": time_stamp, "Module": module, "Result": result, "Event_ID": event_id}
-        write_log = csv.DictWriter(f, fieldnames=headers)
-        write_log.writerow(report_input)
+            # Write execution information to report
+            report_input = {"Time_Stamp": time_stamp, "Module": module, "Result": result, "Event_ID": event_id, "Cache_Hit": str(cache_hit)}
+            write_log.writerow(report_input)
 
     def status(self) -> str:
         return self._status
@@ -582,6 +753,11 @@ class Playbook:
         
         return export_file_path
 
+    @property
+    def is_parallel(self) -> bool:
+        """Playbook is executed as a dependency graph if any step defines Depends_On"""
+        return any(step_data.get('Depends_On') is not None for step_data in self.data['PB_Sequence'].values())
+
     @property
     def name(self) -> str:
         return self.data['PB_Name']
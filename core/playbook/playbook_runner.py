@@ -0,0 +1,185 @@
+import time
+import heapq
+import itertools
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+class PlaybookRunner:
+    """
+    Process-wide executor of playbook runs.
+
+    Steps are run on a shared, bounded thread pool. Waits between steps are timers on a
+    single scheduler thread, so a run that is waiting on a step's 'Wait' holds no thread.
+    This allows many long running playbooks to be executed concurrently in one process.
+    """
+    # Maximum number of steps executing at the same time across all playbook runs
+    DEFAULT_MAX_THREADS = 16
+
+    _instance: Optional['PlaybookRunner'] = None  # Class variable to store the shared runner
+    _instance_lock = threading.Lock()
+
+    def __init__(self, max_threads: int = DEFAULT_MAX_THREADS) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=max_threads, thread_name_prefix="playbook-step")
+        self._timers: List[Tuple[float, int, Callable[[], None]]] = []
+        self._timer_seq = itertools.count()
+        self._condition = threading.Condition()
+        self._scheduler_thread = threading.Thread(target=self._run_timers, name="playbook-scheduler", daemon=True)
+        self._scheduler_thread.start()
+
+    @classmethod
+    def get_instance(cls) -> 'PlaybookRunner':
+        """Returns the process-wide runner, creating it on first use"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def _run_timers(self) -> None:
+        """Scheduler loop - fires due timers. Timer callbacks must not block"""
+        while True:
+            with self._condition:
+                while not self._timers or self._timers[0][0] > time.monotonic():
+                    timeout = self._timers[0][0] - time.monotonic() if self._timers else None
+                    self._condition.wait(timeout)
+                _, _, callback = heapq.heappop(self._timers)
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error in playbook scheduler callback: {str(e)}")
+
+    def call_at(self, due: float, callback: Callable[[], None]) -> None:
+        """
+        Schedules a callback on the scheduler thread.
+
+        :param due: time.monotonic() value at which to run the callback
+        :param callback: Function to run. Must return quickly
+        """
+        with self._condition:
+            heapq.heappush(self._timers, (due, next(self._timer_seq), callback))
+            self._condition.notify()
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> None:
+        """Schedules a callback on the scheduler thread after delay seconds"""
+        self.call_at(time.monotonic() + max(0.0, delay), callback)
+
+    def submit(self, playbook: Any, execution_folder_path: str, max_workers: Optional[int] = None) -> Future:
+        """
+        Starts a playbook run without blocking the caller.
+
+        :param playbook: Playbook to run. Execution folder must already be prepared
+        :param execution_folder_path: The path of the playbook execution folder
+        :param max_workers: Maximum number of steps of the run executing at the same time in parallel (DAG) execution
+        :return: Future resolved when the run finishes. Raises the first step error of the run
+        """
+        run = _PlaybookRun(self, playbook, execution_folder_path, max_workers)
+        run.start()
+        return run.future
+
+    def _submit_step(self, fn: Callable[..., Any], *args: Any) -> Future:
+        return self._executor.submit(fn, *args)
+
+class _PlaybookRun:
+    """
+    State of a single playbook run on the PlaybookRunner.
+
+    In sequential mode every step depends on the previous step and only one step runs at a
+    time. In parallel mode dependencies come from 'Depends_On'. A step becomes due once all
+    its dependencies completed and the 'Wait' of each of them has elapsed.
+    """
+    def __init__(self, runner: PlaybookRunner, playbook: Any, execution_folder_path: str, max_workers: Optional[int]) -> None:
+        self.runner = runner
+        self.playbook = playbook
+        self.execution_folder_path = execution_folder_path
+        self.future: Future = Future()
+        self._lock = threading.Lock()
+
+        pb_sequence = playbook.data['PB_Sequence']
+        self._waits = {step_no: step_data.get('Wait') or 0 for step_no, step_data in pb_sequence.items()}
+        if playbook.is_parallel:
+            self._pending_deps: Dict[int, Set[int]] = {step_no: set(step_data.get('Depends_On') or []) for step_no, step_data in pb_sequence.items()}
+            self._limit = max_workers or playbook.data.get('PB_Max_Workers') or playbook.DEFAULT_MAX_WORKERS
+        else:
+            self._pending_deps = {step_no: ({step_no - 1} if step_no > 1 else set()) for step_no in pb_sequence}
+            self._limit = 1
+
+        self._dependents: Dict[int, List[int]] = {step_no: [] for step_no in pb_sequence}
+        for step_no, deps in self._pending_deps.items():
+            for dep in deps:
+                self._dependents[dep].append(step_no)
+
+        self._earliest_start = {step_no: 0.0 for step_no in pb_sequence}
+        self._due: deque = deque()
+        self._running = 0
+        self._remaining = len(pb_sequence)
+        self._error: Optional[BaseException] = None
+
+    def start(self) -> None:
+        if self._remaining == 0:
+            self._finish()
+            return
+        now = time.monotonic()
+        for step_no in sorted(self._pending_deps):
+            if not self._pending_deps[step_no]:
+                self.runner.call_at(now, lambda step_no=step_no: self._on_due(step_no))
+
+    def _on_due(self, step_no: int) -> None:
+        """Timer callback - queues a step whose dependencies and waits are satisfied"""
+        with self._lock:
+            if self._error is not None:
+                return
+            self._due.append(step_no)
+            steps = self._take_startable()
+        self._start(steps)
+
+    def _take_startable(self) -> List[int]:
+        """Takes due steps up to the run's concurrency limit. Called with lock held"""
+        steps = []
+        while self._due and self._running < self._limit:
+            steps.append(self._due.popleft())
+            self._running += 1
+        return steps
+
+    def _start(self, steps: List[int]) -> None:
+        """Submits steps to the thread pool. Called without lock held, as done callbacks may run immediately"""
+        for step_no in steps:
+            print(f"Scheduling step {step_no}: {self.playbook.data['PB_Sequence'][step_no]['Module']}")
+            future = self.runner._submit_step(self.playbook._execute_and_report_step, step_no, self.execution_folder_path)
+            future.add_done_callback(lambda future, step_no=step_no: self._on_step_done(step_no, future))
+
+    def _on_step_done(self, step_no: int, future: Future) -> None:
+        steps = []
+        with self._lock:
+            self._running -= 1
+            error = future.exception()
+            if error is not None:
+                # Stop scheduling further steps, let steps already running finish
+                if self._error is None:
+                    self._error = error
+                self._due.clear()
+            elif self._error is None:
+                self._remaining -= 1
+                finished_at = time.monotonic()
+                for dependent in self._dependents[step_no]:
+                    self._earliest_start[dependent] = max(self._earliest_start[dependent], finished_at + self._waits[step_no])
+                    self._pending_deps[dependent].discard(step_no)
+                    if not self._pending_deps[dependent]:
+                        self.runner.call_at(self._earliest_start[dependent], lambda dependent=dependent: self._on_due(dependent))
+                steps = self._take_startable()
+
+            finished = self._running == 0 and (self._error is not None or self._remaining == 0)
+        self._start(steps)
+        if finished:
+            self._finish()
+
+    def _finish(self) -> None:
+        try:
+            self.playbook._finish_execution(self.execution_folder_path)
+        except Exception as e:
+            print(f"Error finishing playbook execution: {str(e)}")
+        if self._error is not None:
+            print(f"Playbook execution failed: {str(self._error)}")
+            self.future.set_exception(self._error)
+        else:
+            self.future.set_result(None)
@@ -3,7 +3,11 @@ from typing import List, Any, Optional
 
 class PlaybookStep:
     """Defines a step in the playbook"""
-    def __init__(self, module: str, params: Optional[List[Any]], wait: Optional[int]):
+    def __init__(self, module: str, params: Optional[List[Any]], wait: Optional[int], depends_on: Optional[List[int]] = None, cache_ttl: Optional[int] = None):
         self.module = module
         self.params = params if params is not None else {}
-        self.wait = wait
\ No newline at end of file
+        self.wait = wait
+        # Step numbers this step waits on in parallel (DAG) execution
+        self.depends_on = depends_on
+        # Seconds a successful output of this step can be reused by later executions
+        self.cache_ttl = cache_ttl
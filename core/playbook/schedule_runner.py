@@ -0,0 +1,277 @@
+import os
+import json
+import heapq
+import calendar
+import threading
+from collections import deque
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+import yaml
+from core.Constants import AUTOMATOR_SCHEDULES_FILE, AUTOMATOR_SCHEDULE_STATE_FILE
+
+CATCH_UP_POLICIES = ["skip", "latest", "all"]
+
+def _parse_date(value: Any) -> Optional[date]:
+    if value in [None, "", "None"]:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value)[:10], "%Y-%m-%d").date()
+
+def _add_months(start: date, months: int) -> date:
+    """Adds months to a date, clamping the day to the last day of the resulting month"""
+    month_index = start.month - 1 + months
+    year, month = start.year + month_index // 12, month_index % 12 + 1
+    return date(year, month, min(start.day, calendar.monthrange(year, month)[1]))
+
+def next_fire_time(schedule: Dict[str, Any], after: datetime) -> Optional[datetime]:
+    """
+    Computes the first execution time of a schedule strictly after a point in time.
+
+    Args:
+        schedule (Dict[str, Any]): Schedule entry as written by AddNewSchedule.
+        after (datetime): Point in time to search from.
+
+    Returns:
+        Optional[datetime]: Next execution time, or None if the schedule has no further executions.
+    """
+    start = _parse_date(schedule.get('Start_Date'))
+    if start is None or schedule.get('Execution_Time') in [None, ""]:
+        return None
+    end = _parse_date(schedule.get('End_Date')) or start
+    execution_time = datetime.strptime(str(schedule['Execution_Time'])[:5], "%H:%M").time()
+
+    frequency = schedule.get('Repeat_Frequency')
+    if str(schedule.get('Repeat')) != "True" or frequency not in ["Daily", "Weekly", "Monthly"]:
+        fire_time = datetime.combine(start, execution_time)
+        return fire_time if fire_time > after else None
+
+    from_day = max(start, after.date())
+    if frequency == "Daily":
+        candidates = [from_day, from_day + timedelta(days=1)]
+    elif frequency == "Weekly":
+        weeks = -(-(from_day - start).days // 7)
+        candidates = [start + timedelta(weeks=weeks), start + timedelta(weeks=weeks + 1)]
+    else:
+        months = max(0, (from_day.year - start.year) * 12 + from_day.month - start.month)
+        candidates = [_add_months(start, months), _add_months(start, months + 1)]
+
+    for day in candidates:
+        fire_time = datetime.combine(day, execution_time)
+        if fire_time > after:
+            return fire_time if day <= end else None
+    return None
+
+class ScheduleRunner:
+    """
+    Background service executing automator schedules.
+
+    Next execution times of all schedules in the schedules file are kept in a priority queue.
+    The file is reloaded when it changes, so schedules added from the automator page are
+    picked up without a restart. Playbooks are started on the shared PlaybookRunner with at
+    most max_concurrent_runs schedule executions running at a time, later executions are
+    queued. The last execution time of every schedule is persisted, and executions missed
+    while Halberd was not running are handled according to the catch-up policy:
+
+        skip   - Missed executions are ignored
+        latest - One execution is started for all missed executions of a schedule
+        all    - Every missed execution is started
+
+    Attributes:
+        schedules_file (str): Path to the automator schedules file.
+    """
+    DEFAULT_MAX_CONCURRENT_RUNS = 4
+    DEFAULT_CATCH_UP = "latest"
+    # Seconds between checks of the schedules file for changes
+    RELOAD_INTERVAL = 5.0
+
+    _instances: Dict[str, 'ScheduleRunner'] = {}  # Class variable to store shared runners
+    _instances_lock = threading.Lock()
+
+    def __init__(self, schedules_file: str = AUTOMATOR_SCHEDULES_FILE, state_file: str = AUTOMATOR_SCHEDULE_STATE_FILE,
+                 max_concurrent_runs: int = DEFAULT_MAX_CONCURRENT_RUNS, catch_up: str = DEFAULT_CATCH_UP) -> None:
+        if catch_up not in CATCH_UP_POLICIES:
+            raise ValueError(f"Invalid catch-up policy {catch_up}. Supported policies: {', '.join(CATCH_UP_POLICIES)}")
+        self.schedules_file = schedules_file
+        self.state_file = state_file
+        self.max_concurrent_runs = max_concurrent_runs
+        self.catch_up = catch_up
+
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+        self._schedules: Dict[str, Dict[str, Any]] = {}
+        self._schedules_mtime: Optional[float] = None
+        self._last_fired: Dict[str, str] = {}
+        # Priority queue of (fire_time, schedule_name)
+        self._queue: List[Tuple[datetime, str]] = []
+        self._pending_runs: deque = deque()
+        self._active_runs = 0
+        self._load_state()
+
+    @classmethod
+    def get_instance(cls, schedules_file: str = AUTOMATOR_SCHEDULES_FILE, **kwargs: Any) -> 'ScheduleRunner':
+        """Returns the process-wide runner for a schedules file, creating it on first use"""
+        key = os.path.abspath(schedules_file)
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(schedules_file, **kwargs)
+            return cls._instances[key]
+
+    def _load_state(self) -> None:
+        try:
+            if os.path.exists(self.state_file):
+                with open(self.state_file, 'r') as f:
+                    self._last_fired = json.load(f).get("last_fired", {})
+        except Exception as e:
+            print(f"Error loading schedule state: {str(e)}")
+            self._last_fired = {}
+
+    def _save_state(self) -> None:
+        """Writes the schedule state to a temporary file and swaps it in"""
+        try:
+            temp_file = self.state_file + ".tmp"
+            with open(temp_file, 'w') as f:
+                json.dump({"last_fired": self._last_fired}, f)
+            os.replace(temp_file, self.state_file)
+        except Exception as e:
+            print(f"Error saving schedule state: {str(e)}")
+
+    def start(self) -> None:
+        """Starts the scheduler thread"""
+        with self._condition:
+            if self._thread is not None:
+                return
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, name="schedule-runner", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stops the scheduler thread. Playbook executions already started keep running"""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _reload(self, now: datetime) -> None:
+        """Reloads schedules if the schedules file changed and rebuilds the queue. Called with condition held"""
+        try:
+            mtime = os.path.getmtime(self.schedules_file)
+        except OSError:
+            mtime = None
+        if mtime == self._schedules_mtime:
+            return
+
+        try:
+            schedules = {}
+            if mtime is not None:
+                with open(self.schedules_file, 'r') as f:
+                    schedules = yaml.safe_load(f) or {}
+        except Exception as e:
+            # File may be mid-write, keep current schedules and retry on next check
+            print(f"Error loading schedules: {str(e)}")
+            return
+
+        self._schedules = schedules
+        self._schedules_mtime = mtime
+        self._queue = []
+        for name, schedule in schedules.items():
+            try:
+                last_fired = self._last_fired.get(name)
+                if last_fired is None:
+                    # New schedule, only future executions are started
+                    self._last_fired[name] = now.isoformat()
+                else:
+                    self._catch_up(name, schedule, datetime.fromisoformat(last_fired), now)
+                fire_time = next_fire_time(schedule, now)
+                if fire_time is not None:
+                    self._queue.append((fire_time, name))
+            except Exception as e:
+                print(f"Invalid schedule {name}: {str(e)}")
+        heapq.heapify(self._queue)
+
+        # Drop state of removed schedules
+        for name in list(self._last_fired):
+            if name not in schedules:
+                del self._last_fired[name]
+        self._save_state()
+
+    def _catch_up(self, name: str, schedule: Dict[str, Any], last_fired: datetime, now: datetime) -> None:
+        """Starts executions of a schedule missed between its last execution and now, according to the catch-up policy"""
+        missed = 0
+        fire_time = next_fire_time(schedule, last_fired)
+        while fire_time is not None and fire_time <= now:
+            missed += 1
+            if self.catch_up != "all":
+                break
+            fire_time = next_fire_time(schedule, fire_time)
+
+        if missed and self.catch_up != "skip":
+            print(f"Schedule {name}: catching up {missed if self.catch_up == 'all' else 1} missed execution(s)")
+            for _ in range(missed if self.catch_up == "all" else 1):
+                self._enqueue_run(name, schedule)
+        self._last_fired[name] = now.isoformat()
+
+    def _run(self) -> None:
+        with self._condition:
+            while not self._stopped:
+                now = datetime.now()
+                self._reload(now)
+
+                fired = False
+                while self._queue and self._queue[0][0] <= now:
+                    fire_time, name = heapq.heappop(self._queue)
+                    schedule = self._schedules[name]
+                    self._enqueue_run(name, schedule)
+                    self._last_fired[name] = fire_time.isoformat()
+                    fired = True
+                    # Do not fire again for executions that passed while this one was due
+                    next_time = next_fire_time(schedule, max(fire_time, now) if self.catch_up != "all" else fire_time)
+                    if next_time is not None:
+                        heapq.heappush(self._queue, (next_time, name))
+                if fired:
+                    self._save_state()
+
+                timeout = self.RELOAD_INTERVAL
+                if self._queue:
+                    timeout = min(timeout, max(0.0, (self._queue[0][0] - datetime.now()).total_seconds()))
+                self._condition.wait(timeout)
+
+    def _enqueue_run(self, name: str, schedule: Dict[str, Any]) -> None:
+        """Queues a schedule execution and starts it if under the concurrency limit. Called with condition held"""
+        self._pending_runs.append((name, schedule.get('Playbook_Id')))
+        self._start_pending_runs()
+
+    def _start_pending_runs(self) -> None:
+        while self._pending_runs and self._active_runs < self.max_concurrent_runs:
+            name, playbook_id = self._pending_runs.popleft()
+            # Imported here to avoid loading playbook dependencies until a schedule executes
+            from core.playbook.playbook import Playbook
+            try:
+                print(f"Schedule {name}: starting playbook {playbook_id}")
+                future = Playbook(playbook_id).execute_async()
+            except Exception as e:
+                print(f"Schedule {name}: failed to start playbook {playbook_id}: {str(e)}")
+                continue
+            self._active_runs += 1
+            future.add_done_callback(lambda future, name=name: self._on_run_done(name, future))
+
+    def _on_run_done(self, name: str, future: Any) -> None:
+        if future.exception() is not None:
+            print(f"Schedule {name}: playbook execution failed: {str(future.exception())}")
+        with self._condition:
+            self._active_runs -= 1
+            self._start_pending_runs()
+
+    def status(self) -> Dict[str, Any]:
+        """Returns the next execution time of each schedule and the number of queued and running executions"""
+        with self._condition:
+            return {
+                'next_runs': {name: fire_time.strftime("%Y-%m-%d %H:%M") for fire_time, name in sorted(self._queue)},
+                'active_runs': self._active_runs,
+                'pending_runs': len(self._pending_runs)
+            }
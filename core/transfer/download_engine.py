@@ -0,0 +1,290 @@
+import os
+import json
+import time
+import threading
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+@dataclass
+class DownloadTask:
+    """
+    Object to download.
+
+    Attributes:
+        key (str): Unique name of the object within the download, used in the manifest
+        local_path (str): File the object is written to
+        fetch (Callable): Returns the object content as an iterable of byte chunks. Called as
+            fetch() for the whole object, or fetch(start, end) for the inclusive byte range
+            start-end when the object is downloaded in parts
+        size (Optional[int]): Object size in bytes. Objects of unknown size are downloaded whole
+        version (Optional[str]): ETag or generation of the object. A completed download is only
+            skipped on resume if the version is unchanged
+    """
+    key: str
+    local_path: str
+    fetch: Callable[..., Iterable[bytes]]
+    size: Optional[int] = None
+    version: Optional[str] = None
+
+class _BandwidthLimiter:
+    """Token bucket shared by all downloads of an engine, allowing a burst of one second of transfer"""
+    def __init__(self, bytes_per_second: float) -> None:
+        self.bytes_per_second = bytes_per_second
+        self._lock = threading.Lock()
+        # Theoretical time the bytes consumed so far are transferred at the capped rate
+        self._tat = 0.0
+
+    def consume(self, size: int) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._tat = max(self._tat, now) + size / self.bytes_per_second
+            delay = self._tat - now - 1.0
+        if delay > 0:
+            time.sleep(delay)
+
+class DownloadEngine:
+    """
+    Parallel object download engine for storage exfiltration techniques.
+
+    Techniques describe each object with a DownloadTask and the engine downloads them on a
+    bounded thread pool. Objects larger than multipart_threshold are split into ranged reads
+    of part_size bytes that are downloaded concurrently into a .part file, so a single large
+    object does not occupy one worker for its whole transfer. Objects are written to a .part
+    file first and renamed when complete, so interrupted downloads never leave truncated files
+    behind.
+
+    Progress is recorded in a manifest file in the download directory. Running a download again
+    into the same directory skips objects already downloaded and, for multipart objects,
+    downloads only the missing parts. An optional bandwidth cap is shared by all workers, and
+    throughput statistics are returned by download() and get_stats().
+
+    Example:
+        engine = DownloadEngine(download_path, max_workers=10)
+        stats = engine.download(DownloadTask(key, local_path, fetch, size) for key, ... in objects)
+    """
+    DEFAULT_MAX_WORKERS = 8
+    PART_SIZE = 8 * 1024 * 1024
+    MULTIPART_THRESHOLD = 64 * 1024 * 1024
+    MANIFEST_FILE = ".download_manifest.json"
+    # Minimum seconds between manifest writes while downloading
+    MANIFEST_SAVE_INTERVAL = 2.0
+    # Number of failures listed in the statistics
+    MAX_REPORTED_FAILURES = 100
+
+    def __init__(self, download_dir: str, max_workers: int = DEFAULT_MAX_WORKERS, max_bytes_per_second: Optional[float] = None,
+                 part_size: int = PART_SIZE, multipart_threshold: int = MULTIPART_THRESHOLD) -> None:
+        """
+        Args:
+            download_dir: Directory holding the manifest. Task local paths are usually inside it
+            max_workers: Maximum number of objects or parts downloaded at the same time
+            max_bytes_per_second: Optional cap of the combined download rate
+            part_size: Size of the ranged reads of multipart objects
+            multipart_threshold: Minimum object size downloaded in parts
+        """
+        self.download_dir = download_dir
+        self.max_workers = max(1, int(max_workers or self.DEFAULT_MAX_WORKERS))
+        self.part_size = part_size
+        self.multipart_threshold = max(multipart_threshold, part_size)
+        self.manifest_file = os.path.join(download_dir, self.MANIFEST_FILE)
+        self._bandwidth = _BandwidthLimiter(max_bytes_per_second) if max_bytes_per_second else None
+
+        self._lock = threading.Lock()
+        self._manifest: Dict[str, Dict[str, Any]] = {}
+        self._manifest_dirty = False
+        self._manifest_saved_at = 0.0
+        # Parts not downloaded yet of multipart objects, by key
+        self._pending_parts: Dict[str, Set[int]] = {}
+        self._failed_keys: Set[str] = set()
+        self._start_time: Optional[float] = None
+        self._stats = {"objects": 0, "downloaded": 0, "skipped": 0, "failed": 0, "parts": 0, "bytes": 0, "failures": []}
+
+    def _load_manifest(self) -> None:
+        try:
+            if os.path.exists(self.manifest_file):
+                with open(self.manifest_file, 'r') as f:
+                    self._manifest = json.load(f).get("objects", {})
+        except Exception as e:
+            print(f"Error loading download manifest: {str(e)}")
+            self._manifest = {}
+
+    def _save_manifest(self, force: bool = False) -> None:
+        """Writes the manifest to a temporary file and swaps it in, at most every MANIFEST_SAVE_INTERVAL seconds unless forced"""
+        with self._lock:
+            if not self._manifest_dirty or (not force and time.monotonic() - self._manifest_saved_at < self.MANIFEST_SAVE_INTERVAL):
+                return
+            manifest = json.dumps({"objects": self._manifest})
+            self._manifest_dirty = False
+            self._manifest_saved_at = time.monotonic()
+            try:
+                os.makedirs(self.download_dir, exist_ok=True)
+                temp_file = self.manifest_file + ".tmp"
+                with open(temp_file, 'w') as f:
+                    f.write(manifest)
+                os.replace(temp_file, self.manifest_file)
+            except Exception as e:
+                print(f"Error saving download manifest: {str(e)}")
+
+    def _update_manifest(self, key: str, **fields: Any) -> None:
+        with self._lock:
+            self._manifest.setdefault(key, {}).update(fields)
+            self._manifest_dirty = True
+        self._save_manifest()
+
+    def _write_chunks(self, file: Any, chunks: Iterable[bytes], limit: Optional[int] = None) -> int:
+        """Writes chunks to a file. Raises IOError before writing past limit bytes"""
+        written = 0
+        for chunk in chunks:
+            if not chunk:
+                continue
+            if limit is not None and written + len(chunk) > limit:
+                raise IOError(f"Received more than the {limit} bytes requested")
+            if self._bandwidth is not None:
+                self._bandwidth.consume(len(chunk))
+            file.write(chunk)
+            written += len(chunk)
+            with self._lock:
+                self._stats["bytes"] += len(chunk)
+        return written
+
+    def _record_failure(self, task: DownloadTask, error: Exception) -> None:
+        with self._lock:
+            if task.key in self._failed_keys:
+                return
+            self._failed_keys.add(task.key)
+            self._stats["failed"] += 1
+            if len(self._stats["failures"]) < self.MAX_REPORTED_FAILURES:
+                self._stats["failures"].append({"key": task.key, "error": str(error)})
+        print(f"Failed to download {task.key}: {str(error)}")
+
+    def _download_whole(self, task: DownloadTask) -> None:
+        """Downloads an object in a single request"""
+        try:
+            temp_path = task.local_path + ".part"
+            with open(temp_path, 'wb') as file:
+                self._write_chunks(file, task.fetch())
+            os.replace(temp_path, task.local_path)
+        except Exception as e:
+            self._record_failure(task, e)
+            return
+        with self._lock:
+            self._stats["downloaded"] += 1
+        self._update_manifest(task.key, status="complete", size=task.size, version=task.version, parts=None)
+
+    def _download_part(self, task: DownloadTask, part: int) -> None:
+        """Downloads one ranged part of a multipart object into its .part file"""
+        with self._lock:
+            if task.key in self._failed_keys:
+                return
+        start = part * self.part_size
+        end = min(task.size, start + self.part_size) - 1
+        try:
+            with open(task.local_path + ".part", 'r+b') as file:
+                file.seek(start)
+                # Never write past the part, into parts that may already be complete
+                written = self._write_chunks(file, task.fetch(start, end), limit=end - start + 1)
+            if written != end - start + 1:
+                raise IOError(f"Part {part} returned {written} bytes, expected {end - start + 1}")
+        except Exception as e:
+            self._record_failure(task, e)
+            return
+
+        # Parts of a failed object are still recorded, so a later run resumes after them
+        with self._lock:
+            self._stats["parts"] += 1
+            pending = self._pending_parts[task.key]
+            pending.discard(part)
+            done = not pending
+            if done:
+                del self._pending_parts[task.key]
+            completed_parts = sorted(set(range(self._part_count(task))) - pending)
+
+        if not done:
+            self._update_manifest(task.key, status="partial", size=task.size, version=task.version, parts=completed_parts)
+            return
+        try:
+            os.replace(task.local_path + ".part", task.local_path)
+        except Exception as e:
+            self._record_failure(task, e)
+            return
+        with self._lock:
+            self._stats["downloaded"] += 1
+        self._update_manifest(task.key, status="complete", size=task.size, version=task.version, parts=None)
+
+    def _part_count(self, task: DownloadTask) -> int:
+        return -(-task.size // self.part_size)
+
+    def _plan(self, task: DownloadTask) -> List[Callable[[], None]]:
+        """Returns the work units of a task, skipping work recorded as done in the manifest"""
+        with self._lock:
+            self._stats["objects"] += 1
+            entry = self._manifest.get(task.key)
+        unchanged = entry is not None and entry.get("size") == task.size and entry.get("version") == task.version
+
+        if unchanged and entry.get("status") == "complete" and os.path.exists(task.local_path):
+            with self._lock:
+                self._stats["skipped"] += 1
+            return []
+
+        os.makedirs(os.path.dirname(task.local_path) or ".", exist_ok=True)
+        if task.size is None or task.size < self.multipart_threshold:
+            return [lambda: self._download_whole(task)]
+
+        done_parts = set(entry.get("parts") or []) if unchanged and entry.get("status") == "partial" else set()
+        temp_path = task.local_path + ".part"
+        if not done_parts or not os.path.exists(temp_path):
+            done_parts = set()
+            # Preallocate the file so parts can be written at their offsets in any order
+            with open(temp_path, 'wb') as file:
+                file.truncate(task.size)
+
+        parts = [part for part in range(self._part_count(task)) if part not in done_parts]
+        with self._lock:
+            self._pending_parts[task.key] = set(parts)
+        return [lambda part=part: self._download_part(task, part) for part in parts]
+
+    def download(self, tasks: Iterable[DownloadTask]) -> Dict[str, Any]:
+        """
+        Downloads objects concurrently, consuming tasks lazily.
+
+        Args:
+            tasks: Objects to download
+
+        Returns:
+            Dict[str, Any]: Statistics of the download, as returned by get_stats()
+        """
+        self._load_manifest()
+        self._start_time = time.monotonic()
+        in_flight = set()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="download-engine") as executor:
+            for task in tasks:
+                try:
+                    work_units = self._plan(task)
+                except Exception as e:
+                    self._record_failure(task, e)
+                    continue
+                for work_unit in work_units:
+                    # Bound queued work so large listings are not held in memory at once
+                    if len(in_flight) >= self.max_workers * 2:
+                        _, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    in_flight.add(executor.submit(work_unit))
+            wait(in_flight)
+
+        self._save_manifest(force=True)
+        return self.get_stats()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Returns download counters and throughput.
+
+        Returns:
+            Dict[str, Any]: objects, downloaded, skipped, failed, parts, bytes, elapsed_seconds,
+            throughput_bytes_per_second and failures (key and error of up to MAX_REPORTED_FAILURES failed objects)
+        """
+        with self._lock:
+            stats = dict(self._stats, failures=list(self._stats["failures"]))
+        elapsed = time.monotonic() - self._start_time if self._start_time is not None else 0.0
+        stats["elapsed_seconds"] = round(elapsed, 2)
+        stats["throughput_bytes_per_second"] = round(stats["bytes"] / elapsed) if elapsed > 0 else 0
+        return stats
@@ -11,7 +11,7 @@ from dotenv import set_key
 from core.entra.entra_token_manager import EntraTokenManager
 
 entra_token_manager = EntraTokenManager() # Initialize Entra token manager
-entra_token_manager._monitor_thread.start() #Start token refresh monitoring
+entra_token_manager.start_token_monitoring() #Start token refresh monitoring
 
 # Create Halberd application
 app = dash.Dash(
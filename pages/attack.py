@@ -641,8 +641,8 @@ def execute_technique_callback(n_clicks, tactic, t_id, values, bool_on, file_con
     if isinstance(output, tuple) and len(output) == 2:
         result, response = output
 
-        # Initialize output manager
-        output_manager = OutputManager()
+        # Get shared output manager
+        output_manager = OutputManager.get_instance()
 
         if result.value == "success":
             # Log technique execution success
@@ -3,7 +3,7 @@ Page Navigation url : app/attack-analyse
 Page Description : Analyse Halberd attack executions.
 '''
 
-import json
+import os
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
@@ -16,34 +16,19 @@ import dash_bootstrap_components as dbc
 from dash_iconify import DashIconify
 
 from core.Constants import APP_LOG_FILE, REPORT_DIR
-from core.logging.report import read_log_file, analyze_log, generate_html_report
+from core.logging.report import analyze_execution_history, generate_html_report
+from core.logging.execution_history import ExecutionHistoryStore
 
 # Register page to app
 register_page(__name__, path='/attack-analyse', name='Analyze')
 
-def create_df_from_attack_logs():
-    # Read log file
-    with open(APP_LOG_FILE, 'r') as file:
-        log_data = file.read()
-    
-    events = []
-    for line in log_data.split('\n'):
-        if line.strip():
-            try:
-                parts = line.split(' - INFO - Technique Execution ', 1)
-                if len(parts) != 2:
-                    continue
-                    
-                timestamp = parts[0].split(' - ')[0]  # Get timestamp from first part
-                action = "Technique Execution"
-                data = parts[1]
-                
-                event = json.loads(data)
-                event['timestamp'] = pd.to_datetime(timestamp)
-                events.append(event)
-            except Exception as e:
-                continue
-    return pd.DataFrame(events)
+def create_df_from_attack_logs(start_date=None, end_date=None):
+    """
+    Get completed technique executions from the execution history store with optional date filtering
+    """
+    df = ExecutionHistoryStore.get_instance().query(start_date=start_date, end_date=end_date)
+    # Use completion time as the execution timestamp
+    return df.rename(columns={'end_time': 'timestamp'}).assign(status='completed')
 
 def process_attack_data(df, start_date=None, end_date=None):
     """
@@ -468,7 +453,7 @@ layout = create_layout
      Input('date-picker-range', 'end_date')]
 )
 def update_metric_cards_callback(start_date, end_date):
-    df = create_df_from_attack_logs()
+    df = create_df_from_attack_logs(start_date, end_date)
     data = process_attack_data(df, pd.to_datetime(start_date), pd.to_datetime(end_date))
     
     return [
@@ -497,7 +482,7 @@ def update_metric_cards_callback(start_date, end_date):
      Input('date-picker-range', 'end_date')]
 )
 def update_graphs_callback(start_date, end_date):
-    df = create_df_from_attack_logs()
+    df = create_df_from_attack_logs(start_date, end_date)
     data = process_attack_data(df, pd.to_datetime(start_date), pd.to_datetime(end_date))
     
     return [
@@ -588,7 +573,7 @@ def update_graphs_callback(start_date, end_date):
      Input('date-picker-range', 'end_date')]
 )
 def update_footer_stats_callback(start_date, end_date):
-    df = create_df_from_attack_logs()
+    df = create_df_from_attack_logs(start_date, end_date)
     data = process_attack_data(df, pd.to_datetime(start_date), pd.to_datetime(end_date))
     
     return html.Div([
@@ -611,8 +596,10 @@ def generate_trace_report_callback(n_clicks):
     if n_clicks == 0:
         raise PreventUpdate
     try:
-        log_lines = read_log_file(APP_LOG_FILE)
-        analysis_results = analyze_log(log_lines)
+        if not os.path.exists(APP_LOG_FILE):
+            raise FileNotFoundError(APP_LOG_FILE)
+        executions = ExecutionHistoryStore.get_instance().query()
+        analysis_results = analyze_execution_history(executions)
         html_report = generate_html_report(analysis_results)
         
         # Save the HTML report
@@ -8,7 +8,7 @@ from dash.dependencies import Input, Output
 import dash_bootstrap_components as dbc
 from dash_iconify import DashIconify
 
-from core.Functions import generate_attack_trace_table, ParseTechniqueResponse
+from core.Functions import generate_attack_trace_table, query_attack_trace_table, ParseTechniqueResponse
 from core.output_manager.output_manager import OutputManager
 
 # Register page to app
@@ -110,6 +110,22 @@ def generate_attack_history_page():
 layout = generate_attack_history_page
 
 # Callbacks
+'''Callback to serve the requested page of the attack trace table'''
+@callback(
+        Output(component_id = "trace-table", component_property = "data"),
+        Output(component_id = "trace-table", component_property = "page_count"),
+        Output(component_id = "trace-table", component_property = "selected_rows"),
+        Input(component_id = "trace-table", component_property = "page_current"),
+        Input(component_id = "trace-table", component_property = "page_size"),
+        Input(component_id = "trace-table", component_property = "sort_by"),
+        Input(component_id = "trace-table", component_property = "filter_query"),
+        prevent_initial_call=True
+)
+def update_attack_trace_table_page_callback(page_current, page_size, sort_by, filter_query):
+    data, page_count = query_attack_trace_table(page_current, page_size, sort_by, filter_query)
+    # Clear row selection as row indices refer to the previous page
+    return data, page_count, []
+
 '''Callback to display technique output in technique output viewer'''
 @callback(
         Output(component_id = "output-viewer-display-div", component_property = "children", allow_duplicate=True),
@@ -125,8 +141,8 @@ def display_technique_output_in_output_viewer_callback(selected_rows, data):
     selected_data = (data[selected_rows[0]])
     event_id = selected_data['Event ID']
 
-    # Initialize output manager
-    output_manager = OutputManager()
+    # Get shared output manager
+    output_manager = OutputManager.get_instance()
     # Get technique execution output by event id
     event_output = output_manager.get_output_by_event_id(event_id=event_id)
 
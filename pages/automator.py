@@ -5,7 +5,6 @@ Page Description : Manage (add/edit/schedule/import/export) and execute playbook
 
 import os
 import json
-import threading
 from datetime import date
 
 import dash
@@ -1005,14 +1004,8 @@ def execute_playbook_callback(n_clicks):
     playbook_file = eval(button_id)['index']
     
     try:
-        # Execute playbook in background thread
-        def execute_playbook():
-            playbook = Playbook(playbook_file)
-            playbook.execute()
-            
-        execution_thread = threading.Thread(target=execute_playbook)
-        execution_thread.daemon = True
-        execution_thread.start()
+        # Start playbook on the shared playbook runner (validation errors are raised here)
+        Playbook(playbook_file).execute_async()
         
         return True, True, "Playbook Execution Started", False, "", playbook_file, False
         
@@ -1839,7 +1832,8 @@ def update_playbook_from_editor(n_clicks, name, desc, author, refs, modules, wai
         playbook.data['PB_Author'] = author
         playbook.data['PB_References'] = [ref.strip() for ref in refs.split(',')] if refs else []
         
-        # Clear existing sequence
+        # Clear existing sequence, keeping optional step fields that are not edited in the UI
+        previous_sequence = playbook.data['PB_Sequence']
         playbook.data['PB_Sequence'] = {}
         
         # Group parameters by step
@@ -1865,6 +1859,11 @@ def update_playbook_from_editor(n_clicks, name, desc, author, refs, modules, wai
                     'Params': step_params.get(i, {}),
                     'Wait': int(wait) if wait else 0
                 }
+                previous_step = previous_sequence.get(i + 1, {})
+                if previous_step.get('Module') == module:
+                    for field in ['Depends_On', 'Cache_TTL']:
+                        if previous_step.get(field) is not None:
+                            playbook.data['PB_Sequence'][i + 1][field] = previous_step[field]
         
         # Save updated playbook
         playbook.save()
@@ -9,7 +9,7 @@ from dash.dependencies import Input, Output, State
 import dash_bootstrap_components as dbc
 from dash_iconify import DashIconify
 
-from core.Functions import generate_automator_execution_table, parse_execution_report, ParseTechniqueResponse
+from core.Functions import generate_automator_execution_table, query_automator_execution_table, parse_execution_report, ParseTechniqueResponse
 from core.Constants import AUTOMATOR_OUTPUT_DIR
 from core.output_manager.output_manager import OutputManager
 
@@ -64,14 +64,16 @@ def generate_execution_steps_view(folder_name, playbook_name, execution_time):
                         html.Span(f"Step {idx}: ", className="fw-bold"),
                         html.Span(module_name),
                     ], className="d-flex align-items-center"),
-                    dbc.Badge(
-                        [
-                            DashIconify(icon=status_icon, width=14, className="me-1"),
-                            status.upper()
-                        ],
-                        color=status_color,
-                        className="ms-auto"
-                    )
+                    html.Div([
+                        dbc.Badge("CACHED", color="info", className="me-1") if step.get('cache_hit') else None,
+                        dbc.Badge(
+                            [
+                                DashIconify(icon=status_icon, width=14, className="me-1"),
+                                status.upper()
+                            ],
+                            color=status_color
+                        )
+                    ], className="ms-auto")
                 ], className="d-flex justify-content-between align-items-center"),
                 dbc.CardBody([
                     dbc.Row([
@@ -219,6 +221,22 @@ def generate_automator_history_page():
 layout = generate_automator_history_page
 
 # Callbacks
+'''Callback to serve the requested page of the execution history table'''
+@callback(
+    Output(component_id="automator-execution-table", component_property="data"),
+    Output(component_id="automator-execution-table", component_property="page_count"),
+    Output(component_id="automator-execution-table", component_property="selected_rows"),
+    Input(component_id="automator-execution-table", component_property="page_current"),
+    Input(component_id="automator-execution-table", component_property="page_size"),
+    Input(component_id="automator-execution-table", component_property="sort_by"),
+    Input(component_id="automator-execution-table", component_property="filter_query"),
+    prevent_initial_call=True
+)
+def update_execution_table_page_callback(page_current, page_size, sort_by, filter_query):
+    data, page_count, _ = query_automator_execution_table(page_current, page_size, sort_by, filter_query)
+    # Clear row selection as row indices refer to the previous page
+    return data, page_count, []
+
 '''Callback to display execution details when a row is selected'''
 @callback(
     Output(component_id="automator-output-viewer-display-div", component_property="children", allow_duplicate=True),
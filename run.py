@@ -22,6 +22,9 @@ Command Line Arguments:
     --log-level: Server logging level (debug/info/warning/error/critical)
     --dev-server: Flag to use Flask development server instead of Hypercorn
     --dev-server-debug: Enable debug mode for development server
+    --scheduler: Run automator schedules in the background
+    --scheduler-max-runs: Maximum number of scheduled playbook executions running at a time
+    --scheduler-catch-up: Handling of schedule executions missed while Halberd was not running (skip/latest/all)
 
 Example Usage:
     # Start production server
@@ -36,6 +39,9 @@ Example Usage:
     # Start development server
     python server.py --dev-server
 
+    # Start with automator schedule runner
+    python server.py --scheduler
+
 Notes:
     - The Server class validates SSL configurations and port numbers
     - Production deployments should use Hypercorn (default) instead of the development server
@@ -50,6 +56,7 @@ import argparse
 import os
 from datetime import datetime
 from core.bootstrap import Bootstrapper
+from core.playbook.schedule_runner import ScheduleRunner, CATCH_UP_POLICIES
 from version import __version__
 
 
@@ -159,12 +166,20 @@ def main():
     parser.add_argument("--log-level", choices= ["debug", "info", "warning", "error", "critical"], help="Server logging level")
     parser.add_argument("--dev-server", action="store_true", help="Flag launches Flask development server instead of Hypercorn")
     parser.add_argument("--dev-server-debug", action="store_true", help="Flag enables debug mode for development server")
+    parser.add_argument("--scheduler", action="store_true", help="Flag starts the automator schedule runner")
+    parser.add_argument("--scheduler-max-runs", type=int, default=ScheduleRunner.DEFAULT_MAX_CONCURRENT_RUNS, help="Maximum number of scheduled playbook executions running at a time")
+    parser.add_argument("--scheduler-catch-up", choices= CATCH_UP_POLICIES, default=ScheduleRunner.DEFAULT_CATCH_UP, help="Handling of schedule executions missed while Halberd was not running")
     args = parser.parse_args()
 
     # Initialize application requirements
     bootstrapper = Bootstrapper()
     bootstrapper.initialize()
 
+    if args.scheduler:
+        # Start automator schedule runner in background
+        ScheduleRunner.get_instance(max_concurrent_runs=args.scheduler_max_runs, catch_up=args.scheduler_catch_up).start()
+        print(">> Automator schedule runner started")
+
     if args.dev_server:
         # Start development server
         from halberd import app